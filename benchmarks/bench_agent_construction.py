@@ -0,0 +1,61 @@
+"""Time and memory to build the full task list, with and without agent reuse.
+
+"per task" builds a fresh Agent for every task, as happens when each @task
+calls its agent factory without memoization; "registry" is Vitacrew's
+per-instance agent registry, which builds each agent once.
+
+Usage: python benchmarks/bench_agent_construction.py [rounds]
+"""
+import statistics
+import sys
+import time
+import tracemalloc
+
+from crewai import Agent, Task
+
+from vitacrew.crew import AGENT_TOOLS, CrewFactory
+
+
+def build_with_registry(factory: CrewFactory) -> list:
+    vitacrew = factory.create()
+    return [getattr(vitacrew, name)() for name in vitacrew.task_dependencies()]
+
+
+def build_agent_per_task(factory: CrewFactory) -> list:
+    vitacrew = factory.create()
+    tasks = []
+    for name in vitacrew.task_dependencies():
+        agent_name = vitacrew.task_config(name)["agent"]
+        agent = Agent(
+            config=vitacrew.agents_config[agent_name],
+            tools=[vitacrew.tools[tool] for tool in AGENT_TOOLS[agent_name] or vitacrew.tools],
+            verbose=True,
+        )
+        tasks.append(Task(config=vitacrew.task_config(name), agent=agent))
+    return tasks
+
+
+def measure(label: str, build, factory: CrewFactory, rounds: int) -> None:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        build(factory)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    kept = build(factory)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    print(f"{label:<10} median {statistics.median(timings) * 1000:7.2f} ms   retained {current / 1024:8.1f} KiB")
+
+
+def main(rounds: int = 20) -> None:
+    factory = CrewFactory()
+    build_with_registry(factory)  # warm up imports and config parsing
+    measure("per task", build_agent_per_task, factory, rounds)
+    measure("registry", build_with_registry, factory, rounds)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,56 @@
+"""Records-per-second benchmark for the scalar and batch calculator paths.
+
+Usage: python benchmarks/bench_calculators.py [records]
+"""
+import sys
+import time
+
+import numpy as np
+
+from vitacrew.tools.custom_tool import BMRCalculator, MacroCalculator
+
+
+def cohort(size: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    return {
+        "weight": np.round(rng.uniform(30, 300, size), 1),
+        "height": np.round(rng.uniform(100, 250, size), 1),
+        "age": rng.integers(18, 120, size),
+        "gender": rng.choice(["male", "female", "other"], size),
+        "calories": np.round(rng.uniform(1200, 4000, size)),
+        "goal": rng.choice(["maintenance", "bulking", "cutting"], size),
+    }
+
+
+def rate(records: int, seconds: float) -> str:
+    return f"{records / seconds:>14,.0f} records/s"
+
+
+def main(size: int = 20_000) -> None:
+    data = cohort(size)
+    bmr_tool, macro_tool = BMRCalculator(), MacroCalculator()
+    rows = list(zip(data["weight"].tolist(), data["height"].tolist(), data["age"].tolist(),
+                    data["gender"].tolist(), data["calories"].tolist(), data["goal"].tolist()))
+
+    start = time.perf_counter()
+    scalar_bmr = [bmr_tool._run(weight=w, height=h, age=a, gender=g) for w, h, a, g, _, _ in rows]
+    scalar_macros = [macro_tool._run(calories=c, goal=goal) for _, _, _, _, c, goal in rows]
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_bmr = BMRCalculator.calculate_batch(data["weight"], data["height"], data["age"], data["gender"])
+    batch_macros = MacroCalculator.calculate_batch(data["calories"], data["goal"])
+    batch_seconds = time.perf_counter() - start
+
+    assert batch_bmr.tolist() == scalar_bmr
+    for macro in ("protein", "carbs", "fats"):
+        assert batch_macros[macro].tolist() == [row[macro] for row in scalar_macros]
+
+    print(f"records: {size:,}")
+    print(f"scalar _run loop: {rate(size, scalar_seconds)}")
+    print(f"batch (numpy):    {rate(size, batch_seconds)}")
+    print(f"speedup:          {scalar_seconds / batch_seconds:>14.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,155 @@
+"""End-to-end crew runs against the offline FakeLLM: one profile, concurrent profiles and a batch.
+
+Every scenario goes through the real agents, task execution and context
+building; only the LLM is simulated. Reports p50/p95 latency per run,
+runs per second and peak memory (traced Python allocations in-process,
+max RSS of the worker processes for the batch).
+
+Usage: python benchmarks/bench_crew_end_to_end.py [runs] [latency_ms] [profiles]
+"""
+import contextlib
+import io
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Keep the progress and response stores out of the user's cache
+os.environ["VITACREW_CACHE_DIR"] = tempfile.mkdtemp(prefix="vitacrew-bench-")
+
+from vitacrew.batch import run_batch  # noqa: E402
+from vitacrew.crew import CrewFactory  # noqa: E402
+from vitacrew.fake_llm import FakeLLM  # noqa: E402
+from vitacrew.models import UserInputs  # noqa: E402
+
+PROFILE = {
+    "name": "Bench User",
+    "age": 30,
+    "gender": "male",
+    "height": 175.0,
+    "weight": 70.0,
+    "waist_circumference": 80.0,
+    "hip_circumference": 90.0,
+    "fitness_objectives": ["weight loss"],
+    "dietary_requirements": ["vegetarian"],
+    "skin_type": "normal",
+    "skin_concerns": ["acne"],
+    "sleep_hours": 7.5,
+    "stress_level": "moderate",
+    "activity_level": "moderate",
+}
+
+LATENCY = 0.0
+# Agents are verbose; results go to the real stdout while runs print into a sink
+RESULTS = sys.stdout
+_worker_factory = None
+
+
+def make_llm() -> FakeLLM:
+    # Roughly the prefill and decode rates of a hosted model
+    return FakeLLM(latency=LATENCY, prompt_tokens_per_second=20_000, output_tokens_per_second=100)
+
+
+def make_factory() -> CrewFactory:
+    factory = CrewFactory(llm=make_llm())
+    factory.response_cache = None  # Measure LLM-bound runs, not cache hits
+    factory.in_flight = None
+    return factory
+
+
+def profile(index: int) -> dict:
+    return dict(PROFILE, name=f"Bench User {index}", age=25 + index % 40)
+
+
+def run_profile(factory: CrewFactory, record: dict) -> float:
+    vitacrew = factory.create()
+    vitacrew.collect_user_inputs(UserInputs(**record))
+    start = time.perf_counter()
+    vitacrew.kickoff_concurrent()
+    return time.perf_counter() - start
+
+
+def plan_fake(index: int, record: dict) -> dict:
+    """Batch worker: times the crew for one record on a per-process FakeLLM factory."""
+    global _worker_factory
+    if _worker_factory is None:
+        _worker_factory = make_factory()
+    with contextlib.redirect_stdout(io.StringIO()):
+        return {"index": index, "seconds": run_profile(_worker_factory, record)}
+
+
+def report(name: str, latencies, wall: float, peak: str) -> None:
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1e3
+    p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] * 1e3
+    print(f"{name:<28} p50 {p50:8.1f} ms  p95 {p95:8.1f} ms  {len(latencies) / wall:7.2f} runs/s  peak {peak}", file=RESULTS)
+
+
+def traced_peak(fn) -> str:
+    tracemalloc.start()
+    try:
+        fn()
+        return f"{tracemalloc.get_traced_memory()[1] / 2**20:.1f} MiB"
+    finally:
+        tracemalloc.stop()
+
+
+def single(runs: int) -> None:
+    factory = make_factory()
+    run_profile(factory, profile(0))  # Warm up imports and the config cache
+    start = time.perf_counter()
+    latencies = [run_profile(factory, profile(0)) for _ in range(runs)]
+    wall = time.perf_counter() - start
+    report("single profile", latencies, wall, traced_peak(lambda: run_profile(factory, profile(0))))
+
+
+def concurrent(runs: int, profiles: int) -> None:
+    factory = make_factory()
+    run_profile(factory, profile(0))
+
+    def burst():
+        with ThreadPoolExecutor(max_workers=profiles) as pool:
+            return list(pool.map(lambda i: run_profile(factory, profile(i)), range(runs)))
+
+    start = time.perf_counter()
+    latencies = burst()
+    wall = time.perf_counter() - start
+    report(f"concurrent ({profiles} profiles)", latencies, wall, traced_peak(burst))
+
+
+def batch(runs: int, workers: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path, output_path = Path(tmp) / "profiles.jsonl", Path(tmp) / "plans.jsonl"
+        input_path.write_text("".join(json.dumps(profile(i)) + "\n" for i in range(runs)))
+        start = time.perf_counter()
+        counts = run_batch(input_path, output_path, workers=workers, plan=plan_fake)
+        wall = time.perf_counter() - start
+        assert counts["planned"] == runs, counts
+        latencies = [json.loads(line)["seconds"] for line in output_path.read_text().splitlines()]
+    rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    report(f"batch ({workers} workers)", latencies, wall, f"{rss:.1f} MiB RSS/worker")
+
+
+def main(runs: int = 20, latency_ms: float = 0.0, profiles: int = 4) -> None:
+    global LATENCY
+    LATENCY = latency_ms / 1e3
+    print(f"{runs} runs, {latency_ms:g} ms fixed LLM latency per call")
+    with contextlib.redirect_stdout(io.StringIO()):
+        single(runs)
+        concurrent(runs, profiles)
+        batch(runs, profiles)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 20,
+        float(args[1]) if len(args) > 1 else 0.0,
+        int(args[2]) if len(args) > 2 else 4,
+    )
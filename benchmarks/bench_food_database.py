@@ -0,0 +1,55 @@
+"""Load and query latency of the food database, against a csv-scanning baseline.
+
+Usage: python benchmarks/bench_food_database.py [queries]
+"""
+import csv
+import sys
+import tempfile
+import time
+
+from vitacrew.foods import DIETS, FOODS_CSV, MACRO_PROFILES, FoodDatabase
+
+QUERY = {"diets": ["vegan", "gluten-free"], "profiles": ["high-protein"], "maximum": {"fat": 20}}
+
+
+def scan(rows: list) -> list:
+    """The baseline: evaluate every rule on every row, then sort."""
+    found = [
+        row for row in rows
+        if all(DIETS[diet](row) for diet in QUERY["diets"])
+        and all(MACRO_PROFILES[profile](row) for profile in QUERY["profiles"])
+        and float(row["fat"]) <= QUERY["maximum"]["fat"]
+    ]
+    return sorted(found, key=lambda row: -float(row["protein"]))[:20]
+
+
+def per_call(function, queries: int) -> float:
+    start = time.perf_counter()
+    for _ in range(queries):
+        function()
+    return (time.perf_counter() - start) / queries * 1e6
+
+
+def main(queries: int = 20_000) -> None:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        FoodDatabase.load(cache_dir)
+        compile_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        database = FoodDatabase.load(cache_dir)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        with open(FOODS_CSV, newline="", encoding="utf-8") as file:
+            rows = list(csv.DictReader(file))
+        assert [food["name"] for food in database.search(**QUERY)] == [row["name"] for row in scan(rows)]
+
+        print(f"foods:             {len(database):>8}")
+        print(f"compile + load:    {compile_ms:>8.2f} ms")
+        print(f"load (mmap):       {load_ms:>8.2f} ms")
+        print(f"mask:              {per_call(lambda: database.mask(**QUERY), queries):>8.1f} us")
+        print(f"search:            {per_call(lambda: database.search(**QUERY), queries):>8.1f} us")
+        print(f"csv scan baseline: {per_call(lambda: scan(rows), queries // 10):>8.1f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,71 @@
+"""Cold-start import time of each script entry point and the lightweight modules.
+
+Every sample runs a fresh interpreter with ``python -X importtime`` and reads
+the cumulative import time of the measured module, so results are not skewed
+by modules already loaded in this process.
+
+Usage: python benchmarks/bench_import_time.py [runs]
+"""
+import statistics
+import subprocess
+import sys
+import tomllib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Importable without crewai: the models and calculator math
+LIGHT_MODULES = ["vitacrew", "vitacrew.models", "vitacrew.tools.calculations"]
+# For reference: the full agent framework
+HEAVY_MODULES = ["vitacrew.crew"]
+
+
+def entry_points() -> dict:
+    with open(ROOT / "pyproject.toml", "rb") as file:
+        scripts = tomllib.load(file)["project"]["scripts"]
+    return {name: target for name, target in scripts.items()}
+
+
+def import_time(module: str, attribute: str = None) -> tuple:
+    """Returns (cumulative ms, heaviest third-party packages) for one cold import."""
+    statement = f"from {module} import {attribute}" if attribute else f"import {module}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, check=True, cwd=ROOT,
+    )
+    total_us = 0
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        cumulative_us, name = int(cumulative_us), name.strip()
+        if name.split(".")[0] == "vitacrew":
+            if name == module and not name.startswith(" "):
+                total_us = max(total_us, cumulative_us)
+        else:
+            package = name.split(".")[0]
+            packages[package] = max(packages.get(package, 0), cumulative_us)
+    heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:3]
+    return total_us / 1000, heaviest
+
+
+def measure(label: str, module: str, attribute: str = None, runs: int = 3) -> None:
+    samples = [import_time(module, attribute) for _ in range(runs)]
+    median = statistics.median(ms for ms, _ in samples)
+    heaviest = ", ".join(f"{name} {us / 1000:.0f}ms" for name, us in samples[-1][1])
+    print(f"{label:<40} {median:9.1f} ms   {heaviest}")
+
+
+def main(runs: int = 3) -> None:
+    print("entry points")
+    for script, target in entry_points().items():
+        module, attribute = target.split(":")
+        measure(f"  {script} ({target})", module, attribute, runs)
+    print("modules")
+    for module in LIGHT_MODULES + HEAVY_MODULES:
+        measure(f"  {module}", module, runs=runs)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,52 @@
+"""Overhead of instrumentation on tool calls and task execution, tracing off and on.
+
+Usage: python benchmarks/bench_instrumentation.py [calls]
+"""
+import statistics
+import sys
+import time
+from unittest.mock import Mock, patch
+
+from crewai import Task
+
+from vitacrew.crew import CrewFactory
+from vitacrew.instrumentation import Tracer
+from vitacrew.tools.custom_tool import MacroCalculator
+
+
+def per_call(fn, calls: int) -> float:
+    samples = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        samples.append((time.perf_counter() - start) / calls)
+    return statistics.median(samples) * 1e9
+
+
+def kickoff_seconds(enabled: bool, runs: int = 20) -> float:
+    factory = CrewFactory()
+    factory.tracer = Tracer(enabled=enabled)
+    factory.response_cache = None
+    factory.in_flight = None
+    vitacrew = factory.create()
+    samples = []
+    with patch.object(Task, "execute_sync", return_value=Mock(raw="output")):
+        for _ in range(runs):
+            start = time.perf_counter()
+            vitacrew.kickoff_concurrent()
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e3
+
+
+def main(calls: int = 100_000) -> None:
+    tool = MacroCalculator()
+    bare = MacroCalculator._run.__wrapped__
+    print(f"tool _run, undecorated   {per_call(lambda: bare(tool, 2000.0, 'cutting'), calls):8.0f} ns/call")
+    print(f"tool _run, tracing off   {per_call(lambda: tool._run(2000.0, 'cutting'), calls):8.0f} ns/call")
+    print(f"kickoff (fake LLM), tracing off  {kickoff_seconds(False):6.2f} ms")
+    print(f"kickoff (fake LLM), tracing on   {kickoff_seconds(True):6.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,68 @@
+"""Knowledge retrieval: indexing, no-op refresh and search latency as the corpus grows.
+
+Generates synthetic domain documents, indexes them, then times the queries
+the crew's tasks issue (agent role, goal and task description).
+
+Usage: python benchmarks/bench_knowledge.py [documents ...]
+"""
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from vitacrew.crew import Vitacrew
+from vitacrew.knowledge import KnowledgeIndex
+
+WORDS = (
+    "protein carbs fats fibre calories meal breakfast lunch dinner snack vegetarian vegan lentils tofu "
+    "oats rice chicken salmon squat deadlift bench press cardio interval mobility stretching recovery "
+    "sleep stress hydration skin acne dryness moisturiser sunscreen retinol niacinamide cleanser "
+    "routine morning evening weekly progress strength endurance hypertrophy metabolism digestion"
+).split()
+
+
+def write_corpus(root: Path, documents: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    for i in range(documents):
+        paragraphs = [" ".join(rng.choices(WORDS, k=rng.randint(30, 70))) for _ in range(rng.randint(2, 6))]
+        (root / f"doc_{i:05d}.md").write_text("\n\n".join(paragraphs))
+
+
+def main(sizes) -> None:
+    vitacrew = Vitacrew()
+    queries = []
+    for task_name in vitacrew.task_dependencies():
+        config = vitacrew.task_config(task_name)
+        agent = vitacrew.agents_config[config["agent"]]
+        queries.append(" ".join([agent["role"], agent["goal"], config["description"]]))
+
+    for documents in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "knowledge"
+            root.mkdir()
+            write_corpus(root, documents)
+            index = KnowledgeIndex(root, Path(tmp) / "knowledge.db", refresh_seconds=3600)
+
+            start = time.perf_counter()
+            index.refresh()
+            build = time.perf_counter() - start
+            start = time.perf_counter()
+            index.refresh()
+            noop = time.perf_counter() - start
+
+            samples = []
+            for _ in range(20):
+                for query in queries:
+                    start = time.perf_counter()
+                    snippets = index.search(query, k=3)
+                    samples.append(time.perf_counter() - start)
+            context = sum(len(snippet.text) for snippet in snippets)
+            print(f"{documents:6d} docs  {len(index):6d} snippets  build {build:6.2f} s  "
+                  f"no-op refresh {noop * 1e3:6.1f} ms  search p50 {statistics.median(samples) * 1e3:6.2f} ms  "
+                  f"p95 {sorted(samples)[int(0.95 * len(samples))] * 1e3:6.2f} ms  context {context} chars")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000, 5000])
@@ -0,0 +1,84 @@
+"""Concurrent crews against a rate-limited stand-in provider, with and without the shared LLM pool.
+
+The FakeLLM accepts ``limit`` calls per second and answers the rest with
+429s. Without the pool every crew sends as fast as it can and a crew fails
+on its first 429; with it, calls are spaced to the limit and 429s are
+retried. Reports completed crews, wall time, 429s and the pool's
+throttling metrics.
+
+Usage: python benchmarks/bench_llm_pool.py [crews] [limit_per_second]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Keep the progress and response stores out of the user's cache
+os.environ["VITACREW_CACHE_DIR"] = tempfile.mkdtemp(prefix="vitacrew-bench-")
+
+from vitacrew.crew import CrewFactory  # noqa: E402
+from vitacrew.fake_llm import FakeLLM  # noqa: E402
+from vitacrew.llm_pool import BATCH, INTERACTIVE, LLMClientPool  # noqa: E402
+from vitacrew.models import UserInputs  # noqa: E402
+
+PROFILE = {
+    "name": "Bench User",
+    "age": 30,
+    "gender": "male",
+    "height": 175.0,
+    "weight": 70.0,
+    "waist_circumference": 80.0,
+    "hip_circumference": 90.0,
+    "fitness_objectives": ["weight loss"],
+    "dietary_requirements": ["vegetarian"],
+    "skin_type": "normal",
+    "skin_concerns": ["acne"],
+    "sleep_hours": 7.5,
+    "stress_level": "moderate",
+    "activity_level": "moderate",
+}
+
+
+def run(factory: CrewFactory, index: int) -> bool:
+    # Every other crew is batch work, queued behind the interactive ones
+    vitacrew = factory.create(priority=BATCH if index % 2 else INTERACTIVE)
+    vitacrew.collect_user_inputs(UserInputs(**dict(PROFILE, name=f"Bench User {index}")))
+    try:
+        vitacrew.kickoff_concurrent()
+        return True
+    except Exception:
+        return False
+
+
+def scenario(crews: int, limit: int, pooled: bool) -> None:
+    llm = FakeLLM(latency=0.02, rate_limit=limit, rate_limit_window=1.0)
+    pool = LLMClientPool(requests_per_minute=limit * 60, tokens_per_minute=10**9, burst=limit,
+                         backoff_base=0.1, backoff_max=2.0) if pooled else None
+    factory = CrewFactory(llm=llm, pool=pool)
+    factory.response_cache = None  # Measure LLM-bound runs, not cache hits
+    factory.in_flight = None
+    factory.checkpoints = None
+    with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(crews) as executor:
+        start = time.perf_counter()
+        completed = sum(executor.map(lambda index: run(factory, index), range(crews)))
+        seconds = time.perf_counter() - start
+
+    print(f"{'pooled' if pooled else 'unpooled'}: {completed}/{crews} crews completed in {seconds:.1f} s, "
+          f"{llm.calls} calls, {llm.rate_limited} 429s")
+    if pooled:
+        stats = pool.stats()
+        print(f"  max queue depth {stats['max_queue_depth']}, throttled {stats['throttled_requests']} requests, "
+              f"throttle time interactive {stats['throttle_seconds']['interactive']:.1f} s / "
+              f"batch {stats['throttle_seconds']['batch']:.1f} s, {stats['retries']} retries")
+
+
+def main(crews: int = 8, limit: int = 10) -> None:
+    for pooled in (False, True):
+        scenario(crews, limit, pooled)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
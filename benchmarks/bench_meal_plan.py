@@ -0,0 +1,56 @@
+"""Week-long meal plan latency, for one user and in batch.
+
+Usage: python benchmarks/bench_meal_plan.py [users]
+"""
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from vitacrew.foods import FoodDatabase
+from vitacrew.meal_plan import MealPlanOptimizer
+from vitacrew.tools.calculations import calculate_macros
+
+DIETS = [[], ["vegan"], ["vegetarian"], ["gluten-free"], ["paleo"], ["halal", "dairy-free"]]
+
+
+def cohort(size: int, seed: int = 0) -> tuple:
+    rng = np.random.default_rng(seed)
+    targets = [
+        calculate_macros(float(rng.uniform(1600, 3200)), str(rng.choice(["maintenance", "bulking", "cutting"])))
+        for _ in range(size)
+    ]
+    return targets, [DIETS[i % len(DIETS)] for i in range(size)]
+
+
+def main(users: int = 1000) -> None:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        optimizer = MealPlanOptimizer(FoodDatabase.load(cache_dir))
+        targets, diets = cohort(users)
+
+        start = time.perf_counter()
+        optimizer.plan(targets[0], 7, diets[0])
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        single = []
+        for target, requirements in zip(targets[:200], diets[:200]):
+            start = time.perf_counter()
+            optimizer.plan(target, 7, requirements)
+            single.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        plans = optimizer.plan_batch(targets, 7, diets)
+        batch_seconds = time.perf_counter() - start
+        within = sum(plan["within_tolerance"] for plan in plans)
+
+        print(f"first week (builds layouts): {cold_ms:>8.2f} ms")
+        print(f"one week, p50:               {statistics.median(single):>8.2f} ms")
+        print(f"one week, max:               {max(single):>8.2f} ms")
+        print(f"batch of {users:,} weeks:       {batch_seconds:>8.2f} s ({batch_seconds / users * 1000:.2f} ms/user)")
+        print(f"plans within tolerance:      {within:>8} / {users}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
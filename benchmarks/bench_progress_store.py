@@ -0,0 +1,50 @@
+"""Read latency of ProgressStore for one user's year of daily metrics.
+
+Usage: python benchmarks/bench_progress_store.py [users]
+"""
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from vitacrew.progress import ProgressStore
+
+METRICS = ("weight", "sleep", "steps")
+DAYS = 365
+
+
+def timed(fn, repeat: int = 500) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def main(users: int = 1000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ProgressStore(Path(tmp) / "progress.db")
+        start_day = date(2024, 1, 1)
+        start = time.perf_counter()
+        for user in range(users):
+            store.ingest(
+                (f"user {user}", metric, start_day + timedelta(days=day), day % 17)
+                for metric in METRICS for day in range(DAYS)
+            )
+        ingest_seconds = time.perf_counter() - start
+        rows = users * len(METRICS) * DAYS
+
+        user = f"user {users // 2}"
+        print(f"rows: {rows:,}  bulk ingest {rows / ingest_seconds:,.0f} rows/s")
+        print(f"year range query   median {timed(lambda: store.query(user, 'weight')):8.1f} us")
+        print(f"month range query  median "
+              f"{timed(lambda: store.query(user, 'weight', '2024-06-01', '2024-06-30')):8.1f} us")
+        print(f"weekly rollup      median {timed(lambda: store.rollup(user, 'weight', 'week')):8.1f} us")
+        print(f"daily rollup       median {timed(lambda: store.rollup(user, 'weight', 'day')):8.1f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,37 @@
+"""Render time of the wellness report (HTML and streamed PDF) from task outputs.
+
+Usage: python benchmarks/bench_report_render.py [words per section]
+"""
+import statistics
+import sys
+import time
+
+from vitacrew.report import SECTION_TITLES, render_html, render_pdf
+
+
+def section_text(words: int) -> str:
+    lines = ["## Overview", "This plan balances **training load** with recovery. " * (words // 16), ""]
+    lines += [f"- Step {i}: keep a steady pace and log how it felt" for i in range(words // 10)]
+    return "\n".join(lines)
+
+
+def timed(render, repeat: int = 50) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in render():
+            pass
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e3
+
+
+def main(words: int = 600) -> None:
+    outputs = [(name, section_text(words)) for name in SECTION_TITLES]
+    pdf_bytes = sum(len(chunk) for chunk in render_pdf(outputs, "Wellness Plan"))
+    print(f"sections: {len(outputs)} x ~{words} words, pdf {pdf_bytes / 1024:.0f} KiB")
+    print(f"html  median {timed(lambda: render_html(outputs, 'Wellness Plan')):7.2f} ms")
+    print(f"pdf   median {timed(lambda: render_pdf(outputs, 'Wellness Plan')):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 600)
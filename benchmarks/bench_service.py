@@ -0,0 +1,99 @@
+"""Plan service throughput over HTTP with the offline FakeLLM.
+
+Submits profiles from many concurrent clients to a local service, polling
+each job to completion and retrying after 429s. Reports jobs per second,
+p50/p95 time from submission to result and how often the queue pushed back.
+
+Usage: python benchmarks/bench_service.py [clients] [workers] [queue_size] [latency_ms]
+"""
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Keep the progress and response stores out of the user's cache
+os.environ["VITACREW_CACHE_DIR"] = tempfile.mkdtemp(prefix="vitacrew-bench-")
+
+from vitacrew.crew import CrewFactory  # noqa: E402
+from vitacrew.fake_llm import FakeLLM  # noqa: E402
+from vitacrew.service import PlanService, serve  # noqa: E402
+
+PROFILE = {
+    "name": "Bench User",
+    "age": 30,
+    "gender": "male",
+    "height": 175.0,
+    "weight": 70.0,
+    "waist_circumference": 80.0,
+    "hip_circumference": 90.0,
+    "fitness_objectives": ["weight loss"],
+    "dietary_requirements": ["vegetarian"],
+    "skin_type": "normal",
+    "skin_concerns": ["acne"],
+    "sleep_hours": 7.5,
+    "stress_level": "moderate",
+    "activity_level": "moderate",
+}
+POLL_SECONDS = 0.02
+
+
+async def request(port: int, method: str, path: str, body: bytes = b"") -> tuple:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    head, _, payload = (await reader.read()).partition(b"\r\n\r\n")
+    writer.close()
+    return int(head.split()[1]), json.loads(payload)
+
+
+async def client(port: int, index: int, refusals: list) -> float:
+    body = json.dumps(dict(PROFILE, name=f"Bench User {index}", age=25 + index % 40)).encode()
+    start = time.perf_counter()
+    while True:
+        status, job = await request(port, "POST", "/plans", body)
+        if status != 429:
+            break
+        refusals.append(index)
+        await asyncio.sleep(POLL_SECONDS * 5)
+    while job["status"] in ("queued", "running"):
+        await asyncio.sleep(POLL_SECONDS)
+        _, job = await request(port, "GET", f"/plans/{job['id']}")
+    assert job["status"] == "succeeded", job
+    return time.perf_counter() - start
+
+
+async def main(clients: int, workers: int, queue_size: int, latency: float) -> None:
+    factory = CrewFactory(llm=FakeLLM(latency=latency, prompt_tokens_per_second=20_000, output_tokens_per_second=100))
+    factory.response_cache = None  # Measure LLM-bound runs, not cache hits
+    factory.in_flight = None
+    factory.checkpoints = None
+    service = PlanService(factory, workers=workers, queue_size=queue_size)
+    server = await serve(service, port=0)
+    port = server.sockets[0].getsockname()[1]
+    refusals: list = []
+    try:
+        # Agents are verbose; keep their output out of the results
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            latencies = await asyncio.gather(*(client(port, i, refusals) for i in range(clients)))
+            seconds = time.perf_counter() - start
+    finally:
+        server.close()
+        await service.stop()
+
+    latencies = sorted(latencies)
+    print(f"{clients} clients, {workers} workers, queue of {queue_size}")
+    print(f"throughput:          {clients / seconds:>8.2f} plans/s")
+    print(f"submit to result p50: {statistics.median(latencies):>7.2f} s")
+    print(f"submit to result p95: {latencies[int(0.95 * (len(latencies) - 1))]:>7.2f} s")
+    print(f"429 responses:        {len(refusals):>7}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    clients, workers, queue_size, latency_ms = args + [32, 4, 8, 50][len(args):]
+    asyncio.run(main(clients, workers, queue_size, latency_ms / 1000))
@@ -0,0 +1,70 @@
+"""LLM calls saved by single-flight deduplication when identical profiles arrive together.
+
+Runs a burst of concurrent crews for the same default-form profile (as in
+an onboarding campaign) against the offline FakeLLM, with and without
+coalescing of identical in-flight tasks, and reports LLM calls, executions
+saved and wall time.
+
+Usage: python benchmarks/bench_single_flight.py [crews] [latency_ms]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Keep the progress and response stores out of the user's cache
+os.environ["VITACREW_CACHE_DIR"] = tempfile.mkdtemp(prefix="vitacrew-bench-")
+
+from vitacrew.cache import SingleFlight  # noqa: E402
+from vitacrew.crew import CrewFactory  # noqa: E402
+from vitacrew.fake_llm import FakeLLM  # noqa: E402
+from vitacrew.models import UserInputs  # noqa: E402
+
+PROFILE = {
+    "name": "New Member",
+    "age": 30,
+    "gender": "female",
+    "height": 165.0,
+    "weight": 65.0,
+    "waist_circumference": 75.0,
+    "hip_circumference": 95.0,
+    "fitness_objectives": ["general fitness"],
+    "dietary_requirements": ["none"],
+    "skin_type": "normal",
+    "skin_concerns": ["none"],
+    "sleep_hours": 7.0,
+    "stress_level": "moderate",
+    "activity_level": "moderate",
+}
+
+
+def scenario(crews: int, latency: float, coalesce: bool) -> None:
+    llm = FakeLLM(latency=latency, prompt_tokens_per_second=20_000, output_tokens_per_second=100)
+    factory = CrewFactory(llm=llm)
+    factory.response_cache = None  # Only in-flight sharing, not cache hits
+    factory.checkpoints = None
+    factory.in_flight = SingleFlight() if coalesce else None
+    runs = [factory.create() for _ in range(crews)]
+    for vitacrew in runs:
+        vitacrew.collect_user_inputs(UserInputs(**PROFILE))
+
+    with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(crews) as executor:
+        start = time.perf_counter()
+        list(executor.map(lambda vitacrew: vitacrew.kickoff_concurrent(), runs))
+        seconds = time.perf_counter() - start
+
+    saved = factory.in_flight.stats["saved"] if coalesce else 0
+    print(f"{'single-flight' if coalesce else 'independent'}: {crews} crews in {seconds:.2f} s, "
+          f"{llm.calls} LLM calls, {saved} executions saved")
+
+
+def main(crews: int = 16, latency_ms: int = 50) -> None:
+    for coalesce in (False, True):
+        scenario(crews, latency_ms / 1000, coalesce)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
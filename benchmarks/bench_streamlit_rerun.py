@@ -0,0 +1,65 @@
+"""Streamlit rerun latency with and without the shared crew factory.
+
+Reruns the app headlessly (streamlit.testing) as a sidebar edit would, and
+compares it with constructing a fresh Vitacrew on every rerun, which is what
+the app did before the crew moved to session scope.
+
+Usage: python benchmarks/bench_streamlit_rerun.py [reruns]
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+from vitacrew.crew import CrewFactory, Vitacrew
+
+APP = Path(__file__).resolve().parents[1] / "src" / "gui" / "vitacrew_app.py"
+
+SCRIPT = f"""
+import sys
+sys.path.insert(0, {str(APP.parent)!r})
+import streamlit as st
+import vitacrew_app
+
+if {{fresh_crew}}:
+    # The pre-factory behaviour: every rerun built a new Vitacrew from scratch
+    from vitacrew.crew import Vitacrew
+    st.session_state.vitacrew = Vitacrew()
+vitacrew_app.VitaCrewUI().render()
+"""
+
+
+def rerun_latencies(reruns: int, fresh_crew: bool = False) -> list:
+    app = AppTest.from_string(SCRIPT.format(fresh_crew=fresh_crew), default_timeout=60).run()
+    latencies = []
+    for i in range(reruns):
+        app.text_input(key="name").input(f"User {i}")
+        start = time.perf_counter()
+        app.run()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(label: str, latencies: list) -> None:
+    print(f"{label:<28} median {statistics.median(latencies) * 1000:7.1f} ms"
+          f"   max {max(latencies) * 1000:7.1f} ms")
+
+
+def main(reruns: int = 20) -> None:
+    factory = CrewFactory()
+    for label, build in (("Vitacrew() per construction", Vitacrew), ("factory.create()", factory.create)):
+        samples = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            build()
+            samples.append(time.perf_counter() - start)
+        report(label, samples)
+
+    report("rerun, new crew each time", rerun_latencies(reruns, fresh_crew=True))
+    report("rerun, session-scoped crew", rerun_latencies(reruns))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,74 @@
+"""Bulk profile validation throughput versus constructing UserInputs in a loop.
+
+Usage: python benchmarks/bench_validation.py [rows]
+"""
+import sys
+import time
+
+import numpy as np
+from pydantic import ValidationError
+
+from vitacrew.models import DIETARY_REQUIREMENTS, FITNESS_OBJECTIVES, SKIN_CONCERNS, UserInputs
+from vitacrew.validation import validate_records
+
+# Share of rows with a bad value, like a typical partner file
+INVALID_SHARE = 0.01
+
+
+def profiles(size: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    objectives, diets, concerns = sorted(FITNESS_OBJECTIVES), sorted(DIETARY_REQUIREMENTS), sorted(SKIN_CONCERNS)
+    rows = []
+    for i in range(size):
+        row = {
+            "name": f"User {i}",
+            "age": int(rng.integers(18, 80)),
+            "gender": str(rng.choice(["male", "female", "other"])),
+            "height": float(rng.uniform(150, 200)),
+            "weight": float(rng.uniform(50, 120)),
+            "waist_circumference": float(rng.uniform(60, 110)),
+            "hip_circumference": float(rng.uniform(80, 120)),
+            "fitness_objectives": [str(o).title() for o in rng.choice(objectives, rng.integers(1, 3), replace=False)],
+            "dietary_requirements": [str(rng.choice(diets))],
+            "skin_type": str(rng.choice(["normal", "dry", "oily", "combination", "sensitive"])),
+            "skin_concerns": [str(rng.choice(concerns))],
+            "sleep_hours": float(rng.uniform(4, 10)),
+            "stress_level": str(rng.choice(["low", "moderate", "high"])),
+            "activity_level": str(rng.choice(["sedentary", "light", "moderate", "active", "very active"])),
+        }
+        if rng.random() < INVALID_SHARE:
+            row[str(rng.choice(["age", "fitness_objectives", "gender"]))] = "unknown"
+        rows.append(row)
+    return rows
+
+
+def loop(rows: list) -> int:
+    errors = 0
+    for row in rows:
+        try:
+            UserInputs(**row)
+        except ValidationError:
+            errors += 1
+    return errors
+
+
+def main(rows: int = 100_000) -> None:
+    records = profiles(rows)
+    loop(records[:1000])  # warm up both paths
+    validate_records(records[:1000])
+
+    start = time.perf_counter()
+    loop_errors = loop(records)
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    report = validate_records(records)
+    batch_seconds = time.perf_counter() - start
+
+    print(f"rows: {rows:,} ({len(report.errors):,} invalid; loop rejected {loop_errors:,})")
+    print(f"UserInputs loop:   {rows / loop_seconds:>10,.0f} rows/s")
+    print(f"validate_records:  {rows / batch_seconds:>10,.0f} rows/s ({loop_seconds / batch_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
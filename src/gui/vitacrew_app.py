@@ -1,9 +1,48 @@
+import tempfile
+import threading
+
 import streamlit as st
-from vitacrew.crew import Vitacrew, UserInputs, Gender, StressLevel, ActivityLevel, SkinType
+from vitacrew.models import UserInputs, Gender, StressLevel, ActivityLevel, SkinType
+from vitacrew.events import (
+    PLAN_FAILED, PLAN_FINISHED, TASK_FINISHED, TASK_STARTED, TOKEN, TOOL_STARTED, EventStream
+)
+
+TASK_LABELS = {
+    "analyze_fitness": "Personal Trainer analyzing your fitness profile",
+    "generate_workout": "Personal Trainer building your workout plan",
+    "create_meal_plan": "Nutritionist creating your meal plan",
+    "generate_grocery_list": "Nutritionist writing your grocery list",
+    "assess_skin": "Beauty Specialist assessing your skin",
+    "design_routine": "Beauty Specialist designing your skincare routine",
+    "analyze_data": "Health Analyst analyzing your tracked metrics",
+    "generate_report": "Health Analyst writing your progress report",
+    "format_plans": "Design Specialist compiling your report",
+    "create_visuals": "Design Specialist preparing visual guides",
+}
+
+@st.cache_resource
+def get_crew_factory() -> "CrewFactory":
+    """Tools, configs and LLM client shared by every session in this process"""
+    # Imported here so the first page renders before crewai finishes loading
+    from vitacrew.crew import CrewFactory
+    return CrewFactory()
+
+def run_plan_in_background(vitacrew: "Vitacrew", events: EventStream) -> None:
+    """Runs the crew on a worker thread, reporting through ``events`` only."""
+    try:
+        events.emit(PLAN_FINISHED, outputs=vitacrew.kickoff_concurrent(events=events))
+    except Exception as e:
+        events.emit(PLAN_FAILED, error=str(e))
 
 class VitaCrewUI:
-    def __init__(self):
-        self.vitacrew = Vitacrew()
+    @property
+    def vitacrew(self) -> "Vitacrew":
+        """The user's crew, created on first use from the process-wide factory"""
+        # Streamlit reruns the script on every interaction, so the crew lives in
+        # session scope rather than on this object
+        if "vitacrew" not in st.session_state:
+            st.session_state.vitacrew = get_crew_factory().create()
+        return st.session_state.vitacrew
 
     def initialize_session_state(self):
         """Initialize session state variables if they don't exist"""
@@ -13,6 +52,10 @@ class VitaCrewUI:
             st.session_state.generating_plan = False
         if "wellness_plan" not in st.session_state:
             st.session_state.wellness_plan = None
+        if "plan_events" not in st.session_state:
+            st.session_state.plan_events = None
+        if "task_progress" not in st.session_state:
+            st.session_state.task_progress = {}
 
     def personal_info_form(self):
         """Collect personal information from user"""
@@ -93,42 +136,115 @@ class VitaCrewUI:
         if "user_inputs" in st.session_state and st.session_state.user_inputs:
             st.subheader("Health Metrics")
             
-            col1, col2 = st.columns(2)
-            with col1:
-                if "health_metrics" in st.session_state.user_inputs:
-                    metrics = st.session_state.user_inputs["health_metrics"]
+            if "health_metrics" in st.session_state.user_inputs:
+                metrics = st.session_state.user_inputs["health_metrics"]
+                col1, col2 = st.columns(2)
+                with col1:
                     st.metric("BMR (kcal/day)", f"{metrics['bmr']:.0f}")
+                    st.metric("TDEE (kcal/day)", f"{metrics['tdee']}")
+                    st.metric("Calorie target (kcal/day)", f"{metrics['calorie_target']}",
+                              delta=f"{metrics['calorie_adjustment']:+d}", delta_color="off")
+                with col2:
+                    st.metric("BMI", f"{metrics['bmi']}", help=metrics["bmi_category"])
+                    st.metric("Waist-to-hip ratio", f"{metrics['waist_to_hip_ratio']}",
+                              help=f"{metrics['whr_risk']} risk")
+
+    def start_plan(self, user_inputs: UserInputs):
+        """Start a real crew run on a background thread and stream its events"""
+        if st.session_state.generating_plan:
+            # The session's crew is already planning; a second run would share its state
+            return
+        self.vitacrew.collect_user_inputs(user_inputs)
+        events = EventStream()
+        st.session_state.user_inputs = self.vitacrew.user_data
+        st.session_state.plan_events = events
+        st.session_state.task_progress = {
+            name: {"status": "pending", "text": "", "tools": []} for name in self.vitacrew.task_dependencies()
+        }
+        st.session_state.wellness_plan = None
+        st.session_state.generating_plan = True
+        threading.Thread(
+            target=run_plan_in_background, args=(self.vitacrew, events), daemon=True
+        ).start()
+
+    def apply_plan_events(self):
+        """Fold newly arrived crew events into session state"""
+        progress = st.session_state.task_progress
+        for event in st.session_state.plan_events.drain():
+            if event.kind == TASK_STARTED:
+                progress[event.task]["status"] = "running"
+            elif event.kind == TOKEN:
+                progress[event.task]["text"] += event.data["text"]
+            elif event.kind == TOOL_STARTED:
+                progress[event.task]["tools"].append(event.data["tool"])
+            elif event.kind == TASK_FINISHED:
+                progress[event.task]["status"] = "done"
+                progress[event.task]["text"] = event.data["output"]
+                progress[event.task]["prompt_tokens"] = event.data.get("prompt_tokens")
+                progress[event.task]["reused"] = event.data.get("reused", False)
+            elif event.kind == PLAN_FINISHED:
+                st.session_state.wellness_plan = event.data["outputs"]
+                st.session_state.generating_plan = False
+            elif event.kind == PLAN_FAILED:
+                st.session_state.plan_error = event.data["error"]
+                st.session_state.generating_plan = False
+
+    @st.fragment(run_every=0.5)
+    def live_progress(self):
+        """Poll the event stream and render task progress without blocking the script"""
+        self.apply_plan_events()
+        progress = st.session_state.task_progress
+        finished = sum(task["status"] == "done" for task in progress.values())
+        st.progress(finished / max(len(progress), 1), text=f"{finished} of {len(progress)} tasks complete")
+
+        for name, task in progress.items():
+            icon = {"pending": "⏳", "running": "🔄", "done": "✅"}[task["status"]]
+            with st.expander(f"{icon} {TASK_LABELS.get(name, name)}", expanded=task["status"] == "running"):
+                if task["tools"]:
+                    st.caption("Tools used: " + ", ".join(task["tools"]))
+                if task.get("reused"):
+                    st.caption("Unchanged by your edits; reused from the previous plan")
+                if task.get("prompt_tokens"):
+                    st.caption(f"Prompt size: ~{task['prompt_tokens']:,} tokens")
+                if self.is_rendered(name) and task["text"]:
+                    st.markdown("_Report rendered._")
+                else:
+                    st.markdown(task["text"] or "_Waiting..._")
+
+        if not st.session_state.generating_plan:
+            # Leave fragment mode so the whole page reflects the finished plan
+            st.rerun()
 
     def display_agent_interactions(self):
         """Display agent interactions and progress"""
         if st.session_state.generating_plan:
             st.header("Generating Your Wellness Plan")
-            
-            with st.spinner("Personal Trainer analyzing your fitness profile..."):
-                # Simulate agent work - in real implementation, this would be actual agent tasks
-                st.progress(0.25)
-            
-            with st.spinner("Nutritionist creating your meal plan..."):
-                st.progress(0.50)
-            
-            with st.spinner("Beauty Specialist designing your skincare routine..."):
-                st.progress(0.75)
-            
-            with st.spinner("Health Analyst compiling your comprehensive report..."):
-                st.progress(1.0)
+            self.live_progress()
 
-            st.session_state.generating_plan = False
-            st.session_state.wellness_plan = "Generated"  # This would be actual plan in real implementation
+        if st.session_state.get("plan_error"):
+            st.error(f"Plan generation failed: {st.session_state.plan_error}")
 
         if st.session_state.wellness_plan:
             st.success("Your Wellness Plan is ready!")
+            plan = st.session_state.wellness_plan
+            for name, output in plan.items():
+                with st.expander(TASK_LABELS.get(name, name)):
+                    if self.is_rendered(name):
+                        st.html(output)
+                    else:
+                        st.markdown(output)
             st.download_button(
                 label="Download Wellness Plan (PDF)",
-                data="Your wellness plan content here",  # This would be actual PDF in real implementation
+                # Rendered on click, streamed page by page into a temporary file
+                data=lambda: self.vitacrew.write_report_pdf(plan, tempfile.TemporaryFile(buffering=0)),
                 file_name="wellness_plan.pdf",
                 mime="application/pdf"
             )
 
+    def is_rendered(self, task_name):
+        """Whether a task's output is the locally rendered HTML report"""
+        return self.vitacrew.task_config(task_name).get("render") == "report"
+
     def sidebar(self):
         """Render the sidebar with user input forms"""
         with st.sidebar:
@@ -141,17 +257,18 @@ class VitaCrewUI:
             lifestyle_factors = self.lifestyle_factors_form()
 
             # Combine all inputs
-            if st.button("Generate Wellness Plan"):
+            if st.button("Generate Wellness Plan", disabled=st.session_state.generating_plan):
                 try:
                     user_inputs = UserInputs(
                         **personal_info,
                         **health_goals,
                         **lifestyle_factors
                     )
-                    st.session_state.user_inputs = user_inputs.model_dump()
-                    st.session_state.generating_plan = True
                 except Exception as e:
                     st.error(f"Please fill in all required fields: {str(e)}")
+                else:
+                    st.session_state.plan_error = None
+                    self.start_plan(user_inputs)
 
     def render(self):
         """Main render function"""
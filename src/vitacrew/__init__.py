@@ -0,0 +1,15 @@
+from vitacrew.models import ActivityLevel, Gender, SkinType, StressLevel, UserInputs
+
+# The crew pulls in crewai and takes seconds to import; load it on first access
+_LAZY_ATTRIBUTES = {
+    "Vitacrew": "vitacrew.crew",
+    "CrewFactory": "vitacrew.crew",
+}
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    raise AttributeError(f"module 'vitacrew' has no attribute '{name}'")
+
+__all__ = ["ActivityLevel", "Gender", "SkinType", "StressLevel", "UserInputs", *_LAZY_ATTRIBUTES]
@@ -0,0 +1,236 @@
+import math
+import threading
+from collections import deque
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from vitacrew.progress import ProgressStore
+
+DEFAULT_WINDOW = 7
+# CUSUM slack and decision threshold, in standard deviations of the current segment
+CUSUM_SLACK = 0.5
+CUSUM_THRESHOLD = 5.0
+MIN_SEGMENT_POINTS = 5
+MIN_PAIRED_POINTS = 5
+MAX_CHANGE_POINTS = 10
+
+
+def _ordinal(day: str) -> int:
+    return date.fromisoformat(day).toordinal()
+
+
+class MetricStats:
+    """Running statistics of one metric series, updated in O(1) per point.
+
+    Tracks the overall mean and spread (Welford), an exact rolling mean over
+    the last ``window`` points, the least-squares slope against time, and
+    change-points found by a two-sided CUSUM against the current segment.
+    Points must be added in date order.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.last_date: Optional[str] = None
+        self.last_value: Optional[float] = None
+        self._window: "deque[float]" = deque(maxlen=window)
+        self._window_sum = 0.0
+        # Regression sums over (days since first point, value)
+        self._origin: Optional[int] = None
+        self._sx = self._sy = self._sxx = self._sxy = 0.0
+        # Current CUSUM segment
+        self._segment_count = 0
+        self._segment_mean = 0.0
+        self._segment_m2 = 0.0
+        self._cusum_high = self._cusum_low = 0.0
+        self.change_points: "deque[dict]" = deque(maxlen=MAX_CHANGE_POINTS)
+
+    def add(self, day: str, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.last_date, self.last_value = day, value
+
+        if len(self._window) == self._window.maxlen:
+            self._window_sum -= self._window[0]
+        self._window.append(value)
+        self._window_sum += value
+
+        if self._origin is None:
+            self._origin = _ordinal(day)
+        x = _ordinal(day) - self._origin
+        self._sx += x
+        self._sy += value
+        self._sxx += x * x
+        self._sxy += x * value
+
+        self._detect_change(day, value)
+
+    def _detect_change(self, day: str, value: float) -> None:
+        if self._segment_count >= MIN_SEGMENT_POINTS:
+            std = math.sqrt(self._segment_m2 / (self._segment_count - 1))
+            if std > 0:
+                z = (value - self._segment_mean) / std
+                self._cusum_high = max(0.0, self._cusum_high + z - CUSUM_SLACK)
+                self._cusum_low = max(0.0, self._cusum_low - z - CUSUM_SLACK)
+                if max(self._cusum_high, self._cusum_low) > CUSUM_THRESHOLD:
+                    direction = "up" if self._cusum_high > self._cusum_low else "down"
+                    self.change_points.append({"date": day, "direction": direction})
+                    # The new regime starts a fresh segment
+                    self._segment_count = 0
+                    self._segment_mean = self._segment_m2 = 0.0
+                    self._cusum_high = self._cusum_low = 0.0
+
+        self._segment_count += 1
+        delta = value - self._segment_mean
+        self._segment_mean += delta / self._segment_count
+        self._segment_m2 += delta * (value - self._segment_mean)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    @property
+    def rolling_mean(self) -> Optional[float]:
+        return self._window_sum / len(self._window) if self._window else None
+
+    @property
+    def slope(self) -> Optional[float]:
+        """Least-squares change per day, or None until two distinct dates are seen."""
+        denominator = self.count * self._sxx - self._sx * self._sx
+        if self.count < 2 or denominator == 0:
+            return None
+        return (self.count * self._sxy - self._sx * self._sy) / denominator
+
+    def summary(self, digits: int = 3) -> dict:
+        slope = self.slope
+        return {
+            "count": self.count,
+            "last": self.last_value,
+            "last_date": self.last_date,
+            "mean": round(self.mean, digits),
+            "std": round(self.std, digits),
+            f"rolling_mean_{self._window.maxlen}": round(self.rolling_mean, digits),
+            "slope_per_week": None if slope is None else round(7 * slope, digits),
+            "change_points": list(self.change_points),
+        }
+
+
+class PairStats:
+    """Running Pearson correlation of two metrics measured on the same dates."""
+
+    def __init__(self):
+        self.count = 0
+        self._mean_x = self._mean_y = 0.0
+        self._m2x = self._m2y = self._cxy = 0.0
+        self.last_date: Optional[str] = None
+
+    def add(self, day: str, x: float, y: float) -> None:
+        if day == self.last_date:
+            return  # Already paired for this date
+        self.last_date = day
+        self.count += 1
+        dx = x - self._mean_x
+        self._mean_x += dx / self.count
+        dy = y - self._mean_y
+        self._mean_y += dy / self.count
+        self._m2x += dx * (x - self._mean_x)
+        self._m2y += dy * (y - self._mean_y)
+        self._cxy += dx * (y - self._mean_y)
+
+    @property
+    def correlation(self) -> Optional[float]:
+        if self._m2x <= 0 or self._m2y <= 0:
+            return None
+        return self._cxy / math.sqrt(self._m2x * self._m2y)
+
+
+class HealthAnalytics:
+    """Incremental trend, change-point and correlation analytics over a ProgressStore.
+
+    Subscribes to the store so every new measurement updates the statistics
+    in constant time. A user's history is scanned once, the first time their
+    summary is requested; after that nothing is re-read, unless a measurement
+    is backdated before the user's latest one: rolling means, change-points
+    and pairings depend on date order, so that user's history is replayed.
+    """
+
+    def __init__(self, store: ProgressStore, window: int = DEFAULT_WINDOW):
+        self.store = store
+        self.window = window
+        # Per loaded user: statistics by metric and by metric pair
+        self._metrics: Dict[str, Dict[str, MetricStats]] = {}
+        self._pairs: Dict[str, Dict[Tuple[str, str], PairStats]] = {}
+        # Highest store row id included when each user's history was loaded
+        self._loaded_through: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        store.subscribe(self._on_measurement)
+
+    def _on_measurement(self, row_id: int, user: str, metric_type: str, day: str, value: float) -> None:
+        with self._lock:
+            # Users not loaded yet pick the point up from the store when they are,
+            # as do loaded users whose history already included it
+            if user not in self._metrics or row_id <= self._loaded_through[user]:
+                return
+            latest = max((stats.last_date for stats in self._metrics[user].values()), default=day)
+            if day < latest:
+                self._load(user)
+            else:
+                self._add(user, metric_type, day, value)
+
+    def _add(self, user: str, metric_type: str, day: str, value: float) -> None:
+        metrics = self._metrics[user]
+        stats = metrics.get(metric_type)
+        if stats is None:
+            stats = metrics[metric_type] = MetricStats(self.window)
+        stats.add(day, value)
+
+        for other, other_stats in metrics.items():
+            if other != metric_type and other_stats.last_date == day:
+                first, second = sorted((metric_type, other))
+                pair = self._pairs[user].setdefault((first, second), PairStats())
+                values = {metric_type: value, other: other_stats.last_value}
+                pair.add(day, values[first], values[second])
+
+    def _load(self, user: str) -> None:
+        """(Re)builds a user's statistics from their full history, in date order so same-day points pair up."""
+        self._metrics[user] = {}
+        self._pairs[user] = {}
+        loaded_through = 0
+        for row_id, day, metric_type, value in self.store.history(user):
+            self._add(user, metric_type, day, value)
+            loaded_through = max(loaded_through, row_id)
+        self._loaded_through[user] = loaded_through
+
+    def summary(self, user: str, metric_types: Optional[Iterable[str]] = None) -> dict:
+        """
+        Compact numeric summary of a user's tracked metrics.
+
+        Args:
+            user: User whose metrics are summarized
+            metric_types: Restrict the summary to these metrics (default: all)
+
+        Returns:
+            dict: Per-metric statistics and the correlations between metrics
+            measured together on at least a few dates
+        """
+        with self._lock:
+            if user not in self._metrics:
+                self._load(user)
+            user_metrics = self._metrics[user]
+            wanted = set(metric_types) if metric_types else set(user_metrics)
+            metrics = {
+                metric_type: user_metrics[metric_type].summary()
+                for metric_type in sorted(wanted & set(user_metrics))
+            }
+            correlations: List[dict] = []
+            for (first, second), pair in sorted(self._pairs[user].items()):
+                correlation = pair.correlation
+                if (first in wanted and second in wanted
+                        and pair.count >= MIN_PAIRED_POINTS and correlation is not None):
+                    correlations.append(
+                        {"metrics": [first, second], "r": round(correlation, 3), "n": pair.count}
+                    )
+        return {"user": user, "metrics": metrics, "correlations": correlations}
@@ -0,0 +1,209 @@
+import csv
+import json
+import os
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple, Union, get_origin
+
+from vitacrew.llm_pool import BATCH
+from vitacrew.models import UserInputs
+
+DEFAULT_WORKERS = 4
+CSV_LIST_SEPARATOR = ";"
+# Bytes read at a time while looking for the last complete output line
+TAIL_CHUNK_BYTES = 64 * 1024
+
+LIST_FIELDS = {
+    name for name, field in UserInputs.model_fields.items()
+    if get_origin(field.annotation) is list
+}
+
+
+@dataclass
+class UnreadableRecord:
+    """Stands in for a line or row that could not be parsed into a record."""
+    error: str
+
+
+def iter_records(path: Union[str, Path]) -> Iterator[Tuple[int, Union[dict, UnreadableRecord]]]:
+    """
+    Streams raw profile records from a JSONL or CSV file, one at a time.
+
+    CSV list columns (e.g. fitness_objectives) hold values separated by ';'.
+    Records are not validated here; validation happens when a record is planned.
+    A malformed JSON line or a CSV row with missing columns keeps its index
+    and is yielded as an UnreadableRecord, so one bad line never stops a run.
+
+    Yields:
+        Tuple[int, Union[dict, UnreadableRecord]]: Zero-based record index and the raw record
+    """
+    path = Path(path)
+    with open(path, newline="", encoding="utf-8") as file:
+        if path.suffix.lower() == ".csv":
+            reader = csv.DictReader(file)
+            for index, row in enumerate(reader):
+                if None in row.values():
+                    yield index, UnreadableRecord(
+                        f"Row has {sum(value is not None for value in row.values())} of "
+                        f"{len(reader.fieldnames)} columns"
+                    )
+                    continue
+                for name in LIST_FIELDS & row.keys():
+                    row[name] = [item.strip() for item in row[name].split(CSV_LIST_SEPARATOR) if item.strip()]
+                yield index, row
+        else:
+            index = 0
+            for line in file:
+                if line.strip():
+                    try:
+                        yield index, json.loads(line)
+                    except ValueError as e:
+                        yield index, UnreadableRecord(f"Invalid JSON: {e}")
+                    index += 1
+
+
+@lru_cache(maxsize=None)
+def worker_factory():
+    """The CrewFactory of the current worker process, built on its first record."""
+    from vitacrew.crew import CrewFactory
+
+    return CrewFactory()
+
+
+def plan_record(index: int, record: dict) -> dict:
+    """Validates one record and runs the full crew for it (executed in a worker process)."""
+    try:
+        user_inputs = UserInputs(**record)
+        # Queued behind interactive plans sharing the process's LLM pool
+        vitacrew = worker_factory().create(priority=BATCH)
+        vitacrew.collect_user_inputs(user_inputs)
+        return {"index": index, "name": user_inputs.name, "plan": vitacrew.kickoff_concurrent()}
+    except Exception as e:
+        return {"index": index, "error": str(e)}
+
+
+def offset_path(output_path: Union[str, Path]) -> Path:
+    """Sidecar file recording how far a batch run has progressed."""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.name + ".offset")
+
+
+def _load_progress(output_path: Path) -> Tuple[int, Set[int]]:
+    """Returns the committed offset and indexes already written past it."""
+    offset = 0
+    if offset_path(output_path).exists():
+        offset = json.loads(offset_path(output_path).read_text())["offset"]
+
+    done = set()
+    if output_path.exists():
+        with open(output_path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    index = json.loads(line)["index"]
+                except (ValueError, KeyError):
+                    continue  # Partial line from an interrupted write
+                if index >= offset:
+                    done.add(index)
+    return offset, done
+
+
+def _truncate_partial_line(output_path: Path) -> None:
+    """Drops an unterminated last line left by an interrupted write, so appends start on a fresh line."""
+    if not output_path.exists():
+        return
+    with open(output_path, "r+b") as file:
+        end = file.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - TAIL_CHUNK_BYTES)
+            file.seek(start)
+            newline = file.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                position = start + newline + 1
+                break
+            position = start
+        if position < end:
+            file.truncate(position)
+
+
+def _save_offset(output_path: Path, offset: int) -> None:
+    path = offset_path(output_path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"offset": offset}))
+    os.replace(tmp, path)
+
+
+def run_batch(
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    workers: int = DEFAULT_WORKERS,
+    max_pending: Optional[int] = None,
+    plan: Callable[[int, dict], dict] = plan_record,
+) -> Dict[str, int]:
+    """
+    Plans every profile in ``input_path`` on a process pool, streaming results.
+
+    At most ``max_pending`` records are read ahead of the workers, so memory
+    stays flat regardless of input size. Each result is appended to
+    ``output_path`` as a JSON line as soon as it finishes, and the offset below
+    which every record is done is kept in a ``.offset`` sidecar; rerunning with
+    the same output resumes after it.
+
+    Args:
+        input_path: JSONL or CSV file of UserInputs records
+        output_path: JSONL file receiving one result per record
+        workers: Number of worker processes
+        max_pending: Records in flight at once (defaults to twice the workers)
+        plan: Callable producing the result for ``(index, record)``
+
+    Returns:
+        Dict[str, int]: Counts of planned, failed and skipped records
+    """
+    output_path = Path(output_path)
+    max_pending = max_pending or 2 * workers
+    _truncate_partial_line(output_path)
+    offset, done = _load_progress(output_path)
+    counts = {"planned": 0, "failed": 0, "skipped": 0}
+    running: Dict[Future, int] = {}
+
+    def write(result: dict) -> None:
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+        counts["failed" if "error" in result else "planned"] += 1
+        done.add(result["index"])
+
+    def drain(return_when) -> None:
+        nonlocal offset
+        finished, _ = wait(running, return_when=return_when)
+        for future in finished:
+            running.pop(future)
+            write(future.result())
+        while offset in done:
+            done.discard(offset)
+            offset += 1
+        _save_offset(output_path, offset)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            open(output_path, "a", encoding="utf-8") as output:
+        for index, record in iter_records(input_path):
+            if index < offset or index in done:
+                counts["skipped"] += 1
+                continue
+            if isinstance(record, UnreadableRecord):
+                # Nothing to plan; fails like an invalid profile does
+                write({"index": index, "error": record.error})
+                continue
+            if len(running) >= max_pending:
+                drain(FIRST_COMPLETED)
+            running[pool.submit(plan, index, record)] = index
+        if running:
+            drain(ALL_COMPLETED)
+
+    # Advance past records that were already done before this run
+    while offset in done:
+        done.discard(offset)
+        offset += 1
+    _save_offset(output_path, offset)
+    return counts
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+
+
+def default_cache_dir() -> Path:
+    """Directory for on-disk stores; override with ``VITACREW_CACHE_DIR``."""
+    return Path(os.environ.get("VITACREW_CACHE_DIR", Path.home() / ".cache" / "vitacrew"))
+
+
+class ResponseCache:
+    """Content-addressed cache of LLM task responses.
+
+    Entries live in a SQLite file so they survive restarts, fronted by a small
+    in-memory LRU. The store is bounded by ``max_entries`` (least recently used
+    entries are evicted first) and entries older than ``ttl_seconds`` are
+    treated as misses and dropped.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_entries: int = 1000,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        memory_entries: int = 128,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def make_key(**parts) -> str:
+        """Hashes the parts that determine a response (prompt, context, model, ...)."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached response for ``key``, or None on a miss."""
+        now = self.clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._connection().execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                entry = tuple(row) if row else None
+
+            if entry is None or self._expired(entry[1], now):
+                if entry is not None:
+                    self._delete(key)
+                self.misses += 1
+                return None
+
+            self._remember(key, entry)
+            conn = self._connection()
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: str) -> None:
+        """Stores a response, evicting least recently used entries past the bound."""
+        now = self.clock()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            excess = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if excess > 0:
+                stale = conn.execute(
+                    "SELECT key FROM responses ORDER BY accessed_at LIMIT ?", (excess,)
+                ).fetchall()
+                for (stale_key,) in stale:
+                    self._delete(stale_key)
+                self.evictions += len(stale)
+            conn.commit()
+            self._remember(key, (value, now))
+
+    def _remember(self, key: str, entry: Tuple[str, float]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _delete(self, key: str) -> None:
+        self._memory.pop(key, None)
+        self._connection().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Removes every entry and resets the counters."""
+        with self._lock:
+            self._memory.clear()
+            conn = self._connection()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @property
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters and the current entry count."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self),
+        }
+
+
+class SingleFlight:
+    """Coalesces concurrent executions that share a key into one.
+
+    The first caller for a key runs the function; callers arriving while it
+    runs wait for it and share its result (or its exception) instead of
+    running it again. The key is forgotten as soon as the execution ends,
+    so this only deduplicates work in flight; the ResponseCache serves
+    repeats after that.
+    """
+
+    def __init__(self):
+        self.executions = 0
+        self.saved = 0
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: str, function: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Runs ``function`` unless an execution for ``key`` is already in flight.
+
+        Returns:
+            Tuple[T, bool]: The result, and whether it came from another caller's execution
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self.executions += 1
+            else:
+                self.saved += 1
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = function()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    @property
+    def stats(self) -> dict:
+        """Executions run, executions saved by joining one in flight, and how many are in flight."""
+        with self._lock:
+            return {"executions": self.executions, "saved": self.saved, "in_flight": len(self._calls)}
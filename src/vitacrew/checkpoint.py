@@ -0,0 +1,155 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Union
+
+
+class CheckpointStore:
+    """Durable store of completed task outputs, keyed by task fingerprint.
+
+    A fingerprint (see Vitacrew.task_fingerprints) hashes the task config and
+    every input the output depends on, so a rerun of a failed or interrupted
+    plan finds the tasks that already finished and resumes from the first
+    missing one, even in a new process.
+
+    The store is bounded: every ``gc_interval`` writes, checkpoints older
+    than ``ttl_seconds`` are dropped, then the least recently used ones past
+    ``max_entries``, and the freed pages are returned to the filesystem.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_entries: int = 5000,
+        ttl_seconds: Optional[float] = 30 * 24 * 3600,
+        gc_interval: int = 100,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.gc_interval = gc_interval
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.collected = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            # Only takes effect on a new file; lets gc() shrink it without a full VACUUM
+            self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                " fingerprint TEXT PRIMARY KEY, task TEXT NOT NULL, output TEXT NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS checkpoints_accessed ON checkpoints (accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        """Returns the checkpointed output for ``fingerprint``, or None."""
+        now = self.clock()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT output, created_at FROM checkpoints WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+            if row is None or (self.ttl_seconds is not None and now - row[1] > self.ttl_seconds):
+                self.misses += 1
+                return None
+            conn.execute("UPDATE checkpoints SET accessed_at = ? WHERE fingerprint = ?", (now, fingerprint))
+            conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def load(self, fingerprints: Dict[str, str]) -> Dict[str, str]:
+        """
+        Looks up several tasks at once.
+
+        Args:
+            fingerprints: Fingerprint of each task keyed by task name
+
+        Returns:
+            Dict[str, str]: Checkpointed outputs of the tasks that have one
+        """
+        outputs = {}
+        for task_name, fingerprint in fingerprints.items():
+            output = self.get(fingerprint)
+            if output is not None:
+                outputs[task_name] = output
+        return outputs
+
+    def put(self, fingerprint: str, task_name: str, output: str) -> None:
+        """Checkpoints a completed task output, collecting garbage every ``gc_interval`` writes."""
+        now = self.clock()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (fingerprint, task, output, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (fingerprint, task_name, output, now, now),
+            )
+            conn.commit()
+            self._writes += 1
+            if self._writes % self.gc_interval == 0:
+                self._gc(now)
+
+    def discard(self, fingerprints: Iterable[str]) -> None:
+        """Deletes the given checkpoints."""
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("DELETE FROM checkpoints WHERE fingerprint = ?", [(f,) for f in fingerprints])
+            conn.commit()
+
+    def gc(self) -> int:
+        """
+        Applies the retention policy now.
+
+        Returns:
+            int: Number of checkpoints removed
+        """
+        with self._lock:
+            return self._gc(self.clock())
+
+    def _gc(self, now: float) -> int:
+        conn = self._connection()
+        removed = 0
+        if self.ttl_seconds is not None:
+            removed += conn.execute(
+                "DELETE FROM checkpoints WHERE created_at < ?", (now - self.ttl_seconds,)
+            ).rowcount
+        excess = conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0] - self.max_entries
+        if excess > 0:
+            removed += conn.execute(
+                "DELETE FROM checkpoints WHERE fingerprint IN"
+                " (SELECT fingerprint FROM checkpoints ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            ).rowcount
+        conn.commit()
+        if removed:
+            conn.execute("PRAGMA incremental_vacuum")
+        self.collected += removed
+        return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+
+    @property
+    def stats(self) -> dict:
+        """Hit/miss/collection counters and the current checkpoint count."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "collected": self.collected,
+            "entries": len(self),
+        }
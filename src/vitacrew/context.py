@@ -0,0 +1,141 @@
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Rough characters per token for English prose; close enough for budgeting
+CHARS_PER_TOKEN = 4
+# Sections that would shrink below this are dropped instead of truncated
+MIN_SECTION_TOKENS = 32
+TRUNCATION_MARKER = "\n[... trimmed to fit the context budget]"
+SECTION_SEPARATOR = "\n\n"
+
+# Trimming order: lowest priority goes first
+PROFILE_PRIORITY = 100
+METRICS_PRIORITY = 90
+PLAN_PRIORITY = 80
+ANALYTICS_PRIORITY = 70
+KNOWLEDGE_PRIORITY = 60
+UPSTREAM_PRIORITY = 50
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text``."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass
+class ContextSection:
+    name: str
+    text: str
+    priority: int
+    deduplicate: bool = False
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+@dataclass
+class ContextReport:
+    """Size accounting for one assembled task prompt."""
+
+    task: str
+    budget: Optional[int]
+    context_tokens: int
+    prompt_tokens: int = 0
+    sections: Dict[str, int] = field(default_factory=dict)
+    deduplicated_lines: int = 0
+    trimmed: List[str] = field(default_factory=list)
+    dropped: List[str] = field(default_factory=list)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.context_tokens > self.budget
+
+
+class ContextBuilder:
+    """Assembles a task's context from prioritised sections within a token budget.
+
+    ``Key: value`` lines repeated across sections added with ``deduplicate``
+    (the structured profile and health metrics) are kept only in the
+    highest-priority one; free text such as upstream outputs and knowledge is
+    never edited. If the result exceeds ``budget`` tokens, the lowest-priority
+    sections are truncated, or dropped when too little of them would remain.
+    Sections keep the order they were added in.
+    """
+
+    def __init__(self, task: str, budget: Optional[int] = None):
+        self.task = task
+        self.budget = budget
+        self.sections: List[ContextSection] = []
+
+    def add(self, name: str, text: str, priority: int, deduplicate: bool = False) -> None:
+        if text and text.strip():
+            self.sections.append(ContextSection(name, text.strip(), priority, deduplicate))
+
+    def _deduplicate(self) -> int:
+        seen = set()
+        removed = 0
+        for section in sorted(self.sections, key=lambda s: -s.priority):
+            if not section.deduplicate:
+                continue
+            kept = []
+            for line in section.text.splitlines():
+                key = line.strip().lower()
+                # Only field-like lines ("Key: value") already given by a
+                # higher-priority section count as duplicates; repeats within
+                # one section (e.g. "Sets: 3" per exercise) are content
+                if ":" in key and key in seen:
+                    removed += 1
+                    continue
+                kept.append(line)
+            seen.update(line.strip().lower() for line in kept)
+            section.text = "\n".join(kept).strip()
+        self.sections = [section for section in self.sections if section.text]
+        return removed
+
+    def _total(self) -> int:
+        return estimate_tokens(SECTION_SEPARATOR.join(section.text for section in self.sections))
+
+    @staticmethod
+    def _truncate(text: str, tokens: int) -> str:
+        limit = max(0, tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER))
+        cut = text[:limit]
+        # Prefer ending on a line, then a word, boundary
+        boundary = cut.rfind("\n")
+        if boundary <= limit // 2:
+            boundary = cut.rfind(" ")
+        if boundary > limit // 2:
+            cut = cut[:boundary]
+        return cut.rstrip() + TRUNCATION_MARKER
+
+    def build(self) -> Tuple[str, ContextReport]:
+        """
+        Returns the assembled context and its size report.
+
+        Returns:
+            Tuple[str, ContextReport]: The context text (may be empty) and the
+            per-section token accounting
+        """
+        report = ContextReport(task=self.task, budget=self.budget, context_tokens=0)
+        report.deduplicated_lines = self._deduplicate()
+
+        if self.budget is not None:
+            # Stable sort keeps later sections ahead of earlier ones at equal priority
+            for section in sorted(reversed(self.sections), key=lambda s: s.priority):
+                excess = self._total() - self.budget
+                if excess <= 0:
+                    break
+                # One token of slack absorbs rounding in the per-section estimates
+                remaining = section.tokens - excess - 1
+                if remaining >= MIN_SECTION_TOKENS:
+                    section.text = self._truncate(section.text, remaining)
+                    report.trimmed.append(section.name)
+                else:
+                    self.sections.remove(section)
+                    report.dropped.append(section.name)
+
+        context = SECTION_SEPARATOR.join(section.text for section in self.sections)
+        report.context_tokens = estimate_tokens(context)
+        report.sections = {section.name: section.tokens for section in self.sections}
+        return context, report
@@ -1,247 +1,343 @@
 from crewai import Agent, Crew, Process, Task
+from crewai.tasks.task_output import TaskOutput
 from crewai.project import CrewBase, agent, crew, task
-from langchain_anthropic import Anthropic
+from vitacrew.cache import ResponseCache, SingleFlight, default_cache_dir
+from vitacrew.checkpoint import CheckpointStore
+from vitacrew.context import (
+    ANALYTICS_PRIORITY,
+    KNOWLEDGE_PRIORITY,
+    METRICS_PRIORITY,
+    PLAN_PRIORITY,
+    PROFILE_PRIORITY,
+    UPSTREAM_PRIORITY,
+    ContextBuilder,
+    ContextReport,
+    estimate_tokens
+)
+from vitacrew.events import TASK_FINISHED, TASK_STARTED, EventStream, unwatch_tasks, watch_tasks
+from vitacrew.instrumentation import Trace, Tracer
+from vitacrew.knowledge import DEFAULT_TOP_K, KnowledgeIndex, default_knowledge_dir
+from vitacrew.llm_pool import INTERACTIVE, LLMClientPool, default_llm_pool
+from vitacrew.models import ActivityLevel, Gender, SkinType, StressLevel, UserInputs
+from vitacrew.pooled_llm import PooledLLM
+from vitacrew.report import ordered_outputs, render_html, write_pdf
+from vitacrew.scheduler import TaskScheduler
+from vitacrew.tools.calculations import calculate_health_metrics
 from vitacrew.tools.custom_tool import (
     BMRCalculator,
+    FoodDatabaseTool,
+    HealthAnalyticsTool,
     MacroCalculator,
+    MealPlanOptimizerTool,
     ProgressTracker,
-    ReportGenerator
+    ReportGenerator,
+    WorkoutPlannerTool
 )
-from enum import Enum
-from typing import List
-from pydantic import BaseModel, Field, validator
-
-class Gender(str, Enum):
-    MALE = "male"
-    FEMALE = "female"
-    OTHER = "other"
-
-class StressLevel(str, Enum):
-    LOW = "low"
-    MODERATE = "moderate"
-    HIGH = "high"
-
-class ActivityLevel(str, Enum):
-    SEDENTARY = "sedentary"
-    LIGHT = "light"
-    MODERATE = "moderate"
-    ACTIVE = "active"
-    VERY_ACTIVE = "very active"
-
-class SkinType(str, Enum):
-    NORMAL = "normal"
-    DRY = "dry"
-    OILY = "oily"
-    COMBINATION = "combination"
-    SENSITIVE = "sensitive"
-
-class UserInputs(BaseModel):
-    # Personal Information
-    name: str = Field(..., min_length=2, max_length=50)
-    age: int = Field(..., ge=18, le=120)
-    gender: Gender
-    height: float = Field(..., ge=100, le=250)  # in cm
-    weight: float = Field(..., ge=30, le=300)  # in kg
-    waist_circumference: float = Field(..., ge=40, le=200)  # in cm
-    hip_circumference: float = Field(..., ge=40, le=200)  # in cm
-
-    # Health Goals
-    fitness_objectives: List[str] = Field(..., min_items=1, max_items=5)
-    dietary_requirements: List[str] = Field(default_factory=list)
-    skin_type: SkinType
-    skin_concerns: List[str] = Field(default_factory=list, max_items=5)
-
-    # Lifestyle Factors
-    sleep_hours: float = Field(..., ge=0, le=24)
-    stress_level: StressLevel
-    activity_level: ActivityLevel
-
-    @validator('fitness_objectives')
-    def validate_fitness_objectives(cls, v):
-        valid_objectives = {
-            "weight loss", "muscle gain", "endurance", "flexibility",
-            "strength", "general fitness", "athletic performance"
-        }
-        if not all(obj.lower() in valid_objectives for obj in v):
-            raise ValueError(f"Invalid fitness objectives. Must be one of: {valid_objectives}")
-        return v
-
-    @validator('dietary_requirements')
-    def validate_dietary_requirements(cls, v):
-        valid_requirements = {
-            "vegetarian", "vegan", "gluten-free", "dairy-free",
-            "keto", "paleo", "halal", "kosher", "none"
-        }
-        if v and not all(req.lower() in valid_requirements for req in v):
-            raise ValueError(f"Invalid dietary requirements. Must be one of: {valid_requirements}")
-        return v
-
-    @validator('skin_concerns')
-    def validate_skin_concerns(cls, v):
-        valid_concerns = {
-            "acne", "aging", "dark spots", "dryness", "oiliness",
-            "redness", "sensitivity", "uneven texture", "none"
-        }
-        if v and not all(concern.lower() in valid_concerns for concern in v):
-            raise ValueError(f"Invalid skin concerns. Must be one of: {valid_concerns}")
-        return v
+from vitacrew.workout_plan import DEFAULT_ACTIVITY, format_program
+import copy
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional
+import yaml
+
+MODEL_NAME = "claude-3-5-sonnet-20240620"
+DEFAULT_MAX_CONCURRENCY = 3
+
+# Tools each agent is built with (None means every tool)
+AGENT_TOOLS = {
+    'personal_trainer': ['bmr_calculator', 'workout_planner', 'progress_tracker'],
+    'nutritionist': ['macro_calculator', 'meal_plan_optimizer', 'food_database', 'progress_tracker'],
+    'beauty_specialist': ['progress_tracker'],
+    'health_analyst': None,
+    'design_specialist': ['report_generator'],
+}
+
+# Tools that act on the crew user's own data; each crew binds a copy to its user
+USER_BOUND_TOOLS = ['progress_tracker', 'health_analytics']
+
+# Units appended to profile fields in task context
+PROFILE_UNITS = {
+    'height': 'cm',
+    'weight': 'kg',
+    'waist_circumference': 'cm',
+    'hip_circumference': 'cm'
+}
+
+# Agents whose tasks receive the precomputed health metrics as context
+METRICS_AGENTS = {'personal_trainer', 'nutritionist', 'health_analyst'}
+# Profile fields a precomputed workout program (``workout_plan``) is built from
+WORKOUT_PLAN_FIELDS = ['fitness_objectives', 'activity_level']
+# Profile fields the precomputed health metrics are derived from
+HEALTH_METRIC_FIELDS = [
+    'weight', 'height', 'age', 'gender', 'waist_circumference',
+    'hip_circumference', 'activity_level', 'fitness_objectives'
+]
+
+def answering_model(llm: Any) -> str:
+    """Identifies the LLM behind an agent (past any PooledLLM) for response cache keys.
+
+    The class is part of it, so offline stand-ins such as FakeLLM never
+    share entries with a provider model of the same name.
+    """
+    while isinstance(llm, PooledLLM):
+        llm = llm.llm
+    model = getattr(llm, 'model', None) or getattr(llm, 'model_name', None) or MODEL_NAME
+    return f"{type(llm).__module__}.{type(llm).__qualname__}:{model}"
 
 # If you want to run a snippet of code before or after the crew starts, 
 # you can use the @before_kickoff and @after_kickoff decorators
 # https://docs.crewai.com/concepts/crews#example-crew-class-with-decorators
 
-@CrewBase
-class Vitacrew():
-    """Vitacrew crew"""
+class CrewFactory:
+    """Process-wide holder of the immutable parts of a Vitacrew.
 
-    agents_config = 'config/agents.yaml'
-    tasks_config = 'config/tasks.yaml'
+    Tool instances, parsed YAML configs, the response cache and the LLM client
+    are built once and shared by every Vitacrew the factory creates, so
+    per-user crews (e.g. one per Streamlit session) are cheap to construct.
+    Each crew receives its own copy of the configs; agents, tasks and user
+    data stay per instance.
+
+    Passing ``llm`` (e.g. a FakeLLM for offline runs and benchmarks) makes
+    every agent and crew use it instead of the Anthropic client.
+
+    Agent LLM calls go through an LLMClientPool that enforces the provider's
+    request and token rate limits across every crew of the process: the
+    process-wide pool for the provider's LLM, or ``pool`` if given (an
+    injected ``llm`` is only pooled when a pool is passed).
+    """
 
-    def __init__(self):
+    def __init__(self, llm: Any = None, pool: Optional[LLMClientPool] = None):
         self.tools = {
             'bmr_calculator': BMRCalculator(),
             'macro_calculator': MacroCalculator(),
             'progress_tracker': ProgressTracker(),
-            'report_generator': ReportGenerator()
+            'report_generator': ReportGenerator(),
+            'health_analytics': HealthAnalyticsTool(),
+            'food_database': FoodDatabaseTool(),
+            'meal_plan_optimizer': MealPlanOptimizerTool(),
+            'workout_planner': WorkoutPlannerTool()
         }
+        self.response_cache = ResponseCache(default_cache_dir() / 'responses.db')
+        self.checkpoints = CheckpointStore(default_cache_dir() / 'checkpoints.db')
+        # Identical task executions in flight across this factory's crews run once
+        self.in_flight = SingleFlight()
+        self.knowledge = KnowledgeIndex(default_knowledge_dir(), default_cache_dir() / 'knowledge.db')
+        self.tracer = Tracer()
+        self._configs: Dict[Path, dict] = {}
+        self.pool = pool if pool is not None or llm is not None else default_llm_pool()
+        self._agent_base_llm = llm
+        self._agent_llms: Dict[tuple, Any] = {}
+        self._llm = llm
+        self._lock = threading.Lock()
+
+    def load_config(self, config_path: Path) -> dict:
+        """Returns a private copy of a YAML config, parsing each file only once."""
+        config_path = Path(config_path)
+        with self._lock:
+            if config_path not in self._configs:
+                with open(config_path, "r", encoding="utf-8") as file:
+                    self._configs[config_path] = yaml.safe_load(file)
+            return copy.deepcopy(self._configs[config_path])
+
+    @property
+    def llm(self) -> Any:
+        """Shared LLM client, created on first use."""
+        with self._lock:
+            if self._llm is None:
+                # langchain_anthropic is slow to import; only crew() needs it
+                from langchain_anthropic import Anthropic
+                self._llm = Anthropic(model=MODEL_NAME)
+            return self._llm
+
+    def agent_llm(self, priority: int = INTERACTIVE, stream: bool = False) -> Any:
+        """
+        Shared LLM for the agents of crews running at ``priority`` (INTERACTIVE or BATCH).
+
+        With ``stream`` it is a streaming twin of that LLM, so crews reporting
+        live tokens never switch streaming on for the crews that don't.
+        """
+        with self._lock:
+            key = (priority, stream)
+            if key not in self._agent_llms:
+                llm = self._agent_base_llm
+                if llm is None and self.pool is not None:
+                    # The LLM crewai gives agents by default, built once for every crew
+                    from crewai.utilities.llm_utils import create_llm
+                    llm = self._agent_base_llm = create_llm(None)
+                if stream and getattr(llm, 'stream', None) is False:
+                    llm = copy.copy(llm)
+                    llm.stream = True
+                if self.pool is not None:
+                    llm = PooledLLM(llm, self.pool, priority)
+                self._agent_llms[key] = llm
+            return self._agent_llms[key]
+
+    def create(self, priority: int = INTERACTIVE) -> "Vitacrew":
+        """Creates a Vitacrew backed by this factory's shared resources."""
+        return Vitacrew(factory=self, priority=priority)
+
+@CrewBase
+class Vitacrew():
+    """Vitacrew crew"""
+
+    agents_config = 'config/agents.yaml'
+    tasks_config = 'config/tasks.yaml'
+
+    def __init__(self, factory: Optional[CrewFactory] = None, priority: int = INTERACTIVE):
+        self.factory = factory or CrewFactory()
+        # Place of this crew's LLM calls in the shared pool's queue
+        self.priority = priority
+        # CrewBase loads the YAML configs through load_yaml right after this
+        self.load_yaml = self.factory.load_config
+        self.tools = dict(self.factory.tools)
         self.agents = []
         self.tasks = []
         self.user_data = {}
+        self.response_cache = self.factory.response_cache
+        self.checkpoints = self.factory.checkpoints
+        self.in_flight = self.factory.in_flight
+        self.knowledge = self.factory.knowledge
+        self._agent_registry: Dict[str, tuple] = {}
+        self.context_reports: Dict[str, ContextReport] = {}
+        self.tracer = self.factory.tracer
+        self.last_trace: Optional[Trace] = None
+        # Outputs of the last run and the fingerprints they were produced under
+        self.task_outputs: Dict[str, str] = {}
+        self._output_fingerprints: Dict[str, str] = {}
+        self.reused_tasks: List[str] = []
+        # Tasks of the last run that joined another crew's identical execution
+        self.shared_tasks: List[str] = []
+
+    def agent_for(self, agent_name: str) -> Agent:
+        """
+        Returns the named agent, building it once per crew.
+
+        Every task naming the agent shares the instance. The agent is rebuilt
+        when its entry in agents.yaml changes or after invalidate_agents().
+        """
+        config = self.agents_config[agent_name]
+        fingerprint = ResponseCache.make_key(config=config)
+        entry = self._agent_registry.get(agent_name)
+        if entry is None or entry[0] != fingerprint:
+            tool_names = AGENT_TOOLS.get(agent_name) or list(self.tools)
+            built = Agent(
+                config=config,
+                tools=[self.tools[name] for name in tool_names],
+                llm=self.factory.agent_llm(self.priority),
+                verbose=True
+            )
+            entry = (fingerprint, built)
+            self._agent_registry[agent_name] = entry
+        return entry[1]
+
+    def invalidate_agents(self, *agent_names: str) -> None:
+        """Drops cached agents (all of them if no names are given) so they are rebuilt."""
+        for agent_name in agent_names or list(self._agent_registry):
+            self._agent_registry.pop(agent_name, None)
 
     @agent
     def personal_trainer(self) -> Agent:
-        return Agent(
-            config=self.agents_config['personal_trainer'],
-            tools=[self.tools['bmr_calculator'], self.tools['progress_tracker']],
-            verbose=True
-        )
+        return self.agent_for('personal_trainer')
 
-    @agent 
+    @agent
     def nutritionist(self) -> Agent:
-        return Agent(
-            config=self.agents_config['nutritionist'],
-            tools=[self.tools['macro_calculator'], self.tools['progress_tracker']],
-            verbose=True
-        )
+        return self.agent_for('nutritionist')
 
     @agent
     def beauty_specialist(self) -> Agent:
-        return Agent(
-            config=self.agents_config['beauty_specialist'],
-            tools=[self.tools['progress_tracker']],
-            verbose=True
-        )
+        return self.agent_for('beauty_specialist')
 
     @agent
     def health_analyst(self) -> Agent:
-        return Agent(
-            config=self.agents_config['health_analyst'],
-            tools=[tool for tool in self.tools.values()],
-            verbose=True
-        )
+        return self.agent_for('health_analyst')
 
     @agent
     def design_specialist(self) -> Agent:
-        return Agent(
-            config=self.agents_config['design_specialist'],
-            tools=[self.tools['report_generator']],
-            verbose=True
-        )
+        return self.agent_for('design_specialist')
 
     @task
     def analyze_fitness(self) -> Task:
         return Task(
             config=self.tasks_config['personal_trainer_tasks']['analyze_fitness'],
-            agent=self.personal_trainer()
+            agent=self.agent_for('personal_trainer')
         )
 
     @task
     def generate_workout(self) -> Task:
         return Task(
             config=self.tasks_config['personal_trainer_tasks']['generate_workout'],
-            agent=self.personal_trainer()
+            agent=self.agent_for('personal_trainer')
         )
 
     @task
     def create_meal_plan(self) -> Task:
         return Task(
             config=self.tasks_config['nutritionist_tasks']['create_meal_plan'],
-            agent=self.nutritionist()
+            agent=self.agent_for('nutritionist')
         )
 
     @task
     def generate_grocery_list(self) -> Task:
         return Task(
             config=self.tasks_config['nutritionist_tasks']['generate_grocery_list'],
-            agent=self.nutritionist()
+            agent=self.agent_for('nutritionist')
         )
 
     @task
     def assess_skin(self) -> Task:
         """Assess skin condition task"""
-        context = [
-            f"Analyze the following user's skin profile:",
-            f"Skin Type: {self.user_data['skin_type']}",
-            f"Skin Concerns: {', '.join(self.user_data['skin_concerns'])}",
-            f"Age: {self.user_data['age']}"
-        ]
-        
-        task_instance = Task(
+        return Task(
             config=self.tasks_config['beauty_specialist_tasks']['assess_skin'],
-            agent=self.beauty_specialist(),
-            context=context
+            agent=self.agent_for('beauty_specialist')
         )
-        return task_instance
 
     @task
     def design_routine(self) -> Task:
-        context = [
-            f"Design a skincare routine based on:",
-            f"Skin Type: {self.user_data['skin_type']}",
-            f"Skin Concerns: {', '.join(self.user_data['skin_concerns'])}",
-            f"Age: {self.user_data['age']}",
-            f"Stress Level: {self.user_data['stress_level']}",
-            f"Sleep Hours: {self.user_data['sleep_hours']}"
-        ]
-        
         return Task(
             config=self.tasks_config['beauty_specialist_tasks']['design_routine'],
-            agent=self.beauty_specialist(),
-            context=context
+            agent=self.agent_for('beauty_specialist')
         )
 
-    # @task
-    # def analyze_data(self) -> Task:
-    #     return Task(
-    #         config=self.tasks_config['health_analyst_tasks']['analyze_data'],
-    #         agent=self.health_analyst()
-    #     )
+    @task
+    def analyze_data(self) -> Task:
+        return Task(
+            config=self.tasks_config['health_analyst_tasks']['analyze_data'],
+            agent=self.agent_for('health_analyst')
+        )
 
-    # @task
-    # def generate_report(self) -> Task:
-    #     return Task(
-    #         config=self.tasks_config['health_analyst_tasks']['generate_report'],
-    #         agent=self.health_analyst()
-    #     )
+    @task
+    def generate_report(self) -> Task:
+        return Task(
+            config=self.tasks_config['health_analyst_tasks']['generate_report'],
+            agent=self.agent_for('health_analyst')
+        )
 
     @task
     def format_plans(self) -> Task:
         return Task(
             config=self.tasks_config['design_specialist_tasks']['format_plans'],
-            agent=self.design_specialist()
+            agent=self.agent_for('design_specialist')
         )
 
     @task
     def create_visuals(self) -> Task:
         return Task(
             config=self.tasks_config['design_specialist_tasks']['create_visuals'],
-            agent=self.design_specialist()
+            agent=self.agent_for('design_specialist')
         )
 
     @crew
     def crew(self) -> Crew:
         """Creates the Vitacrew crew"""
-        llm = Anthropic(model="claude-3-5-sonnet-20240620")
+        # CrewBase memoizes tasks; point them at the current registry agents
+        for crew_task in self.tasks:
+            crew_task.agent = self.agent_for(self.task_config(crew_task.name)['agent'])
+        self.agents = [self.agent_for(agent_name) for agent_name in AGENT_TOOLS]
+        llm = self.factory.llm
         return Crew(
             agents=self.agents,
             tasks=self.tasks,
@@ -253,42 +349,421 @@ class Vitacrew():
     def collect_user_inputs(self, user_inputs: UserInputs) -> None:
         """Collects and stores all user inputs from the frontend."""
         self.user_data = user_inputs.model_dump()
+        self.bind_user_tools(user_inputs.name)
 
-        # Calculate health metrics
-        bmr = self.tools['bmr_calculator'].run(
+        # Derive health metrics once so every task plans around the same numbers
+        self.user_data['health_metrics'] = calculate_health_metrics(
             weight=user_inputs.weight,
             height=user_inputs.height,
             age=user_inputs.age,
-            gender=user_inputs.gender
+            gender=user_inputs.gender,
+            waist_circumference=user_inputs.waist_circumference,
+            hip_circumference=user_inputs.hip_circumference,
+            activity_level=user_inputs.activity_level,
+            fitness_objectives=user_inputs.fitness_objectives
         )
-        self.user_data['health_metrics'] = {
-            'bmr': bmr,
-            # Add other metrics as needed
+
+    def bind_user_tools(self, user: str) -> None:
+        """
+        Gives this crew copies of the USER_BOUND_TOOLS that record and read
+        metrics as ``user``, whatever the LLM passes, and rebuilds the agents
+        holding them. The factory's shared tools stay unbound.
+        """
+        rebound = set()
+        for tool_name in USER_BOUND_TOOLS:
+            if self.tools[tool_name].user != user:
+                self.tools[tool_name] = self.factory.tools[tool_name].model_copy(update={'user': user})
+                rebound.add(tool_name)
+        if rebound:
+            self.invalidate_agents(*(
+                agent_name for agent_name, tool_names in AGENT_TOOLS.items()
+                if tool_names is None or rebound & set(tool_names)
+            ))
+
+    def health_metrics_context(self) -> List[str]:
+        """Precomputed health metrics as context lines, if inputs were collected."""
+        metrics = self.user_data.get('health_metrics')
+        if not metrics:
+            return []
+        macros = metrics['macros']
+        return [
+            "Precomputed health metrics (use these numbers as given; do not recalculate):",
+            f"BMR: {metrics['bmr']} kcal/day",
+            f"TDEE: {metrics['tdee']} kcal/day",
+            f"BMI: {metrics['bmi']} ({metrics['bmi_category']})",
+            f"Waist-to-hip ratio: {metrics['waist_to_hip_ratio']} ({metrics['whr_risk']} risk)",
+            f"Goal: {metrics['goal']} ({metrics['calorie_adjustment']:+d} kcal/day)",
+            f"Calorie target: {metrics['calorie_target']} kcal/day",
+            f"Macros: protein {macros['protein']} g, carbs {macros['carbs']} g, fats {macros['fats']} g",
+        ]
+
+    def task_config(self, task_name: str) -> dict:
+        """Returns the YAML config of a task, looked up across agent groups."""
+        for group in self.tasks_config.values():
+            if isinstance(group, dict) and task_name in group:
+                return group[task_name]
+        raise ValueError(f"Task '{task_name}' not found")
+
+    def task_dependencies(self) -> Dict[str, List[str]]:
+        """Maps each task to the tasks whose output it consumes (``depends_on``)."""
+        return {
+            name: list(self.task_config(name).get('depends_on', []))
+            for name in self._original_tasks
         }
 
-    def run_single_task(self, task_name: str) -> str:
+    def task_reads(self, task_name: str) -> List[str]:
+        """
+        User data fields a task's output depends on.
+
+        These are the ``profile`` fields in its context, the inputs of the
+        health metrics for agents that receive them, the user name for
+        ``tracked_metrics`` tasks, the inputs of a precomputed ``workout_plan``
+        and any extra fields listed under ``reads``.
+        """
+        config = self.task_config(task_name)
+        reads = list(config.get('profile', [])) + list(config.get('reads', []))
+        if config['agent'] in METRICS_AGENTS:
+            reads += HEALTH_METRIC_FIELDS
+        if config.get('workout_plan'):
+            reads += WORKOUT_PLAN_FIELDS
+        if config.get('tracked_metrics'):
+            reads.append('name')
+        return list(dict.fromkeys(reads))
+
+    def task_fingerprints(self) -> Dict[str, str]:
+        """
+        Hashes everything each task's output depends on.
+
+        A fingerprint covers the task and agent configs, the agent's model,
+        the user data fields the task reads, the tracked metric summary if it
+        uses one, and the fingerprints of its upstream tasks, so an edit
+        invalidates exactly the tasks that read the edited field and
+        everything downstream of them.
+        Tasks with ``cache: false`` get a fresh fingerprint on every call.
+
+        Returns:
+            Dict[str, str]: Fingerprint of each task keyed by task name
+        """
+        dependencies = self.task_dependencies()
+        fingerprints: Dict[str, str] = {}
+
+        def fingerprint(task_name: str) -> str:
+            if task_name not in fingerprints:
+                config = self.task_config(task_name)
+                if not config.get('cache', True):
+                    fingerprints[task_name] = uuid.uuid4().hex
+                    return fingerprints[task_name]
+                parts = {
+                    'task': config,
+                    'agent': self.agents_config[config['agent']],
+                    'model': answering_model(self.agent_for(config['agent']).llm),
+                    'fields': {name: self.user_data.get(name) for name in self.task_reads(task_name)},
+                    'upstream': {name: fingerprint(name) for name in dependencies[task_name]},
+                }
+                knowledge = self.knowledge_context(task_name)
+                if knowledge:
+                    parts['knowledge'] = knowledge
+                if config.get('tracked_metrics'):
+                    parts['tracked_metrics'] = self.tools['health_analytics'].analytics.summary(
+                        self.user_data.get('name', 'default')
+                    )
+                fingerprints[task_name] = ResponseCache.make_key(**parts)
+            return fingerprints[task_name]
+
+        for task_name in dependencies:
+            fingerprint(task_name)
+        return fingerprints
+
+    def invalidate_outputs(self, *task_names: str) -> None:
+        """Forgets stored outputs and checkpoints (all if no names are given) so the next run re-executes them."""
+        fingerprints = self.task_fingerprints()
+        for task_name in task_names or list(fingerprints):
+            self.task_outputs.pop(task_name, None)
+            self._output_fingerprints.pop(task_name, None)
+        if self.checkpoints is not None:
+            self.checkpoints.discard(fingerprints[name] for name in task_names or fingerprints)
+
+    def profile_context(self, fields: List[str]) -> str:
+        """Formats the requested user profile fields as ``Label: value`` lines."""
+        lines = []
+        for name in fields:
+            value = self.user_data.get(name)
+            if value is None:
+                continue
+            if isinstance(value, list):
+                value = ', '.join(getattr(item, 'value', item) for item in value)
+            value = getattr(value, 'value', value)
+            unit = PROFILE_UNITS.get(name)
+            lines.append(f"{name.replace('_', ' ').title()}: {value}{' ' + unit if unit else ''}")
+        return "\n".join(["User profile:", *lines]) if lines else ""
+
+    def knowledge_context(self, task_name: str) -> str:
+        """
+        The knowledge snippets most relevant to a task, for its context.
+
+        The query is the agent's role and goal plus the task description; the
+        number of snippets is the task's ``knowledge`` key (0 disables it).
+        """
+        config = self.task_config(task_name)
+        top_k = config.get('knowledge', DEFAULT_TOP_K)
+        if self.knowledge is None or not top_k or config.get('render'):
+            return ""
+        agent_config = self.agents_config[config['agent']]
+        query = " ".join([agent_config.get('role', ''), agent_config.get('goal', ''), config.get('description', '')])
+        snippets = self.knowledge.search(query, k=top_k, user=self.user_data.get('name'))
+        if not snippets:
+            return ""
+        lines = [f"- ({snippet.path}) {' '.join(snippet.text.split())}" for snippet in snippets]
+        return "\n".join(["Relevant knowledge:", *lines])
+
+    def workout_plan_context(self, task_name: str) -> str:
+        """
+        The periodized program a task presents, built locally from the user's
+        fitness objectives and activity level.
+
+        The task's ``workout_plan`` key is the number of weeks (0 or absent disables it).
+        """
+        weeks = self.task_config(task_name).get('workout_plan')
+        objectives = self.user_data.get('fitness_objectives')
+        if not weeks or not objectives:
+            return ""
+        program = self.tools['workout_planner'].planner.build(
+            objectives, self.user_data.get('activity_level') or DEFAULT_ACTIVITY, weeks
+        )
+        return format_program(program)
+
+    def build_context(self, task_name: str, upstream: Optional[Dict[str, str]] = None) -> str:
+        """
+        Assembles a task's context within its ``context_budget`` and records its size.
+
+        Sections, highest priority first: the profile fields listed under
+        ``profile``, the precomputed health metrics, the precomputed workout
+        program (``workout_plan``), the analytics summary (``tracked_metrics``),
+        knowledge snippets and upstream task outputs. The size report is kept
+        in ``context_reports[task_name]``.
+
+        Returns:
+            str: The context, empty when the task needs none
+        """
+        config = self.task_config(task_name)
+        builder = ContextBuilder(task_name, budget=config.get('context_budget'))
+        builder.add('profile', self.profile_context(config.get('profile', [])), PROFILE_PRIORITY, deduplicate=True)
+        if config['agent'] in METRICS_AGENTS:
+            builder.add('health_metrics', "\n".join(self.health_metrics_context()), METRICS_PRIORITY, deduplicate=True)
+        builder.add('workout_plan', self.workout_plan_context(task_name), PLAN_PRIORITY)
+        if config.get('tracked_metrics'):
+            # Precomputed statistics instead of raw metric logs keep the prompt small
+            summary = self.tools['health_analytics'].analytics.summary(self.user_data.get('name', 'default'))
+            builder.add(
+                'tracked_metrics',
+                "Tracked metric summary:\n" + (json.dumps(summary) if summary['metrics'] else "No metrics tracked yet."),
+                ANALYTICS_PRIORITY
+            )
+        builder.add('knowledge', self.knowledge_context(task_name), KNOWLEDGE_PRIORITY)
+        for name, output in (upstream or {}).items():
+            builder.add(name, f"## Output of {name}\n{output}", UPSTREAM_PRIORITY)
+
+        context, report = builder.build()
+        report.prompt_tokens = report.context_tokens + estimate_tokens(
+            config.get('description', '') + config.get('expected_output', '')
+        )
+        self.context_reports[task_name] = report
+        return context
+
+    def task_context(self, task_name: str) -> str:
+        """Builds the context a task receives before any upstream outputs."""
+        return self.build_context(task_name)
+
+    def report_title(self) -> str:
+        name = self.user_data.get('name')
+        return f"Wellness Plan for {name}" if name else "Wellness Plan"
+
+    def render_report(self, outputs: Dict[str, str]) -> str:
+        """Renders the HTML wellness report from task outputs, without an LLM call."""
+        return "".join(render_html(ordered_outputs(outputs), self.report_title()))
+
+    def write_report_pdf(self, outputs: Dict[str, str], file: BinaryIO) -> BinaryIO:
+        """Streams the PDF wellness report into ``file``, page by page."""
+        return write_pdf(ordered_outputs(outputs), self.report_title(), file)
+
+    def _execute_task(self, task_name: str, upstream: Dict[str, str], trace: Optional[Trace] = None,
+                      queue_seconds: Optional[float] = None) -> str:
+        """Executes one task with its profile context and upstream outputs, traced into ``trace``."""
+        task = getattr(self, task_name)()
+        agent = self.agent_for(self.task_config(task_name)['agent'])
+        with self.tracer.task_span(trace, task_name, task_id=str(task.id), agent=agent,
+                                   queue_seconds=queue_seconds):
+            if self.task_config(task_name).get('render') == 'report':
+                return self.render_report(upstream)
+            context = self.build_context(task_name, upstream)
+            return self._execute_cached(task_name, task, context or None).raw
+
+    def _execute_cached(self, task_name: str, task: Task, context: Optional[str] = None) -> TaskOutput:
+        """
+        Executes a task, reusing the response to an identical rendered prompt.
+
+        A response is reused from the cache, or, while another crew of the
+        same factory is executing the identical prompt, from that execution
+        once it finishes (the task is listed in ``shared_tasks``). Tasks opt
+        out of both with ``cache: false`` in tasks.yaml.
+        """
+        # Tasks are memoized by CrewBase; always run with the current registry agent
+        agent = self.agent_for(self.task_config(task_name)['agent'])
+        if not self.task_config(task_name).get('cache', True):
+            return task.execute_sync(agent=agent, context=context)
+
+        key = ResponseCache.make_key(
+            model=answering_model(agent.llm),
+            role=agent.role,
+            goal=agent.goal,
+            backstory=agent.backstory,
+            description=task.description,
+            expected_output=task.expected_output,
+            context=context,
+        )
+        raw = self.response_cache.get(key) if self.response_cache is not None else None
+        if raw is not None:
+            return self._reused_output(task, agent, raw)
+
+        def execute() -> TaskOutput:
+            output = task.execute_sync(agent=agent, context=context)
+            if self.response_cache is not None:
+                self.response_cache.put(key, output.raw)
+            return output
+
+        if self.in_flight is None:
+            return execute()
+        output, shared = self.in_flight.run(key, execute)
+        if not shared:
+            return output
+        self.shared_tasks.append(task_name)
+        return self._reused_output(task, agent, output.raw)
+
+    def _reused_output(self, task: Task, agent: Agent, raw: str) -> TaskOutput:
+        return TaskOutput(
+            name=task.name,
+            description=task.description,
+            expected_output=task.expected_output,
+            raw=raw,
+            agent=agent.role,
+        )
+
+    def kickoff_concurrent(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                           events: Optional[EventStream] = None,
+                           cancelled: Optional[threading.Event] = None) -> Dict[str, str]:
+        """
+        Runs every task, executing independent branches concurrently.
+
+        The trainer, nutritionist and beauty branches run side by side and are
+        joined before the design specialist tasks, which consume their outputs.
+        Tasks whose fingerprint (see task_fingerprints) is unchanged since the
+        previous run reuse their stored output, so re-planning after a profile
+        edit only executes the tasks the edit affects; they are listed in
+        ``reused_tasks``. Tasks that joined another crew's identical execution
+        in flight are listed in ``shared_tasks``. Every finished task is also
+        checkpointed, so a run that failed part-way resumes from the first
+        missing task when it is started again, even from a new process.
+
+        Args:
+            max_concurrency (int): Maximum number of tasks executing at once
+            events (EventStream): Optional stream receiving task start/finish,
+                tool call and LLM token events as they happen
+            cancelled (threading.Event): Optional flag stopping the run before
+                its next task starts; tasks already executing finish first
+
+        Returns:
+            Dict[str, str]: Raw output of each task keyed by task name
+
+        Raises:
+            CancelledError: When ``cancelled`` is set before every task has run
+        """
+        dependencies = self.task_dependencies()
+        # Build tasks (and their agents) up front so construction never races across workers
+        tasks = {task_name: getattr(self, task_name)() for task_name in dependencies}
+        scheduler = TaskScheduler(dependencies, max_concurrency=max_concurrency)
+        fingerprints = self.task_fingerprints()
+        stale = {
+            task_name: fingerprint for task_name, fingerprint in fingerprints.items()
+            if self._output_fingerprints.get(task_name) != fingerprint
+        }
+        if stale and self.checkpoints is not None:
+            for task_name, output in self.checkpoints.load(stale).items():
+                self.task_outputs[task_name] = output
+                self._output_fingerprints[task_name] = fingerprints[task_name]
+        self.reused_tasks = [
+            task_name for task_name in dependencies
+            if self._output_fingerprints.get(task_name) == fingerprints[task_name]
+        ]
+        self.shared_tasks = []
+        trace = self.last_trace = self.tracer.start_trace()
+
+        def execute_traced(task_name: str, upstream: Dict[str, str]) -> str:
+            queue_seconds = time.monotonic() - scheduler.ready_at[task_name]
+            return self._execute_task(task_name, upstream, trace, queue_seconds)
+
+        execute_task = self._execute_task if trace is None else execute_traced
+
+        def run_task(task_name: str, upstream: Dict[str, str]) -> str:
+            if task_name in self.reused_tasks:
+                return self.task_outputs[task_name]
+            if cancelled is not None and cancelled.is_set():
+                raise CancelledError(f"Plan cancelled before '{task_name}'")
+            output = execute_task(task_name, upstream)
+            self.task_outputs[task_name] = output
+            self._output_fingerprints[task_name] = fingerprints[task_name]
+            if self.checkpoints is not None:
+                self.checkpoints.put(fingerprints[task_name], task_name, output)
+            return output
+
+        if events is None:
+            return scheduler.run(run_task)
+
+        def execute(task_name: str, upstream: Dict[str, str]) -> str:
+            if task_name in self.reused_tasks:
+                events.emit(TASK_FINISHED, task_name, output=self.task_outputs[task_name], reused=True)
+                return self.task_outputs[task_name]
+            events.emit(TASK_STARTED, task_name)
+            output = run_task(task_name, upstream)
+            report = self.context_reports.get(task_name)
+            events.emit(TASK_FINISHED, task_name, output=output,
+                        prompt_tokens=report.prompt_tokens if report else None)
+            return output
+
+        # Token events are only emitted by streaming LLM calls; this crew's
+        # agents stream for this run only
+        agent_names = {self.task_config(task_name)['agent'] for task_name in tasks}
+        llms = [(self.agent_for(agent_name), self.agent_for(agent_name).llm) for agent_name in agent_names]
+        for crew_agent, _ in llms:
+            crew_agent.llm = self.factory.agent_llm(self.priority, stream=True)
+        watch_tasks(events, tasks)
+        try:
+            return scheduler.run(execute)
+        finally:
+            unwatch_tasks(tasks.values())
+            for crew_agent, llm in llms:
+                crew_agent.llm = llm
+
+    def run_single_task(self, task_name: str) -> TaskOutput:
         """
         Runs a single task by name and returns its output.
-        
+
         Args:
             task_name (str): Name of the task method to run (e.g., 'analyze_fitness')
-            
+
         Returns:
-            str: The output from the task execution
+            TaskOutput: The output from the task execution
         """
         if not hasattr(self, task_name):
             raise ValueError(f"Task '{task_name}' not found")
-            
-        task_method = getattr(self, task_name)
-        # Add debugging information
-        print(f"Task method attributes: {dir(task_method)}")
-        print(f"Is task decorated: {hasattr(task_method, '_is_task')}")
-            
-        task = task_method()
+
+        task = getattr(self, task_name)()
         if not isinstance(task, Task):
             raise ValueError(f"'{task_name}' did not return a valid Task instance")
-            
-        return task.execute_sync()
+
+        trace = self.last_trace = self.tracer.start_trace()
+        agent = self.agent_for(self.task_config(task_name)['agent'])
+        with self.tracer.task_span(trace, task_name, task_id=str(task.id), agent=agent):
+            return self._execute_cached(task_name, task, self.task_context(task_name) or None)
 
 
 
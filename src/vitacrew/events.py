@@ -0,0 +1,119 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+TASK_STARTED = "task_started"
+TASK_FINISHED = "task_finished"
+TOOL_STARTED = "tool_started"
+TOOL_FINISHED = "tool_finished"
+TOKEN = "token"
+PLAN_FINISHED = "plan_finished"
+PLAN_FAILED = "plan_failed"
+
+
+@dataclass
+class CrewEvent:
+    """A single progress event from a running crew."""
+
+    kind: str
+    task: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+
+class EventStream:
+    """Thread-safe queue of CrewEvents produced by a crew run.
+
+    The run emits from worker threads; a consumer such as the Streamlit script
+    drains the queue without blocking.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[CrewEvent]" = queue.Queue()
+
+    def emit(self, kind: str, task: Optional[str] = None, **data) -> None:
+        self._queue.put(CrewEvent(kind=kind, task=task, data=data))
+
+    def drain(self) -> List[CrewEvent]:
+        """Returns every event emitted since the last drain, without blocking."""
+        events = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                return events
+
+
+# CrewAI's event bus is process-wide, so one bridge routes bus events to the
+# stream watching the task they belong to.
+_routes: Dict[str, tuple] = {}
+_routes_lock = threading.Lock()
+_bridge_installed = False
+
+
+def _route(event) -> Optional[tuple]:
+    task_id = getattr(event, "task_id", None)
+    with _routes_lock:
+        return _routes.get(str(task_id)) if task_id else None
+
+
+def _install_bridge() -> None:
+    global _bridge_installed
+    with _routes_lock:
+        if _bridge_installed:
+            return
+        _bridge_installed = True
+
+    # Imported here so EventStream consumers (e.g. the UI) don't pay for crewai
+    try:
+        from crewai.events import (
+            LLMStreamChunkEvent,
+            ToolUsageFinishedEvent,
+            ToolUsageStartedEvent,
+            crewai_event_bus,
+        )
+    except ImportError:  # crewai < 0.177 ships the bus under utilities
+        from crewai.utilities.events import (
+            LLMStreamChunkEvent,
+            ToolUsageFinishedEvent,
+            ToolUsageStartedEvent,
+            crewai_event_bus,
+        )
+
+    @crewai_event_bus.on(LLMStreamChunkEvent)
+    def _on_chunk(source, event):
+        route = _route(event)
+        if route:
+            stream, task_name = route
+            stream.emit(TOKEN, task_name, text=event.chunk)
+
+    @crewai_event_bus.on(ToolUsageStartedEvent)
+    def _on_tool_started(source, event):
+        route = _route(event)
+        if route:
+            stream, task_name = route
+            stream.emit(TOOL_STARTED, task_name, tool=event.tool_name, args=event.tool_args)
+
+    @crewai_event_bus.on(ToolUsageFinishedEvent)
+    def _on_tool_finished(source, event):
+        route = _route(event)
+        if route:
+            stream, task_name = route
+            stream.emit(TOOL_FINISHED, task_name, tool=event.tool_name)
+
+
+def watch_tasks(stream: EventStream, tasks: Dict[str, Any]) -> None:
+    """Routes tool and token events of the given tasks (name -> Task) to ``stream``."""
+    _install_bridge()
+    with _routes_lock:
+        for name, task in tasks.items():
+            _routes[str(task.id)] = (stream, name)
+
+
+def unwatch_tasks(tasks: Iterable[Any]) -> None:
+    """Stops routing events for the given Task objects."""
+    with _routes_lock:
+        for task in tasks:
+            _routes.pop(str(task.id), None)
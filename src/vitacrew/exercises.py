@@ -0,0 +1,104 @@
+import csv
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+EXERCISES_CSV = Path(__file__).parent / "data" / "exercises.csv"
+INTENSITIES = {1: "low", 2: "moderate", 3: "high"}
+# Columns indexed for lookups; objectives holds several values per exercise
+INDEXED = ("pattern", "muscle", "equipment", "objectives")
+
+
+@dataclass(frozen=True)
+class Exercise:
+    name: str
+    pattern: str
+    muscle: str
+    equipment: str
+    intensity: int
+    objectives: Tuple[str, ...]
+
+
+class ExerciseLibrary:
+    """Exercises indexed by movement pattern, muscle group, equipment, intensity and fitness objective.
+
+    Each (column, value) pair maps to a boolean mask over the exercises, so a
+    lookup ORs the masks of the accepted values per column and ANDs the
+    columns, without scanning the rows.
+    """
+
+    def __init__(self, exercises: List[Exercise]):
+        self.exercises = exercises
+        self.intensity = np.array([exercise.intensity for exercise in exercises])
+        self._index: Dict[Tuple[str, str], np.ndarray] = {}
+        for row, exercise in enumerate(exercises):
+            for column in INDEXED:
+                values = getattr(exercise, column)
+                for value in values if isinstance(values, tuple) else (values,):
+                    key = (column, value)
+                    if key not in self._index:
+                        self._index[key] = np.zeros(len(exercises), dtype=bool)
+                    self._index[key][row] = True
+        self._values = {column: sorted(value for indexed, value in self._index if indexed == column)
+                        for column in INDEXED}
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = EXERCISES_CSV) -> "ExerciseLibrary":
+        with open(path, newline="", encoding="utf-8") as file:
+            return cls([
+                Exercise(row["name"], row["pattern"], row["muscle"], row["equipment"], int(row["intensity"]),
+                         tuple(row["objectives"].split(";")))
+                for row in csv.DictReader(file)
+            ])
+
+    def __len__(self) -> int:
+        return len(self.exercises)
+
+    def values(self, column: str) -> List[str]:
+        """Known values of an indexed column, e.g. every equipment type."""
+        return self._values[column]
+
+    def _any(self, column: str, values: Iterable[str]) -> np.ndarray:
+        values = [value.lower() for value in values]
+        unknown = sorted(set(values) - set(self._values[column]))
+        if unknown:
+            raise ValueError(f"Unknown {column}: {unknown}. Known: {self._values[column]}")
+        mask = np.zeros(len(self.exercises), dtype=bool)
+        for value in values:
+            mask |= self._index[(column, value)]
+        return mask
+
+    def mask(self, pattern: Optional[str] = None, muscle: Optional[str] = None,
+             equipment: Optional[Iterable[str]] = None, objectives: Optional[Iterable[str]] = None,
+             max_intensity: int = max(INTENSITIES)) -> np.ndarray:
+        """
+        Boolean mask of the exercises matching every given filter.
+
+        Args:
+            pattern: Movement pattern, e.g. "squat" or "vertical pull"
+            muscle: Primary muscle group
+            equipment: Available equipment; an exercise needs one of these
+            objectives: Fitness objectives; an exercise must serve at least one
+            max_intensity: Highest intensity allowed (1 low to 3 high)
+
+        Raises:
+            ValueError: For a value no exercise has
+        """
+        mask = self.intensity <= max_intensity
+        for column, values in (("pattern", [pattern] if pattern else None), ("muscle", [muscle] if muscle else None),
+                               ("equipment", equipment), ("objectives", objectives)):
+            if values is not None:
+                mask &= self._any(column, values)
+        return mask
+
+    def find(self, **filters) -> List[Exercise]:
+        """Exercises matching ``mask(**filters)``, in library order."""
+        return [self.exercises[row] for row in np.flatnonzero(self.mask(**filters))]
+
+
+@lru_cache(maxsize=None)
+def default_exercise_library() -> ExerciseLibrary:
+    return ExerciseLibrary.load()
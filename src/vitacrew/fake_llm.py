@@ -0,0 +1,159 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Union
+
+from crewai.llms.base_llm import BaseLLM
+
+from vitacrew.context import estimate_tokens
+
+DEFAULT_RESPONSE = (
+    "## {title}\n"
+    "Plan prepared by the {role} for this profile.\n\n"
+    "- Key recommendation one\n"
+    "- Key recommendation two\n"
+    "- Key recommendation three\n"
+)
+
+
+class RateLimitError(Exception):
+    """The stand-in provider's HTTP 429, shaped like the provider SDKs' errors."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Error code: 429 - rate limit exceeded, retry after {retry_after:.2f} s")
+        self.retry_after = retry_after
+
+
+class _Fields(dict):
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+class FakeLLM(BaseLLM):
+    """Deterministic, offline stand-in for the crew's LLM.
+
+    Answers come from ``responses`` (task name -> template) or
+    ``default_response``. Templates may use ``{task}``, ``{title}``,
+    ``{role}`` and ``{prompt_tokens}``. Each call sleeps for ``latency`` plus
+    the time a real API would spend reading the prompt and writing the
+    answer at the configured token rates, so scheduling and caching changes
+    can be measured without network access.
+
+    Emits the same LLM call and stream events as crewai's own LLM class, so
+    progress streaming and instrumentation work unchanged. With
+    ``rate_limit`` set it also acts as a rate-limited provider: calls beyond
+    ``rate_limit`` in any ``rate_limit_window`` seconds raise RateLimitError.
+    """
+
+    def __init__(
+        self,
+        model: str = "fake-llm",
+        latency: float = 0.0,
+        prompt_tokens_per_second: Optional[float] = None,
+        output_tokens_per_second: Optional[float] = None,
+        responses: Optional[Dict[str, str]] = None,
+        default_response: str = DEFAULT_RESPONSE,
+        stream: bool = False,
+        rate_limit: Optional[int] = None,
+        rate_limit_window: float = 60.0,
+    ):
+        super().__init__(model=model)
+        self.latency = latency
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.output_tokens_per_second = output_tokens_per_second
+        self.responses = responses or {}
+        self.default_response = default_response
+        self.stream = stream
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.rate_limited = 0
+        self._accepted: "deque[float]" = deque()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def _answer(self, prompt_tokens: int, from_task: Any, from_agent: Any) -> str:
+        task_name = getattr(from_task, "name", None) or "task"
+        template = self.responses.get(task_name, self.default_response)
+        # crewai's agent executor passes the task but not the agent
+        agent = from_agent or getattr(from_task, "agent", None)
+        return template.format_map(_Fields(
+            task=task_name,
+            title=task_name.replace("_", " ").title(),
+            role=(getattr(agent, "role", None) or "assistant").strip(),
+            prompt_tokens=prompt_tokens,
+        ))
+
+    def _delay(self, prompt_tokens: int, output_tokens: int) -> float:
+        delay = self.latency
+        if self.prompt_tokens_per_second:
+            delay += prompt_tokens / self.prompt_tokens_per_second
+        if self.output_tokens_per_second:
+            delay += output_tokens / self.output_tokens_per_second
+        return delay
+
+    def _admit(self) -> None:
+        """Raises RateLimitError when the call would exceed the rate limit."""
+        if self.rate_limit is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            while self._accepted and self._accepted[0] <= now - self.rate_limit_window:
+                self._accepted.popleft()
+            if len(self._accepted) >= self.rate_limit:
+                self.rate_limited += 1
+                raise RateLimitError(retry_after=self._accepted[0] + self.rate_limit_window - now)
+            self._accepted.append(now)
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> str:
+        from crewai.events import (
+            LLMCallCompletedEvent,
+            LLMCallStartedEvent,
+            LLMStreamChunkEvent,
+            crewai_event_bus,
+        )
+        from crewai.events.types.llm_events import LLMCallType
+
+        self._admit()
+        crewai_event_bus.emit(self, LLMCallStartedEvent(
+            messages=messages, tools=tools, model=self.model, from_task=from_task, from_agent=from_agent
+        ))
+        prompt = messages if isinstance(messages, str) else "\n".join(
+            str(message.get("content", "")) for message in messages
+        )
+        prompt_tokens = estimate_tokens(prompt)
+        answer = self._answer(prompt_tokens, from_task, from_agent)
+        # The agent executor expects the ReAct final-answer format
+        response = f"Thought: I now can give a great answer\nFinal Answer: {answer}"
+        output_tokens = estimate_tokens(response)
+
+        time.sleep(self._delay(prompt_tokens, output_tokens))
+        if self.stream:
+            for line in response.splitlines(keepends=True):
+                crewai_event_bus.emit(self, LLMStreamChunkEvent(
+                    chunk=line, from_task=from_task, from_agent=from_agent
+                ))
+
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += output_tokens
+        crewai_event_bus.emit(self, LLMCallCompletedEvent(
+            messages=messages, response=response, call_type=LLMCallType.LLM_CALL,
+            model=self.model, from_task=from_task, from_agent=from_agent
+        ))
+        return response
+
+    def supports_function_calling(self) -> bool:
+        return False
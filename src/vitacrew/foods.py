@@ -0,0 +1,159 @@
+import csv
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+FOODS_CSV = Path(__file__).parent / "data" / "foods.csv"
+
+NUTRIENTS = ("kcal", "protein", "carbs", "fat", "fiber")
+DTYPE = np.dtype(
+    [("name", "U32"), ("category", "U16")] + [(nutrient, "f8") for nutrient in NUTRIENTS]
+)
+
+# Part of the compiled index's name: bump it whenever a rule in DIETS or
+# MACRO_PROFILES changes, so cached bitsets built under the old rule are not reused
+RULES_VERSION = 1
+
+# Ingredient-level rules per dietary requirement (UserInputs values); they do
+# not cover preparation, e.g. halal or kosher slaughter
+KETO_MAX_NET_CARBS = 8.0
+PALEO_EXCLUDED = {"grains", "legumes", "dairy", "sweets"}
+DIETS = {
+    "vegetarian": lambda row: row["source"] in {"plant", "dairy", "egg", "honey"},
+    "vegan": lambda row: row["source"] == "plant",
+    "gluten-free": lambda row: row["gluten"] == "0",
+    "dairy-free": lambda row: row["source"] != "dairy",
+    "keto": lambda row: float(row["carbs"]) - float(row["fiber"]) <= KETO_MAX_NET_CARBS,
+    "paleo": lambda row: row["category"] not in PALEO_EXCLUDED,
+    "halal": lambda row: row["source"] != "pork",
+    "kosher": lambda row: row["source"] not in {"pork", "shellfish"},
+}
+# Macro profiles, per 100 g
+MACRO_PROFILES = {
+    "high-protein": lambda row: float(row["protein"]) >= 20,
+    "low-carb": lambda row: float(row["carbs"]) - float(row["fiber"]) <= 5,
+    "low-fat": lambda row: float(row["fat"]) <= 3,
+    "high-fiber": lambda row: float(row["fiber"]) >= 6,
+    "low-calorie": lambda row: float(row["kcal"]) <= 100,
+}
+FLAGS = list(DIETS) + list(MACRO_PROFILES)
+FLAG_ROWS = {flag: row for row, flag in enumerate(FLAGS)}
+# Sorting puts the lowest of these first and the highest of the others
+ASCENDING = {"kcal", "carbs", "fat"}
+
+
+def _rules_key() -> str:
+    """RULES_VERSION with the flags, thresholds and sets the rules read, for the compiled index's name."""
+    return repr((RULES_VERSION, FLAGS, KETO_MAX_NET_CARBS, sorted(PALEO_EXCLUDED)))
+
+
+def _compile(source: Path, table_path: Path, index_path: Path) -> None:
+    with open(source, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    table = np.array(
+        [(row["name"], row["category"], *(float(row[nutrient]) for nutrient in NUTRIENTS)) for row in rows],
+        dtype=DTYPE,
+    )
+    rules = {**DIETS, **MACRO_PROFILES}
+    flags = np.array([[rules[flag](row) for row in rows] for flag in FLAGS], dtype=bool)
+    index = np.packbits(flags, axis=1)
+
+    table_path.parent.mkdir(parents=True, exist_ok=True)
+    for path, array in ((table_path, table), (index_path, index)):
+        tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as file:
+            np.save(file, array)
+        os.replace(tmp, path)
+
+
+class FoodDatabase:
+    """Nutrient table (per 100 g) with bitset indexes per diet and macro profile.
+
+    The bundled CSV is compiled once into two ``.npy`` files in the cache
+    directory, named after a hash of its contents and of RULES_VERSION and
+    the rule thresholds, and memory-mapped from then on, so
+    loading costs two small reads. Each diet and macro profile is a packed
+    bitset over the rows; a query ANDs the bitsets it needs and compares
+    only the nutrient columns it constrains.
+    """
+
+    def __init__(self, table: np.ndarray, index: np.ndarray):
+        # Plain ndarray views of the mapped files skip np.memmap's per-operation overhead
+        self.table = np.asarray(table)
+        self.index = np.asarray(index)
+        self.columns = {name: self.table[name] for name in DTYPE.names}
+
+    @classmethod
+    def load(cls, cache_dir: Union[str, Path], source: Union[str, Path] = FOODS_CSV) -> "FoodDatabase":
+        source = Path(source)
+        # A changed rule must not reuse bitsets compiled under the old one
+        digest = hashlib.sha256(source.read_bytes() + _rules_key().encode()).hexdigest()[:16]
+        table_path = Path(cache_dir) / "foods" / f"{digest}.npy"
+        index_path = Path(cache_dir) / "foods" / f"{digest}.index.npy"
+        if not (table_path.exists() and index_path.exists()):
+            _compile(source, table_path, index_path)
+        return cls(np.load(table_path, mmap_mode="r"), np.load(index_path, mmap_mode="r"))
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def mask(self, diets: Iterable[str] = (), profiles: Iterable[str] = (),
+             minimum: Optional[Dict[str, float]] = None, maximum: Optional[Dict[str, float]] = None,
+             category: Optional[str] = None) -> np.ndarray:
+        """
+        Boolean mask of the foods meeting every constraint.
+
+        Args:
+            diets: Dietary requirements, as validated by UserInputs ("none" is ignored)
+            profiles: Macro profiles, e.g. "high-protein"
+            minimum: Lower bounds per nutrient (per 100 g)
+            maximum: Upper bounds per nutrient (per 100 g)
+            category: Restrict to one food category
+
+        Raises:
+            ValueError: For an unknown diet, profile or nutrient
+        """
+        wanted = {name.lower() for name in [*diets, *profiles]} - {"none"}
+        unknown = sorted(wanted - FLAG_ROWS.keys())
+        if unknown:
+            raise ValueError(f"Unknown dietary requirements or macro profiles: {unknown}. Known: {FLAGS}")
+        bounds = {**(minimum or {}), **(maximum or {})}
+        unknown = [name for name in bounds if name not in NUTRIENTS]
+        if unknown:
+            raise ValueError(f"Unknown nutrients: {unknown}. Known: {list(NUTRIENTS)}")
+
+        if wanted:
+            bits = self.index[FLAG_ROWS[wanted.pop()]]
+            for name in wanted:
+                bits = bits & self.index[FLAG_ROWS[name]]
+            mask = np.unpackbits(bits, count=len(self.table)).view(bool)
+        else:
+            mask = np.ones(len(self.table), dtype=bool)
+        for nutrient, value in (minimum or {}).items():
+            mask &= self.columns[nutrient] >= value
+        for nutrient, value in (maximum or {}).items():
+            mask &= self.columns[nutrient] <= value
+        if category:
+            mask &= self.columns["category"] == category.lower()
+        return mask
+
+    def search(self, diets: Iterable[str] = (), profiles: Iterable[str] = (),
+               minimum: Optional[Dict[str, float]] = None, maximum: Optional[Dict[str, float]] = None,
+               category: Optional[str] = None, sort_by: str = "protein", limit: int = 20) -> List[dict]:
+        """
+        Foods meeting every constraint, best first by ``sort_by``.
+
+        Returns:
+            List[dict]: Name, category and nutrients per 100 g of each food
+        """
+        if sort_by not in NUTRIENTS:
+            raise ValueError(f"Cannot sort by '{sort_by}'. Known: {list(NUTRIENTS)}")
+        matches = np.flatnonzero(self.mask(diets, profiles, minimum, maximum, category))
+        values = self.columns[sort_by][matches]
+        order = matches[np.argsort(values if sort_by in ASCENDING else -values, kind="stable")][:limit]
+        fields = ("name", "category") + NUTRIENTS
+        columns = [self.columns[name][order].tolist() for name in fields]
+        return [dict(zip(fields, row)) for row in zip(*columns)]
@@ -0,0 +1,283 @@
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from vitacrew.context import estimate_tokens
+
+TASK = "task"
+LLM = "llm"
+TOOL = "tool"
+
+MAX_TRACES = 20
+
+
+@dataclass
+class Span:
+    """One timed unit of work within a run: a task, an LLM call or a tool call."""
+
+    kind: str
+    name: str
+    task: Optional[str] = None
+    start: float = 0.0  # Seconds since the trace started
+    duration: float = 0.0
+    queue_seconds: Optional[float] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    retries: int = 0
+    tool_calls: int = 0
+    error: Optional[str] = None
+
+
+class Trace:
+    """Spans recorded during a single crew run."""
+
+    def __init__(self, run_id: Optional[str] = None):
+        self.run_id = run_id or uuid.uuid4().hex
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = [asdict(span) for span in self.spans]
+        return {"run_id": self.run_id, "started_at": self.started_at, "spans": spans}
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+# (tracer, trace, task span) of the task executing on the current thread
+_current: contextvars.ContextVar[Optional[Tuple["Tracer", Trace, Span]]] = contextvars.ContextVar(
+    "vitacrew_current_span", default=None
+)
+
+# LLM events arrive on crewai's process-wide bus, keyed by task id
+_llm_routes: Dict[str, Tuple["Tracer", Trace, Span]] = {}
+_llm_started: Dict[str, float] = {}
+_routes_lock = threading.Lock()
+_bridge_installed = False
+
+
+def _install_llm_bridge() -> None:
+    global _bridge_installed
+    with _routes_lock:
+        if _bridge_installed:
+            return
+        _bridge_installed = True
+
+    try:
+        from crewai.events import (
+            LLMCallCompletedEvent,
+            LLMCallFailedEvent,
+            LLMCallStartedEvent,
+            crewai_event_bus,
+        )
+    except ImportError:  # crewai < 0.177 ships the bus under utilities
+        from crewai.utilities.events import (
+            LLMCallCompletedEvent,
+            LLMCallFailedEvent,
+            LLMCallStartedEvent,
+            crewai_event_bus,
+        )
+
+    def route(event) -> Optional[Tuple["Tracer", Trace, Span]]:
+        task_id = getattr(event, "task_id", None)
+        with _routes_lock:
+            return _llm_routes.get(str(task_id)) if task_id else None
+
+    @crewai_event_bus.on(LLMCallStartedEvent)
+    def _on_llm_started(source, event):
+        entry = route(event)
+        if entry:
+            with _routes_lock:
+                _llm_started[str(event.task_id)] = entry[1].elapsed()
+
+    @crewai_event_bus.on(LLMCallCompletedEvent)
+    def _on_llm_completed(source, event):
+        entry = route(event)
+        if entry:
+            entry[0]._record_llm(entry, event, error=None)
+
+    @crewai_event_bus.on(LLMCallFailedEvent)
+    def _on_llm_failed(source, event):
+        entry = route(event)
+        if entry:
+            entry[0]._record_llm(entry, event, error=str(event.error))
+
+
+def _usage(agent: Any) -> Tuple[int, int]:
+    """Provider-reported (prompt, completion) token totals of an agent so far."""
+    process = getattr(agent, "_token_process", None)
+    if process is None:
+        return 0, 0
+    summary = process.get_summary()
+    return summary.prompt_tokens, summary.completion_tokens
+
+
+def _labels(**labels: str) -> str:
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _sample(value: float) -> str:
+    """A sample value in full precision: ints exactly, floats round-tripping (``:g`` keeps 6 digits)."""
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+class Tracer:
+    """Records per-run traces and cumulative metrics for crew executions.
+
+    Disabled tracers (the default unless ``VITACREW_TRACE`` is set) start no
+    traces; instrumented code then costs a ``None`` check per task and a
+    context-variable lookup per tool call.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.environ.get("VITACREW_TRACE", "").lower() in ("1", "true", "yes")
+        self.enabled = enabled
+        self.traces: "deque[Trace]" = deque(maxlen=MAX_TRACES)
+        # Counts and token totals stay ints; durations become floats
+        self._sums: Dict[Tuple[str, Tuple], float] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def start_trace(self, run_id: Optional[str] = None) -> Optional[Trace]:
+        """Starts a trace for a new run, or returns None when tracing is off."""
+        if not self.enabled:
+            return None
+        trace = Trace(run_id)
+        with self._lock:
+            self.traces.append(trace)
+        return trace
+
+    def task_span(self, trace: Optional[Trace], task_name: str, task_id: Optional[str] = None,
+                  agent: Any = None, queue_seconds: Optional[float] = None):
+        """Context manager timing a task; a no-op when ``trace`` is None."""
+        if trace is None:
+            return contextlib.nullcontext()
+        return self._task_span(trace, task_name, task_id, agent, queue_seconds)
+
+    @contextlib.contextmanager
+    def _task_span(self, trace: Trace, task_name: str, task_id: Optional[str],
+                   agent: Any, queue_seconds: Optional[float]) -> Iterator[Span]:
+        span = Span(TASK, task_name, task=task_name, start=trace.elapsed(), queue_seconds=queue_seconds)
+        entry = (self, trace, span)
+        if task_id:
+            _install_llm_bridge()
+            with _routes_lock:
+                _llm_routes[task_id] = entry
+        usage_before = _usage(agent)
+        token = _current.set(entry)
+        try:
+            yield span
+        except Exception as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current.reset(token)
+            if task_id:
+                with _routes_lock:
+                    _llm_routes.pop(task_id, None)
+                    _llm_started.pop(task_id, None)
+            prompt, completion = _usage(agent)
+            if prompt > usage_before[0] or completion > usage_before[1]:
+                # Provider-reported usage beats the per-call estimates
+                span.input_tokens = prompt - usage_before[0]
+                span.output_tokens = completion - usage_before[1]
+            span.duration = trace.elapsed() - span.start
+            self._finish(trace, span)
+
+    def _record_llm(self, entry: Tuple["Tracer", Trace, Span], event: Any, error: Optional[str]) -> None:
+        _, trace, task_span = entry
+        now = trace.elapsed()
+        with _routes_lock:
+            start = _llm_started.pop(str(event.task_id), now)
+        span = Span(LLM, getattr(event, "model", None) or "llm", task=task_span.task,
+                    start=start, duration=now - start, error=error)
+        if error is None:
+            span.input_tokens = estimate_tokens(json.dumps(getattr(event, "messages", None) or "", default=str))
+            span.output_tokens = estimate_tokens(str(getattr(event, "response", "") or ""))
+            task_span.input_tokens += span.input_tokens
+            task_span.output_tokens += span.output_tokens
+        else:
+            task_span.retries += 1
+        self._finish(trace, span)
+
+    def _finish(self, trace: Trace, span: Span) -> None:
+        trace.add(span)
+        with self._lock:
+            self._sums[("span_seconds_sum", (span.kind, span.name))] += span.duration
+            self._sums[("span_seconds_count", (span.kind, span.name))] += 1
+            if span.error:
+                self._sums[("span_errors", (span.kind, span.name))] += 1
+            if span.kind == TASK:
+                if span.queue_seconds is not None:
+                    self._sums[("queue_seconds_sum", (span.name,))] += span.queue_seconds
+                    self._sums[("queue_seconds_count", (span.name,))] += 1
+                self._sums[("tokens", (span.name, "input"))] += span.input_tokens
+                self._sums[("tokens", (span.name, "output"))] += span.output_tokens
+                self._sums[("retries", (span.name,))] += span.retries
+            elif span.kind == TOOL:
+                self._sums[("tool_calls", (span.name,))] += 1
+
+    def prometheus_text(self) -> str:
+        """Cumulative metrics of every traced run in the Prometheus text format."""
+        families = [
+            ("vitacrew_span_seconds", "summary", "Wall time of tasks, LLM calls and tool calls",
+             [("span_seconds_sum", "_sum"), ("span_seconds_count", "_count")], ("kind", "name")),
+            ("vitacrew_task_queue_seconds", "summary", "Time tasks waited between becoming ready and starting",
+             [("queue_seconds_sum", "_sum"), ("queue_seconds_count", "_count")], ("task",)),
+            ("vitacrew_tokens_total", "counter", "LLM tokens per task", [("tokens", "")], ("task", "direction")),
+            ("vitacrew_llm_retries_total", "counter", "Failed LLM calls per task", [("retries", "")], ("task",)),
+            ("vitacrew_tool_calls_total", "counter", "Tool invocations", [("tool_calls", "")], ("tool",)),
+            ("vitacrew_span_errors_total", "counter", "Spans that raised", [("span_errors", "")], ("kind", "name")),
+        ]
+        with self._lock:
+            sums = dict(self._sums)
+        lines = []
+        for name, kind, help_text, series, label_names in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, suffix in series:
+                for (metric, labels), value in sorted(sums.items()):
+                    if metric == key:
+                        lines.append(f"{name}{suffix}{_labels(**dict(zip(label_names, labels)))} {_sample(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def instrument_tool(run):
+    """Decorates a tool's ``_run`` so calls made inside a traced task are recorded."""
+    @functools.wraps(run)
+    def wrapper(self, *args, **kwargs):
+        entry = _current.get()
+        if entry is None:
+            return run(self, *args, **kwargs)
+        tracer, trace, task_span = entry
+        span = Span(TOOL, self.name, task=task_span.task, start=trace.elapsed())
+        task_span.tool_calls += 1
+        try:
+            return run(self, *args, **kwargs)
+        except Exception as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration = trace.elapsed() - span.start
+            tracer._finish(trace, span)
+    return wrapper
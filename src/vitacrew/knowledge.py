@@ -0,0 +1,265 @@
+import heapq
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+SUFFIXES = {".txt", ".md"}
+# Documents under knowledge/users/<user slug>/ are only retrieved for that user
+USERS_DIR = "users"
+CHUNK_WORDS = 80
+DEFAULT_TOP_K = 3
+# Postings read per query term, best first; bounds search time regardless of corpus size
+CANDIDATES_PER_TERM = 200
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a about an and are as at be based by for from has have in include including into is it its "
+    "of on or that the their this to user users with".split()
+)
+
+
+def default_knowledge_dir() -> Path:
+    """Knowledge documents directory; override with ``VITACREW_KNOWLEDGE_DIR``."""
+    return Path(os.environ.get("VITACREW_KNOWLEDGE_DIR", Path.cwd() / "knowledge"))
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def user_slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def chunk_text(text: str, words: int = CHUNK_WORDS) -> List[str]:
+    """Splits a document into snippets of whole lines of about ``words`` words each."""
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for paragraph in re.split(r"\n\s*\n", text):
+        for line in paragraph.splitlines():
+            line_words = len(line.split())
+            if not line_words:
+                continue
+            if current and size + line_words > words:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            current.append(line.strip())
+            size += line_words
+        # Paragraph boundaries end a snippet once it has some substance
+        if size >= words // 2:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+@dataclass
+class Snippet:
+    path: str
+    text: str
+    score: float
+
+
+class KnowledgeIndex:
+    """BM25 index over the knowledge directory, persisted in SQLite.
+
+    Documents are split into snippets. Each posting stores the snippet's
+    precomputed BM25 term weight ("impact", length-normalised against the
+    average snippet length when it was indexed). Postings are clustered by
+    term and impact, so a search reads at most ``candidates`` postings per
+    query term and its latency stays flat as the corpus grows. Opening an
+    existing index costs nothing; ``refresh()`` re-indexes only the files
+    whose size or modification time changed, and ``search()`` calls it at
+    most every ``refresh_seconds``.
+    """
+
+    def __init__(self, root: Union[str, Path], path: Union[str, Path], refresh_seconds: float = 5.0,
+                 candidates: int = CANDIDATES_PER_TERM):
+        self.root = Path(root)
+        self.path = Path(path)
+        self.refresh_seconds = refresh_seconds
+        self.candidates = candidates
+        self._refreshed_at: Optional[float] = None
+        self._files: Optional[Dict[str, Tuple[float, int]]] = None  # path -> (mtime, size) as indexed
+        self._stats: Optional[Tuple[int, float]] = None  # (snippets, average length)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(
+                "CREATE TABLE IF NOT EXISTS files ("
+                " path TEXT PRIMARY KEY, mtime REAL NOT NULL, size INTEGER NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS chunks ("
+                " id INTEGER PRIMARY KEY, path TEXT NOT NULL, owner TEXT NOT NULL,"
+                " text TEXT NOT NULL, length INTEGER NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS chunks_path ON chunks (path);"
+                "CREATE TABLE IF NOT EXISTS terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID;"
+                # Clustered so the best postings of a term are one short range scan
+                "CREATE TABLE IF NOT EXISTS postings ("
+                " term TEXT NOT NULL, owner TEXT NOT NULL, impact REAL NOT NULL, chunk_id INTEGER NOT NULL,"
+                " PRIMARY KEY (term, owner, impact, chunk_id)) WITHOUT ROWID;"
+                "CREATE INDEX IF NOT EXISTS postings_chunk ON postings (chunk_id);"
+            )
+        return self._conn
+
+    def _owner(self, relative: str) -> str:
+        parts = relative.split("/")
+        return parts[1] if len(parts) > 2 and parts[0] == USERS_DIR else ""
+
+    def _scan(self) -> Dict[str, Tuple[float, int]]:
+        """Current (mtime, size) of every indexable file, keyed by POSIX path relative to the root."""
+        found: Dict[str, Tuple[float, int]] = {}
+        stack = [("", str(self.root))] if self.root.is_dir() else []
+        while stack:
+            prefix, directory = stack.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        stack.append((prefix + entry.name + "/", entry.path))
+                    elif os.path.splitext(entry.name)[1].lower() in SUFFIXES and entry.is_file():
+                        stat = entry.stat()
+                        found[prefix + entry.name] = (stat.st_mtime, stat.st_size)
+        return found
+
+    def _delete(self, conn: sqlite3.Connection, path: str) -> None:
+        chunk_ids = "SELECT id FROM chunks WHERE path = ?"
+        conn.executemany(
+            "UPDATE terms SET df = df - ? WHERE term = ?",
+            [(count, term) for term, count in conn.execute(
+                f"SELECT term, COUNT(*) FROM postings WHERE chunk_id IN ({chunk_ids}) GROUP BY term", (path,)
+            )],
+        )
+        conn.execute(f"DELETE FROM postings WHERE chunk_id IN ({chunk_ids})", (path,))
+        conn.execute("DELETE FROM chunks WHERE path = ?", (path,))
+        conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def refresh(self) -> int:
+        """
+        Brings the index up to date with the knowledge directory.
+
+        Returns:
+            int: Number of files added, changed or removed
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> int:
+        conn = self._connection()
+        if self._files is None:
+            self._files = {path: (mtime, size) for path, mtime, size in conn.execute("SELECT * FROM files")}
+        current = self._scan()
+        removed = self._files.keys() - current.keys()
+        changed = [path for path, state in current.items() if self._files.get(path) != state]
+        if not removed and not changed:
+            self._refreshed_at = time.monotonic()
+            return 0
+
+        with conn:
+            for path in removed:
+                self._delete(conn, path)
+            new_chunks = []
+            for path in changed:
+                self._delete(conn, path)
+                owner = self._owner(path)
+                text = (self.root / path).read_text(encoding="utf-8", errors="replace")
+                for chunk in chunk_text(text):
+                    terms = Counter(tokenize(chunk))
+                    if terms:
+                        length = sum(terms.values())
+                        chunk_id = conn.execute(
+                            "INSERT INTO chunks (path, owner, text, length) VALUES (?, ?, ?, ?)",
+                            (path, owner, chunk, length),
+                        ).lastrowid
+                        new_chunks.append((chunk_id, owner, terms, length))
+                conn.execute("INSERT INTO files (path, mtime, size) VALUES (?, ?, ?)", (path, *current[path]))
+
+            self._stats = None
+            _, average_length = self._corpus_stats(conn)
+            postings = []
+            df: Counter = Counter()
+            for chunk_id, owner, terms, length in new_chunks:
+                norm = K1 * (1 - B + B * length / average_length)
+                for term, tf in terms.items():
+                    postings.append((term, owner, tf * (K1 + 1) / (tf + norm), chunk_id))
+                df.update(terms.keys())
+            conn.executemany("INSERT INTO postings (term, owner, impact, chunk_id) VALUES (?, ?, ?, ?)", postings)
+            conn.executemany(
+                "INSERT INTO terms (term, df) VALUES (?, ?) ON CONFLICT (term) DO UPDATE SET df = df + excluded.df",
+                df.items(),
+            )
+            conn.execute("DELETE FROM terms WHERE df <= 0")
+
+        self._files = current
+        self._refreshed_at = time.monotonic()
+        return len(removed) + len(changed)
+
+    def _corpus_stats(self, conn: sqlite3.Connection) -> Tuple[int, float]:
+        if self._stats is None:
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM chunks").fetchone()
+            self._stats = (count, total / count if count else 0.0)
+        return self._stats
+
+    def search(self, query: str, k: int = DEFAULT_TOP_K, user: Optional[str] = None) -> List[Snippet]:
+        """
+        Returns the ``k`` snippets most relevant to ``query`` by BM25.
+
+        Args:
+            query: Free text, e.g. an agent's role and the task description
+            k: Maximum number of snippets
+            user: Also search this user's documents under knowledge/users/
+
+        Returns:
+            List[Snippet]: Best matches first; empty when nothing matches
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms or k <= 0:
+            return []
+        owners = [""] + ([user_slug(user)] if user else [])
+        with self._lock:
+            if self._refreshed_at is None or time.monotonic() - self._refreshed_at > self.refresh_seconds:
+                self._refresh()
+            conn = self._connection()
+            count, _ = self._corpus_stats(conn)
+            frequencies = dict(conn.execute(
+                f"SELECT term, df FROM terms WHERE term IN ({','.join('?' * len(terms))})", terms
+            ))
+            scores: Dict[int, float] = {}
+            for term, df in frequencies.items():
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                for owner in owners:
+                    for chunk_id, impact in conn.execute(
+                        "SELECT chunk_id, impact FROM postings WHERE term = ? AND owner = ?"
+                        " ORDER BY impact DESC LIMIT ?",
+                        (term, owner, self.candidates),
+                    ):
+                        scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * impact
+
+            best = heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+            if not best:
+                return []
+            texts = {
+                chunk_id: (path, text) for chunk_id, path, text in conn.execute(
+                    f"SELECT id, path, text FROM chunks WHERE id IN ({','.join('?' * len(best))})",
+                    [chunk_id for chunk_id, _ in best],
+                )
+            }
+        return [Snippet(*texts[chunk_id], round(score, 4)) for chunk_id, score in best]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._corpus_stats(self._connection())[0]
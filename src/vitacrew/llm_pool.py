@@ -0,0 +1,221 @@
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Lower runs first
+INTERACTIVE = 0
+BATCH = 1
+PRIORITIES = {"interactive": INTERACTIVE, "batch": BATCH}
+
+# Anthropic's entry tier; override with VITACREW_LLM_RPM / VITACREW_LLM_TPM
+DEFAULT_REQUESTS_PER_MINUTE = 50
+DEFAULT_TOKENS_PER_MINUTE = 40_000
+DEFAULT_MAX_RETRIES = 5
+# Exponential backoff after a 429: up to base * 2**attempt seconds, capped
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+
+class TokenBucket:
+    """Budget refilled continuously at ``per_minute / 60`` per second, holding at most ``capacity``.
+
+    Not thread-safe; LLMClientPool guards its buckets with its own lock.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60
+        self.capacity = capacity or per_minute
+        self.level = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` can be taken; larger than the capacity counts as a full bucket."""
+        self._refill()
+        return max(0.0, min(amount, self.capacity) - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        """Takes ``amount``; the level may go negative, delaying later callers."""
+        self._refill()
+        self.level -= amount
+
+    def give(self, amount: float) -> None:
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds the provider asked to wait, when a 429 says so."""
+    seconds = getattr(error, "retry_after", None)
+    if seconds is None:
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        seconds = headers.get("retry-after")
+    try:
+        return float(seconds) if seconds is not None else None
+    except ValueError:
+        return None
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Whether ``error`` is an HTTP 429 from the provider (anthropic, litellm or a stand-in)."""
+    return getattr(error, "status_code", None) == 429 or getattr(error, "status", None) == 429
+
+
+class LLMClientPool:
+    """Process-wide gate in front of the LLM provider.
+
+    Every call takes one request from a requests-per-minute bucket and its
+    estimated tokens from a tokens-per-minute bucket before it is sent, so
+    concurrent crews share the provider's limits instead of each tripping
+    them. Waiting callers are served in priority order (interactive before
+    batch), first come first served within a priority. A 429 pauses the
+    whole pool for a jittered exponential backoff (or the provider's
+    Retry-After), after which the call is retried in its original place.
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE, max_retries: int = DEFAULT_MAX_RETRIES,
+                 burst: Optional[float] = None, backoff_base: float = BACKOFF_BASE_SECONDS,
+                 backoff_max: float = BACKOFF_MAX_SECONDS, rng: Optional[random.Random] = None):
+        # ``burst`` caps the requests sent back to back (default: a minute's worth)
+        self.requests = TokenBucket(requests_per_minute, capacity=burst)
+        token_burst = tokens_per_minute * burst / requests_per_minute if burst else None
+        self.tokens = TokenBucket(tokens_per_minute, capacity=token_burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rng = rng or random.Random()
+        self._condition = threading.Condition()
+        self._waiting: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._stats: Dict[str, Any] = {
+            "requests": 0,
+            "throttled_requests": 0,
+            "throttle_seconds": {name: 0.0 for name in PRIORITIES},
+            "max_queue_depth": 0,
+            "rate_limited": 0,
+            "retries": 0,
+            "backoff_seconds": 0.0,
+            "failures": 0,
+        }
+
+    def acquire(self, tokens: float, priority: int = INTERACTIVE, ticket: Optional[Tuple[int, int]] = None) -> float:
+        """
+        Blocks until it is the caller's turn and both buckets allow the request.
+
+        Args:
+            tokens: Estimated prompt plus output tokens of the request
+            priority: INTERACTIVE or BATCH
+            ticket: Place in line kept from an earlier attempt of the same call
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        ticket = ticket or (priority, next(self._sequence))
+        start = time.monotonic()
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], len(self._waiting))
+            try:
+                while True:
+                    timeout = None
+                    if self._waiting[0] == ticket:
+                        timeout = max(self._paused_until - time.monotonic(), self.requests.wait_time(1),
+                                      self.tokens.wait_time(tokens))
+                        if timeout <= 0:
+                            self.requests.take(1)
+                            self.tokens.take(tokens)
+                            break
+                    self._condition.wait(timeout)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+            waited = time.monotonic() - start
+            self._stats["requests"] += 1
+            if waited > 0.001:
+                self._stats["throttled_requests"] += 1
+                name = "batch" if ticket[0] >= BATCH else "interactive"
+                self._stats["throttle_seconds"][name] += waited
+        return waited
+
+    def settle(self, reserved: float, used: float) -> None:
+        """Corrects the token bucket once a call's actual token count is known."""
+        with self._condition:
+            if used > reserved:
+                self.tokens.take(used - reserved)
+            else:
+                self.tokens.give(reserved - used)
+            self._condition.notify_all()
+
+    def backoff(self, attempt: int, requested: Optional[float] = None) -> float:
+        """Full-jitter exponential delay before retry ``attempt``, at least what the provider asked for."""
+        delay = self.rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        return max(delay, requested or 0.0)
+
+    def call(self, function: Callable[[], T], tokens: float, priority: int = INTERACTIVE) -> T:
+        """
+        Runs ``function`` once the limits allow it, retrying after 429s.
+
+        ``tokens`` is reserved for each attempt and handed back when it fails,
+        so only a successful call is left for the caller to ``settle``.
+
+        Raises:
+            Exception: The last 429 once ``max_retries`` retries failed, or any other error at once
+        """
+        ticket = (priority, next(self._sequence))
+        for attempt in range(self.max_retries + 1):
+            self.acquire(tokens, priority, ticket)
+            try:
+                return function()
+            except Exception as e:
+                with self._condition:
+                    # A failed request used none of its reservation; the next
+                    # attempt takes it again, and the caller only settles successes
+                    self.tokens.give(tokens)
+                    self._condition.notify_all()
+                    if not is_rate_limited(e):
+                        raise
+                    self._stats["rate_limited"] += 1
+                    if attempt == self.max_retries:
+                        self._stats["failures"] += 1
+                        raise
+                    delay = self.backoff(attempt, retry_after(e))
+                    # Hold every caller, not just this one: the provider is saturated
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                    self._stats["retries"] += 1
+                    self._stats["backoff_seconds"] += delay
+                    self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throttling and retry counters since the pool was created."""
+        with self._condition:
+            stats = {**self._stats, "throttle_seconds": dict(self._stats["throttle_seconds"])}
+            stats["queue_depth"] = len(self._waiting)
+            stats["paused_seconds"] = max(0.0, self._paused_until - time.monotonic())
+        return stats
+
+
+@lru_cache(maxsize=None)
+def default_llm_pool() -> LLMClientPool:
+    """The process-wide pool, sized from VITACREW_LLM_RPM and VITACREW_LLM_TPM."""
+    return LLMClientPool(
+        requests_per_minute=float(os.environ.get("VITACREW_LLM_RPM", DEFAULT_REQUESTS_PER_MINUTE)),
+        tokens_per_minute=float(os.environ.get("VITACREW_LLM_TPM", DEFAULT_TOKENS_PER_MINUTE)),
+    )
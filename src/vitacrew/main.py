@@ -2,20 +2,23 @@
 import sys
 import warnings
 
-from vitacrew.crew import Vitacrew
-
-from crewai import Crew
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
 # This main file is intended to be a way for you to run your
 # crew locally, so refrain from adding unnecessary logic into this file.
 # Replace with inputs you want to test with, it will automatically
 # interpolate any tasks and agents information
+#
+# crewai and the crew module take seconds to import, so each entry point
+# imports them on first use rather than at module load.
 
 def run():
     """
     Run the crew.
     """
+    from crewai import Crew
+    from vitacrew.crew import Vitacrew
+
     inputs = {
         'name': "Test User",
         'age': 30,
@@ -47,6 +50,8 @@ def train():
     """
     Train the crew for a given number of iterations.
     """
+    from vitacrew.crew import Vitacrew
+
     inputs = {
         "topic": "AI LLMs"
     }
@@ -60,6 +65,8 @@ def replay():
     """
     Replay the crew execution from a specific task.
     """
+    from vitacrew.crew import Vitacrew
+
     try:
         Vitacrew().crew().replay(task_id=sys.argv[1])
 
@@ -70,6 +77,8 @@ def test():
     """
     Test the crew execution and returns the results.
     """
+    from vitacrew.crew import Vitacrew
+
     inputs = {
         "topic": "AI LLMs"
     }
@@ -78,3 +87,76 @@ def test():
 
     except Exception as e:
         raise Exception(f"An error occurred while replaying the crew: {e}")
+
+def run_batch():
+    """
+    Plan a cohort of profiles from a JSONL/CSV file into an output JSONL.
+
+    Usage: run_batch <input.jsonl|input.csv> <output.jsonl> [workers]
+    """
+    from vitacrew.batch import DEFAULT_WORKERS, run_batch as run_cohort
+
+    try:
+        workers = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_WORKERS
+        counts = run_cohort(sys.argv[1], sys.argv[2], workers=workers)
+        print(f"Planned {counts['planned']}, failed {counts['failed']}, skipped {counts['skipped']}")
+
+    except Exception as e:
+        raise Exception(f"An error occurred while running the batch: {e}")
+
+def validate_batch():
+    """
+    Validate a file of profiles, writing one error line per invalid record.
+
+    Usage: validate_batch <input.jsonl|input.csv> <errors.jsonl>
+    """
+    from vitacrew.validation import validate_file
+
+    try:
+        counts = validate_file(sys.argv[1], sys.argv[2])
+        print(f"Valid {counts['valid']}, invalid {counts['invalid']}")
+
+    except Exception as e:
+        raise Exception(f"An error occurred while validating the batch: {e}")
+
+def serve():
+    """
+    Serve plans over HTTP on localhost from a bounded job queue.
+
+    Usage: serve [port] [workers] [queue_size]
+    """
+    from vitacrew.service import DEFAULT_PORT, DEFAULT_QUEUE_SIZE, DEFAULT_WORKERS, run_service
+
+    try:
+        run_service(
+            port=int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT,
+            workers=int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_WORKERS,
+            queue_size=int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_QUEUE_SIZE,
+        )
+
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        raise Exception(f"An error occurred while serving plans: {e}")
+
+def resume():
+    """
+    Plan one profile, resuming from checkpointed task outputs of earlier attempts.
+
+    Usage: resume <profile.json>
+    """
+    import json
+    from vitacrew.crew import Vitacrew
+    from vitacrew.models import UserInputs
+
+    try:
+        with open(sys.argv[1], encoding="utf-8") as file:
+            user_inputs = UserInputs(**json.load(file))
+        vitacrew = Vitacrew()
+        vitacrew.collect_user_inputs(user_inputs)
+        outputs = vitacrew.kickoff_concurrent()
+        print(f"Reused {len(vitacrew.reused_tasks)} of {len(outputs)} tasks from checkpoints")
+        print(json.dumps(outputs, indent=2))
+
+    except Exception as e:
+        raise Exception(f"An error occurred while resuming the crew: {e}")
@@ -0,0 +1,313 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from vitacrew.foods import FoodDatabase
+
+MACROS = ("protein", "carbs", "fat")
+# Reported per item and per day
+NUTRIENTS = ("kcal",) + MACROS
+# Keys of calculate_macros output for each optimized macro
+TARGET_KEYS = {"protein": "protein", "carbs": "carbs", "fat": "fats"}
+DEFAULT_TOLERANCE = 0.05
+
+# Ingredient roles: filter passed to FoodDatabase.mask and portion range in grams (min, typical, max)
+ROLES = {
+    "protein": ({"profiles": ["high-protein"], "maximum": {"carbs": 20, "fat": 15}}, (40, 150, 350)),
+    "carb": ({"minimum": {"carbs": 15}, "maximum": {"fat": 10, "protein": 15}}, (20, 150, 400)),
+    "vegetable": ({"category": "vegetables", "maximum": {"kcal": 60}}, (50, 150, 300)),
+    "fruit": ({"category": "fruits", "maximum": {"fat": 5}}, (50, 150, 250)),
+    "fat": ({"minimum": {"fat": 40}}, (0, 20, 60)),
+}
+# Looser filters topping up a role left with fewer than MIN_POOL_FOODS foods,
+# e.g. eggs and egg whites as the protein of vegetarian paleo plans
+FALLBACK_ROLES = {
+    "protein": {"minimum": {"protein": 10}, "maximum": {"carbs": 20, "fat": 15}},
+}
+MIN_POOL_FOODS = 3
+MEALS = {
+    "breakfast": ("protein", "carb", "fruit"),
+    "lunch": ("protein", "carb", "vegetable", "fat"),
+    "dinner": ("protein", "carb", "vegetable", "fat"),
+    "snack": ("fat", "fruit"),
+}
+# A single item never supplies more than this, whatever its role's gram range
+MAX_ITEM_KCAL = 700
+# Pull towards typical portions, relative to hitting the targets; keeps the
+# (under-determined) solution spread across the meals
+PORTION_WEIGHT = 0.0005
+# Food combinations tried per day; the first one within tolerance is kept
+CANDIDATES = 4
+
+
+def solve_portions(nutrients: np.ndarray, targets: np.ndarray, lower: np.ndarray, upper: np.ndarray,
+                   typical: np.ndarray) -> np.ndarray:
+    """
+    Box-constrained least squares for many independent problems at once.
+
+    Minimizes, per problem, the squared relative error of each macro total
+    plus a small pull of every portion towards its typical size. With only
+    a few macros the unconstrained optimum is one small linear solve per
+    problem (Woodbury identity); portions outside their range are pinned to
+    the bound and the rest re-solved, releasing pinned ones whose gradient
+    points back inside, until no bound changes (an active-set method
+    vectorized over the problems).
+
+    Args:
+        nutrients: (problems, macros, items) macro content per unit of each item
+        targets: (problems, macros) macro targets
+        lower: (problems, items) minimum units of each item
+        upper: (problems, items) maximum units; equal to ``lower`` to pin an item
+        typical: (problems, items) preferred units of each item
+
+    Returns:
+        np.ndarray: (problems, items) optimal units
+    """
+    scaled = nutrients / targets[:, :, None]
+    spread = typical ** 2 / PORTION_WEIGHT  # inverse of each portion's pull
+    movable = lower < upper
+    free = movable.copy()
+    x = np.clip(typical, lower, upper)
+    identity = np.eye(scaled.shape[1])
+    # Problems whose active set is still changing
+    pending = np.arange(len(x))
+    for _ in range(2 * scaled.shape[2] + 1):
+        A, low, high, usual, wide = scaled[pending], lower[pending], upper[pending], typical[pending], spread[pending]
+        weight = np.where(free[pending], wide, 0.0)
+        anchor = np.where(free[pending], usual, x[pending])
+        shortfall = 1 - (A @ anchor[:, :, None])
+        gram = identity + (A * weight[:, None, :]) @ A.transpose(0, 2, 1)
+        multipliers = np.linalg.solve(gram, shortfall)
+        solved = anchor + weight * (A.transpose(0, 2, 1) @ multipliers)[:, :, 0]
+        violated = free[pending] & ((solved < low) | (solved > high))
+        clipped = np.clip(solved, low, high)
+        x[pending] = clipped
+
+        residual = A @ clipped[:, :, None] - 1
+        gradient = (A.transpose(0, 2, 1) @ residual)[:, :, 0] + (clipped - usual) / wide
+        released = movable[pending] & ~free[pending] & (
+            ((clipped <= low) & (gradient < 0)) | ((clipped >= high) & (gradient > 0))
+        )
+        free[pending] = (free[pending] & ~violated) | released
+        changed = (violated | released).any(axis=1)
+        pending = pending[changed]
+        if not len(pending):
+            break
+    return x
+
+
+def _eligible_foods(diets: Tuple[str, ...]) -> str:
+    return f"foods allowed by {', '.join(diets)}" if diets else "foods in the database"
+
+
+class MealPlanOptimizer:
+    """Builds daily meal plans whose macros hit MacroCalculator targets.
+
+    Each day is a fixed set of meals made of ingredient roles (a protein, a
+    carb, a vegetable...). Foods are picked per role from the ones meeting
+    the dietary requirements, rotating through them so the week varies, and
+    the portions are then solved for so the daily protein, carb and fat
+    totals match the targets. A few food combinations are tried per day and
+    the first one within tolerance is kept. Every combination of every day
+    of every plan is one row of a single vectorized solve, so a week or a
+    batch of users costs little more than one day.
+
+    Targets the eligible foods cannot reach even at their largest (or
+    smallest) portions, such as a high-carb split on keto, are detected
+    before solving and explained in the plan's ``infeasible`` reasons, as
+    are targets only reachable one macro at a time.
+    """
+
+    def __init__(self, database: FoodDatabase, tolerance: float = DEFAULT_TOLERANCE, seed: int = 0,
+                 candidates: int = CANDIDATES):
+        self.database = database
+        self.tolerance = tolerance
+        self.seed = seed
+        self.candidates = candidates
+        self._nutrients = np.stack([database.columns[macro] for macro in MACROS])  # (macros, foods) per 100 g
+        self._pools: Dict[Tuple[str, ...], Dict[str, np.ndarray]] = {}
+        self._layouts: Dict[Tuple[Tuple[str, ...], int], tuple] = {}
+        # Guards both caches; tools share one optimizer across crews and threads
+        self._lock = threading.Lock()
+
+    def _diets(self, dietary_requirements: Iterable[str]) -> Tuple[str, ...]:
+        return tuple(sorted({diet.lower() for diet in dietary_requirements} - {"none"}))
+
+    def pools(self, dietary_requirements: Iterable[str] = ()) -> Dict[str, np.ndarray]:
+        """Row indexes of the foods eligible for each role; roles without any are left out."""
+        diets = self._diets(dietary_requirements)
+        with self._lock:
+            return self._pools_for(diets)
+
+    def _pools_for(self, diets: Tuple[str, ...]) -> Dict[str, np.ndarray]:
+        if diets not in self._pools:
+            pools = {}
+            for role, (query, _) in ROLES.items():
+                rows = np.flatnonzero(self.database.mask(diets, **query))
+                if len(rows) < MIN_POOL_FOODS and role in FALLBACK_ROLES:
+                    extra = np.flatnonzero(self.database.mask(diets, **FALLBACK_ROLES[role]))
+                    rows = np.concatenate([rows, np.setdiff1d(extra, rows)])
+                if len(rows):
+                    pools[role] = rows
+            self._pools[diets] = pools
+        return self._pools[diets]
+
+    def _layout(self, diets: Tuple[str, ...], days: int) -> tuple:
+        """
+        Food combinations of each day for one set of dietary requirements.
+
+        Returns:
+            tuple: Items (meal, role); per day and candidate, the food row and
+            gram range of each item as (days * candidates, items) arrays; and
+            the smallest and largest daily grams of each macro any day can reach
+        """
+        key = (diets, days)
+        with self._lock:
+            if key not in self._layouts:
+                self._layouts[key] = self._build_layout(diets, days)
+            return self._layouts[key]
+
+    def _build_layout(self, diets: Tuple[str, ...], days: int) -> tuple:
+        pools = self._pools_for(diets)
+        items = [(meal, role) for meal, roles in MEALS.items() for role in roles if role in pools]
+        rng = np.random.default_rng(self.seed)
+        # Candidate 0 walks one shuffled order per role, so foods repeat as rarely as possible
+        orders = [{role: rng.permutation(rows) for role, rows in pools.items()} for _ in range(self.candidates)]
+        rows = np.zeros((days, self.candidates, len(items)), dtype=np.intp)
+        for day in range(days):
+            used = {role: day * sum(r == role for _, r in items) for role in pools}
+            for slot, (_, role) in enumerate(items):
+                for candidate, order in enumerate(orders):
+                    rows[day, candidate, slot] = order[role][used[role] % len(order[role])]
+                used[role] += 1
+        rows = rows.reshape(days * self.candidates, len(items))
+        ranges = np.array([ROLES[role][1] for _, role in items], dtype=np.float64).reshape(1, -1, 3) / 100
+        lower, typical, upper = np.broadcast_to(ranges, rows.shape + (3,)).transpose(2, 0, 1)
+        kcal = self.database.columns["kcal"][rows]
+        upper = np.minimum(upper, np.maximum(lower, MAX_ITEM_KCAL / np.maximum(kcal, 1e-9)))
+        typical = np.minimum(typical, upper)
+        nutrients = self._nutrients[:, rows]  # (macros, problems, items) per 100 g
+        reach = ((nutrients * lower).sum(axis=2).min(axis=1), (nutrients * upper).sum(axis=2).max(axis=1))
+        return items, rows, lower, typical, upper, reach
+
+    def _infeasible(self, goal: Sequence[float], reach: tuple, diets: Tuple[str, ...]) -> List[str]:
+        """Macros whose target lies outside what the eligible foods can reach at any portions."""
+        foods = _eligible_foods(diets)
+        reasons = []
+        for macro, target, least, most in zip(MACROS, goal, *reach):
+            if target > most * (1 + self.tolerance):
+                reasons.append(f"{macro}: {target:g} g/day is more than the {most:.0f} g the {foods} can supply")
+            elif target < least * (1 - self.tolerance):
+                reasons.append(f"{macro}: {target:g} g/day is less than the {least:.0f} g the "
+                               f"smallest portions of the {foods} contain")
+        return reasons
+
+    def plan(self, targets: Dict[str, float], days: int = 7,
+             dietary_requirements: Iterable[str] = ()) -> dict:
+        """
+        Meal plan hitting daily macro targets.
+
+        Args:
+            targets: Daily grams, as returned by MacroCalculator (protein, carbs, fats)
+            days: Number of days to plan
+            dietary_requirements: UserInputs dietary requirements every food must meet
+
+        Returns:
+            dict: Per-day meals with portions in grams, daily totals, the relative
+            deviation from each target and whether it is within the tolerance,
+            plus the reasons the targets cannot be met (``infeasible``, empty
+            when they can), in which case the days are the closest found
+        """
+        return self.plan_batch([targets], days, [dietary_requirements])[0]
+
+    def plan_batch(self, targets: Sequence[Dict[str, float]], days: int = 7,
+                   dietary_requirements: Optional[Sequence[Iterable[str]]] = None) -> List[dict]:
+        """
+        Plans for many users in one solve; see ``plan``.
+
+        Raises:
+            ValueError: For a missing or non-positive target, or an unknown dietary requirement
+        """
+        if dietary_requirements is None:
+            dietary_requirements = [()] * len(targets)
+        if len(dietary_requirements) != len(targets):
+            raise ValueError("Pass one list of dietary requirements per set of targets")
+        if days < 1:
+            raise ValueError(f"Cannot plan {days} days")
+        goals = []
+        for target in targets:
+            goal = [target.get(TARGET_KEYS[macro], target.get(macro)) for macro in MACROS]
+            if any(value is None or value <= 0 for value in goal):
+                raise ValueError(f"Targets need positive {', '.join(TARGET_KEYS.values())} grams, got {target}")
+            goals.append(goal)
+        if not goals:
+            return []
+
+        # Users sharing dietary requirements share a layout; build each padded layout once
+        keys = [self._diets(diets) for diets in dietary_requirements]
+        distinct = {key: index for index, key in enumerate(dict.fromkeys(keys))}
+        layouts = [self._layout(key, days) for key in distinct]
+        width = max(len(layout[0]) for layout in layouts)
+        group = np.array([distinct[key] for key in keys])
+        infeasible = [self._infeasible(goal, layouts[distinct[key]][5], key) for goal, key in zip(goals, keys)]
+        # Padding items are pinned at 0 g
+        rows, lower, typical, upper = (
+            np.stack([np.pad(layout[index], ((0, 0), (0, width - len(layout[0])))) for layout in layouts])[group]
+            .reshape(-1, width)
+            for index in range(1, 5)
+        )
+        typical = np.where(upper > 0, typical, 1.0)
+        goal = np.repeat(np.asarray(goals, dtype=np.float64), days * self.candidates, axis=0)
+        nutrients = self._nutrients[:, rows].transpose(1, 0, 2)
+        grams = np.rint(solve_portions(nutrients, goal, lower, upper, typical) * 100)
+
+        # Keep the first candidate within tolerance each day, else the closest
+        totals = (nutrients @ grams[:, :, None])[:, :, 0] / 100
+        deviation = np.abs(totals / goal - 1).max(axis=1).reshape(len(goals), days, self.candidates)
+        best = np.where(deviation <= self.tolerance, 0.0, deviation).argmin(axis=2)
+        chosen = (np.arange(len(goals) * days) * self.candidates + best.ravel())
+        rows, grams, goal = rows[chosen], grams[chosen], goal[chosen]
+
+        columns = self.database.columns
+        amounts = np.stack([columns[nutrient][rows] for nutrient in NUTRIENTS]) * grams / 100  # (nutrients, days, items)
+        totals = amounts.sum(axis=2)
+        deviation = np.round(totals[1:].T / goal - 1, 3)
+        within = (np.abs(deviation) <= self.tolerance).all(axis=1)
+        names = columns["name"][rows].tolist()
+        amounts = np.round(amounts, 1).transpose(1, 2, 0).tolist()
+        totals = np.round(totals, 1).T.tolist()
+        grams, deviation = grams.astype(int).tolist(), deviation.tolist()
+
+        plans = []
+        for user, key in enumerate(keys):
+            items = layouts[distinct[key]][0]
+            plan_days = []
+            for day in range(days):
+                problem = user * days + day
+                meals: Dict[str, list] = {meal: [] for meal in MEALS}
+                for (meal, role), name, amount, values in zip(items, names[problem], grams[problem], amounts[problem]):
+                    if amount:
+                        meals[meal].append({"food": name, "role": role, "grams": amount, **dict(zip(NUTRIENTS, values))})
+                plan_days.append({
+                    "day": day + 1,
+                    "meals": [{"meal": meal, "items": entries} for meal, entries in meals.items() if entries],
+                    "totals": dict(zip(NUTRIENTS, totals[problem])),
+                    "deviation": dict(zip(MACROS, deviation[problem])),
+                    "within_tolerance": bool(within[problem]),
+                })
+            within_all = all(day["within_tolerance"] for day in plan_days)
+            reasons = infeasible[user]
+            if not within_all and not reasons:
+                # Each macro is reachable on its own, but not all three together
+                miss = max(abs(value) for day in plan_days for value in day["deviation"].values())
+                reasons = [f"no portions of the {_eligible_foods(key)} hit all three targets together; "
+                           f"the closest days miss by up to {miss:.0%}"]
+            plans.append({
+                "targets": dict(zip(MACROS, goals[user])),
+                "tolerance": self.tolerance,
+                "days": plan_days,
+                "within_tolerance": within_all,
+                "infeasible": reasons,
+            })
+        return plans
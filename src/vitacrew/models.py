@@ -0,0 +1,92 @@
+from enum import Enum
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
+
+class Gender(str, Enum):
+    MALE = "male"
+    FEMALE = "female"
+    OTHER = "other"
+
+class StressLevel(str, Enum):
+    LOW = "low"
+    MODERATE = "moderate"
+    HIGH = "high"
+
+class ActivityLevel(str, Enum):
+    SEDENTARY = "sedentary"
+    LIGHT = "light"
+    MODERATE = "moderate"
+    ACTIVE = "active"
+    VERY_ACTIVE = "very active"
+
+class SkinType(str, Enum):
+    NORMAL = "normal"
+    DRY = "dry"
+    OILY = "oily"
+    COMBINATION = "combination"
+    SENSITIVE = "sensitive"
+
+FITNESS_OBJECTIVES = frozenset({
+    "weight loss", "muscle gain", "endurance", "flexibility",
+    "strength", "general fitness", "athletic performance"
+})
+DIETARY_REQUIREMENTS = frozenset({
+    "vegetarian", "vegan", "gluten-free", "dairy-free",
+    "keto", "paleo", "halal", "kosher", "none"
+})
+SKIN_CONCERNS = frozenset({
+    "acne", "aging", "dark spots", "dryness", "oiliness",
+    "redness", "sensitivity", "uneven texture", "none"
+})
+
+# Allowed values of the free-text list fields, checked case-insensitively
+VOCABULARIES = {
+    "fitness_objectives": FITNESS_OBJECTIVES,
+    "dietary_requirements": DIETARY_REQUIREMENTS,
+    "skin_concerns": SKIN_CONCERNS,
+}
+
+@lru_cache(maxsize=4096)
+def invalid_items(vocabulary: frozenset, items: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Items not in ``vocabulary`` (case-insensitive); profiles repeat a few lists, so results are cached."""
+    return tuple(item for item in items if item not in vocabulary and item.lower() not in vocabulary)
+
+def vocabulary_error(field: str, items: List[str]) -> Optional[str]:
+    """Error message when ``items`` holds a value outside the field's vocabulary, else None.
+
+    Only string items are checked; anything else fails the field's type check instead.
+    """
+    vocabulary = VOCABULARIES[field]
+    if invalid_items(vocabulary, tuple(item for item in items if isinstance(item, str))):
+        return f"Invalid {field.replace('_', ' ')}. Must be one of: {sorted(vocabulary)}"
+    return None
+
+class UserInputs(BaseModel):
+    # Personal Information
+    name: str = Field(..., min_length=2, max_length=50)
+    age: int = Field(..., ge=18, le=120)
+    gender: Gender
+    height: float = Field(..., ge=100, le=250)  # in cm
+    weight: float = Field(..., ge=30, le=300)  # in kg
+    waist_circumference: float = Field(..., ge=40, le=200)  # in cm
+    hip_circumference: float = Field(..., ge=40, le=200)  # in cm
+
+    # Health Goals
+    fitness_objectives: List[str] = Field(..., min_length=1, max_length=5)
+    dietary_requirements: List[str] = Field(default_factory=list)
+    skin_type: SkinType
+    skin_concerns: List[str] = Field(default_factory=list, max_length=5)
+
+    # Lifestyle Factors
+    sleep_hours: float = Field(..., ge=0, le=24)
+    stress_level: StressLevel
+    activity_level: ActivityLevel
+
+    @field_validator(*VOCABULARIES)
+    @classmethod
+    def validate_vocabulary(cls, v: List[str], info: ValidationInfo) -> List[str]:
+        message = vocabulary_error(info.field_name, v)
+        if message:
+            raise ValueError(message)
+        return v
@@ -0,0 +1,83 @@
+from typing import Any, Dict, List, Optional, Union
+
+from crewai.llms.base_llm import BaseLLM
+
+from vitacrew.context import estimate_tokens
+from vitacrew.llm_pool import INTERACTIVE, LLMClientPool
+
+# Output tokens reserved per call when the wrapped LLM sets no max_tokens
+DEFAULT_OUTPUT_TOKENS = 1024
+
+
+class PooledLLM(BaseLLM):
+    """An agent's LLM whose calls go through a shared LLMClientPool.
+
+    Each call reserves its estimated prompt tokens plus the output budget,
+    waits for its turn at the given priority and is retried by the pool
+    after 429s; the reservation is corrected once the answer is known.
+    Attributes the agent executor reads or sets on its LLM, such as stop
+    words and streaming, pass through to the wrapped LLM.
+    """
+
+    def __init__(self, llm: Any, pool: LLMClientPool, priority: int = INTERACTIVE):
+        # BaseLLM.__init__ is skipped: it would reset the wrapped LLM's attributes through the properties below
+        self.__dict__.update(llm=llm, pool=pool, priority=priority)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__dict__["llm"], name)
+
+    @property
+    def model(self) -> str:
+        return self.llm.model
+
+    @property
+    def temperature(self) -> Optional[float]:
+        return getattr(self.llm, "temperature", None)
+
+    @property
+    def stop(self) -> List[str]:
+        return getattr(self.llm, "stop", None) or []
+
+    @stop.setter
+    def stop(self, value: List[str]) -> None:
+        self.llm.stop = value
+
+    @property
+    def stream(self) -> Optional[bool]:
+        return getattr(self.llm, "stream", None)
+
+    @stream.setter
+    def stream(self, value: bool) -> None:
+        self.llm.stream = value
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Any:
+        prompt = messages if isinstance(messages, str) else "\n".join(
+            str(message.get("content", "")) for message in messages
+        )
+        prompt_tokens = estimate_tokens(prompt)
+        reserved = prompt_tokens + (getattr(self.llm, "max_tokens", None) or DEFAULT_OUTPUT_TOKENS)
+        response = self.pool.call(
+            lambda: self.llm.call(messages, tools=tools, callbacks=callbacks, available_functions=available_functions,
+                                  from_task=from_task, from_agent=from_agent),
+            tokens=reserved,
+            priority=self.priority,
+        )
+        self.pool.settle(reserved, prompt_tokens + estimate_tokens(str(response)))
+        return response
+
+    def supports_function_calling(self) -> bool:
+        return self.llm.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.llm.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.llm.get_context_window_size()
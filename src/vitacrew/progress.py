@@ -0,0 +1,182 @@
+import sqlite3
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+DateLike = Union[str, date]
+Listener = Callable[[int, str, str, str, float], None]
+
+PERIODS = ("day", "week", "month")
+
+
+def _bucket_starts(days: np.ndarray, period: str) -> np.ndarray:
+    """Maps datetime64[D] days to the first day of their bucket (weeks start on Monday)."""
+    if period == "week":
+        # 1970-01-01, day 0 of the epoch, was a Thursday
+        return days - (days.astype(np.int64) + 3) % 7
+    if period == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    return days
+
+
+def _iso(value: DateLike) -> str:
+    if isinstance(value, date):
+        return value.isoformat()
+    return date.fromisoformat(value.strip()).isoformat()
+
+
+class ProgressStore:
+    """Append-only store of per-user metric time series.
+
+    Measurements live in a SQLite file, one row each, with a covering index on
+    (user, metric_type, date, value) so date-range reads and rollups never
+    touch the table itself. Rows are never updated; recording the same date
+    twice keeps both measurements.
+
+    Listeners registered with subscribe() are called with
+    ``(row_id, user, metric_type, date, value)`` for every stored measurement;
+    row ids increase with every write.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._listeners: List[Listener] = []
+
+    def subscribe(self, listener: Listener) -> None:
+        """Registers a callback notified of each measurement after it is stored."""
+        self._listeners.append(listener)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS measurements ("
+                " user TEXT NOT NULL, metric_type TEXT NOT NULL, date TEXT NOT NULL,"
+                " value REAL NOT NULL, notes TEXT, recorded_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS measurements_series"
+                " ON measurements (user, metric_type, date, value)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def record(self, user: str, metric_type: str, day: DateLike, value: float,
+               notes: Optional[str] = None) -> None:
+        """Appends a single measurement."""
+        self.ingest([(user, metric_type, day, value, notes)])
+
+    def ingest(self, rows: Iterable[Tuple]) -> int:
+        """
+        Appends many measurements in one transaction.
+
+        Args:
+            rows: ``(user, metric_type, date, value)`` tuples, optionally with
+                notes as a fifth item
+
+        Returns:
+            int: Number of measurements stored
+        """
+        now = time.time()
+        records = [
+            (user, metric_type, _iso(day), float(value), rest[0] if rest else None, now)
+            for user, metric_type, day, value, *rest in rows
+        ]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO measurements (user, metric_type, date, value, notes, recorded_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    records,
+                )
+                # The transaction holds the write lock, so its rows got consecutive ids
+                last_id = conn.execute("SELECT MAX(rowid) FROM measurements").fetchone()[0] or 0
+        first_id = last_id - len(records) + 1
+        for listener in self._listeners:
+            for row_id, (user, metric_type, day, value, _, _) in enumerate(records, first_id):
+                listener(row_id, user, metric_type, day, value)
+        return len(records)
+
+    @staticmethod
+    def _range(start: Optional[DateLike], end: Optional[DateLike]) -> Tuple[str, str]:
+        # ISO dates sort lexically, so open bounds become sentinel strings
+        return (_iso(start) if start else "", _iso(end) if end else "9999-12-31")
+
+    def query(self, user: str, metric_type: str, start: Optional[DateLike] = None,
+              end: Optional[DateLike] = None) -> List[Tuple[str, float]]:
+        """Returns ``(date, value)`` pairs within ``[start, end]``, oldest first."""
+        with self._lock:
+            return self._connection().execute(
+                "SELECT date, value FROM measurements"
+                " WHERE user = ? AND metric_type = ? AND date BETWEEN ? AND ?"
+                " ORDER BY date",
+                (user, metric_type, *self._range(start, end)),
+            ).fetchall()
+
+    def history(self, user: str) -> List[Tuple[int, str, str, float]]:
+        """Every measurement of ``user`` as ``(row_id, date, metric_type, value)``, oldest first."""
+        with self._lock:
+            return self._connection().execute(
+                "SELECT rowid, date, metric_type, value FROM measurements"
+                " WHERE user = ? ORDER BY date, rowid",
+                (user,),
+            ).fetchall()
+
+    def rollup(self, user: str, metric_type: str, period: str = "day",
+               start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> List[dict]:
+        """
+        Aggregates a series into day, week or month buckets.
+
+        The rows come from one indexed range scan already ordered by date, so
+        each bucket is a contiguous slice and is reduced with numpy rather
+        than SQLite's per-group aggregates, which are several times slower at
+        this size.
+
+        Returns:
+            List[dict]: One entry per bucket with its start date, mean, min,
+            max and measurement count, oldest first
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period {period!r}; expected one of {', '.join(PERIODS)}")
+        rows = self.query(user, metric_type, start, end)
+        if not rows:
+            return []
+        days, values = zip(*rows)
+        buckets = _bucket_starts(np.array(days, dtype="datetime64[D]"), period)
+        values = np.array(values)
+
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        counts = np.diff(np.r_[starts, len(values)])
+        means = np.add.reduceat(values, starts) / counts
+        return [
+            {"period": bucket, "mean": mean, "min": low, "max": high, "count": count}
+            for bucket, mean, low, high, count in zip(
+                buckets[starts].astype(str).tolist(),
+                means.tolist(),
+                np.minimum.reduceat(values, starts).tolist(),
+                np.maximum.reduceat(values, starts).tolist(),
+                counts.tolist(),
+            )
+        ]
+
+    def metric_types(self, user: str) -> List[str]:
+        """Metric types recorded for ``user``."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT DISTINCT metric_type FROM measurements WHERE user = ? ORDER BY metric_type",
+                (user,),
+            ).fetchall()
+        return [metric_type for (metric_type,) in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM measurements").fetchone()[0]
@@ -0,0 +1,253 @@
+import re
+import textwrap
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup, escape
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+# Report sections in reading order: task name -> heading
+SECTION_TITLES = {
+    "analyze_fitness": "Fitness Assessment",
+    "generate_workout": "Workout Plan",
+    "create_meal_plan": "Meal Plan",
+    "generate_grocery_list": "Grocery List",
+    "assess_skin": "Skin Assessment",
+    "design_routine": "Skincare Routine",
+    "analyze_data": "Health Insights",
+    "generate_report": "Progress Report",
+}
+
+Block = Tuple[str, object]
+
+_LIST_ITEM = re.compile(r"^\s*(?:[-*+•]|\d+[.)])\s+")
+_BOLD = re.compile(r"\*\*(.+?)\*\*|__(.+?)__")
+
+
+@dataclass
+class ReportSection:
+    name: str
+    title: str
+    blocks: List[Block]
+
+
+def parse_blocks(text: str) -> List[Block]:
+    """
+    Splits markdown-ish task output into heading, list and paragraph blocks.
+
+    Only the subset LLM outputs actually use is recognised: ``#`` headings,
+    bullet or numbered list items, and blank-line separated paragraphs.
+    """
+    blocks: List[Block] = []
+    paragraph: List[str] = []
+    items: List[str] = []
+
+    def flush() -> None:
+        if paragraph:
+            blocks.append(("paragraph", " ".join(paragraph)))
+            paragraph.clear()
+        if items:
+            blocks.append(("list", list(items)))
+            items.clear()
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            flush()
+        elif stripped.startswith("#"):
+            flush()
+            blocks.append(("heading", stripped.lstrip("#").strip()))
+        elif _LIST_ITEM.match(stripped):
+            if paragraph:
+                flush()
+            items.append(_LIST_ITEM.sub("", stripped))
+        elif items and line[:1].isspace():
+            items[-1] += " " + stripped  # Continuation of a wrapped list item
+        else:
+            if items:
+                flush()
+            paragraph.append(stripped)
+    flush()
+    return blocks
+
+
+def report_sections(outputs: Iterable[Tuple[str, str]],
+                    titles: Optional[Dict[str, str]] = None) -> Iterator[ReportSection]:
+    """Turns ``(task name, output)`` pairs into report sections, skipping names without a title."""
+    titles = SECTION_TITLES if titles is None else titles
+    for name, text in outputs:
+        if name in titles and text:
+            yield ReportSection(name, titles[name], parse_blocks(text))
+
+
+def ordered_outputs(outputs: Dict[str, str]) -> List[Tuple[str, str]]:
+    """Task outputs in report reading order."""
+    return [(name, outputs[name]) for name in SECTION_TITLES if name in outputs]
+
+
+def _inline(text: str) -> Markup:
+    escaped = str(escape(text))
+    return Markup(_BOLD.sub(lambda m: f"<strong>{m.group(1) or m.group(2)}</strong>", escaped))
+
+
+@lru_cache(maxsize=None)
+def _environment() -> Environment:
+    # Compiled templates are cached by the environment; auto_reload is off so
+    # no template file is stat'ed per render
+    environment = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=select_autoescape(["html", "j2"]),
+        auto_reload=False,
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    environment.filters["inline"] = _inline
+    return environment
+
+
+def render_html(outputs: Iterable[Tuple[str, str]], title: str, subtitle: Optional[str] = None,
+                titles: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    """
+    Renders the HTML report incrementally.
+
+    ``outputs`` is consumed lazily, so each section is rendered and yielded
+    as soon as its ``(task name, output)`` pair becomes available.
+
+    Yields:
+        str: Consecutive chunks of the HTML document
+    """
+    template = _environment().get_template("report.html.j2")
+    return template.generate(title=title, subtitle=subtitle, sections=report_sections(outputs, titles))
+
+
+# A4 in points, with the layout of the PDF renderer
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+MARGIN = 56
+STYLES = {
+    # kind: (font resource, size, space before)
+    "title": ("F2", 20.0, 0.0),
+    "section": ("F2", 15.0, 14.0),
+    "heading": ("F2", 12.0, 8.0),
+    "paragraph": ("F1", 10.5, 5.0),
+    "list": ("F1", 10.5, 2.0),
+}
+LEADING = 1.35
+# Helvetica averages about half an em per character
+CHAR_WIDTH = 0.5
+
+_PDF_REPLACEMENTS = str.maketrans({
+    "‘": "'", "’": "'", "“": '"', "”": '"',
+    "–": "-", "—": "-", "•": "-", "…": "...", "\u00a0": " ",
+})
+
+
+def _pdf_string(text: str) -> bytes:
+    text = _BOLD.sub(lambda m: m.group(1) or m.group(2), text).translate(_PDF_REPLACEMENTS)
+    raw = text.encode("latin-1", "replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _pdf_lines(title: str, subtitle: Optional[str],
+               sections: Iterable[ReportSection]) -> Iterator[Tuple[str, str, bool]]:
+    """Yields ``(style, text, starts_block)`` lines, wrapped to the page width."""
+    def wrapped(style: str, text: str, bullet: str = ""):
+        _, size, _ = STYLES[style]
+        width = int((PAGE_WIDTH - 2 * MARGIN - 12 * bool(bullet)) / (size * CHAR_WIDTH))
+        for i, line in enumerate(textwrap.wrap(text, width) or [""]):
+            yield style, (bullet if i == 0 else "  " * bool(bullet)) + line, i == 0
+
+    yield from wrapped("title", title)
+    if subtitle:
+        yield from wrapped("paragraph", subtitle)
+    for section in sections:
+        yield from wrapped("section", section.title)
+        for kind, content in section.blocks:
+            if kind == "list":
+                for item in content:
+                    yield from wrapped("list", item, bullet="- ")
+            else:
+                yield from wrapped(kind, content)
+
+
+def _pdf_pages(lines: Iterable[Tuple[str, str, bool]]) -> Iterator[bytes]:
+    """Groups lines into pages and yields each page's content stream."""
+    commands: List[bytes] = []
+    y = PAGE_HEIGHT - MARGIN
+    for style, text, first in lines:
+        font, size, space_before = STYLES[style]
+        advance = size * LEADING + (space_before if first else 0.0)
+        if commands and y - advance < MARGIN:
+            yield b"\n".join(commands)
+            commands, y = [], PAGE_HEIGHT - MARGIN
+        y -= advance
+        commands.append(
+            b"BT /%s %.1f Tf %d %.1f Td %s Tj ET" % (font.encode(), size, MARGIN, y, _pdf_string(text))
+        )
+    if commands:
+        yield b"\n".join(commands)
+
+
+def render_pdf(outputs: Iterable[Tuple[str, str]], title: str, subtitle: Optional[str] = None,
+               titles: Optional[Dict[str, str]] = None) -> Iterator[bytes]:
+    """
+    Renders the report as a PDF, streaming one page at a time.
+
+    Only the page being laid out and the object offsets are kept in memory;
+    the page tree and cross-reference table are written after the last page.
+
+    Yields:
+        bytes: Consecutive chunks of the PDF file
+    """
+    offsets: Dict[int, int] = {}
+    position = 0
+
+    def chunk(data: bytes, number: Optional[int] = None) -> bytes:
+        nonlocal position
+        if number is not None:
+            offsets[number] = position
+            data = b"%d 0 obj\n%s\nendobj\n" % (number, data)
+        position += len(data)
+        return data
+
+    # Objects 1-4 are the catalog, page tree and fonts; pages follow from 5
+    yield chunk(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    yield chunk(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>", 3)
+    yield chunk(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>", 4)
+
+    kids = []
+    number = 5
+    for content in _pdf_pages(_pdf_lines(title, subtitle, report_sections(outputs, titles))):
+        yield chunk(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content), number)
+        yield chunk(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R"
+            b" /Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> >>" % (PAGE_WIDTH, PAGE_HEIGHT, number),
+            number + 1,
+        )
+        kids.append(number + 1)
+        number += 2
+
+    yield chunk(
+        b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)),
+        2,
+    )
+    yield chunk(b"<< /Type /Catalog /Pages 2 0 R >>", 1)
+
+    xref = position
+    entries = b"".join(b"%010d 00000 n \n" % offsets[n] for n in range(1, number))
+    yield chunk(
+        b"xref\n0 %d\n0000000000 65535 f \n%strailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (number, entries, number, xref)
+    )
+
+
+def write_pdf(outputs: Iterable[Tuple[str, str]], title: str, file: BinaryIO,
+              subtitle: Optional[str] = None, titles: Optional[Dict[str, str]] = None) -> BinaryIO:
+    """Streams the PDF report into ``file`` and rewinds it for reading."""
+    for data in render_pdf(outputs, title, subtitle, titles):
+        file.write(data)
+    file.seek(0)
+    return file
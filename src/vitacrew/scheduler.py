@@ -0,0 +1,84 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List
+
+
+class TaskScheduler:
+    """Runs a dependency graph of tasks on a bounded thread pool.
+
+    Each task is submitted as soon as every task it depends on has finished,
+    so independent branches execute at the same time and wall-clock time
+    tracks the longest branch rather than the sum of all tasks.
+    """
+
+    def __init__(self, dependencies: Dict[str, List[str]], max_concurrency: int = 3):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.dependencies = {name: list(deps) for name, deps in dependencies.items()}
+        self.max_concurrency = max_concurrency
+        self.order = self._topological_order()
+        # time.monotonic() at which each task's dependencies were all met
+        self.ready_at: Dict[str, float] = {}
+
+    def _topological_order(self) -> List[str]:
+        """Returns task names in a valid execution order, preserving declaration order."""
+        for name, deps in self.dependencies.items():
+            unknown = [dep for dep in deps if dep not in self.dependencies]
+            if unknown:
+                raise ValueError(f"Task '{name}' depends on unknown tasks: {unknown}")
+
+        order: List[str] = []
+        done = set()
+        pending = list(self.dependencies)
+        while pending:
+            ready = [name for name in pending if all(dep in done for dep in self.dependencies[name])]
+            if not ready:
+                raise ValueError(f"Circular task dependencies between: {pending}")
+            for name in ready:
+                order.append(name)
+                done.add(name)
+                pending.remove(name)
+        return order
+
+    def run(self, execute: Callable[[str, Dict[str, str]], str]) -> Dict[str, str]:
+        """
+        Executes every task, respecting dependencies and the concurrency limit.
+
+        Args:
+            execute: Called as ``execute(task_name, upstream_outputs)`` where
+                upstream_outputs maps each dependency name to its output.
+
+        Returns:
+            Dict[str, str]: Task outputs keyed by task name, in declaration order.
+        """
+        outputs: Dict[str, str] = {}
+        running: Dict[Future, str] = {}
+        pending = list(self.order)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                thread_name_prefix="vitacrew-task") as pool:
+            try:
+                while pending or running:
+                    now = time.monotonic()
+                    for name in pending:
+                        if name not in self.ready_at and all(dep in outputs for dep in self.dependencies[name]):
+                            self.ready_at[name] = now
+
+                    for name in list(pending):
+                        if len(running) >= self.max_concurrency:
+                            break
+                        deps = self.dependencies[name]
+                        if name in self.ready_at:
+                            upstream = {dep: outputs[dep] for dep in deps}
+                            running[pool.submit(execute, name, upstream)] = name
+                            pending.remove(name)
+
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        outputs[name] = future.result()
+            finally:
+                for future in running:
+                    future.cancel()
+
+        return {name: outputs[name] for name in self.dependencies}
@@ -0,0 +1,331 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from vitacrew.llm_pool import INTERACTIVE, PRIORITIES
+from vitacrew.models import UserInputs
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4
+DEFAULT_QUEUE_SIZE = 64
+# Plan tasks executing at once within each job; see Vitacrew.kickoff_concurrent
+DEFAULT_JOB_CONCURRENCY = 3
+# Sent with 429 responses
+RETRY_AFTER_SECONDS = 5
+# Finished jobs kept for polling; the oldest are forgotten first
+FINISHED_JOBS_KEPT = 1000
+MAX_BODY_BYTES = 64 * 1024
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = {SUCCEEDED, FAILED, CANCELLED}
+
+
+@dataclass
+class PlanJob:
+    """One queued or running plan for a profile."""
+
+    id: str
+    user_inputs: UserInputs
+    priority: int = INTERACTIVE
+    status: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, str]] = None
+    error: Optional[str] = None
+    # Set from the event loop, read by the crew between tasks
+    cancel_requested: threading.Event = field(default_factory=threading.Event)
+
+    def to_dict(self) -> dict:
+        job = {
+            "id": self.id,
+            "name": self.user_inputs.name,
+            "priority": next(name for name, value in PRIORITIES.items() if value == self.priority),
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "cancel_requested": self.cancel_requested.is_set(),
+        }
+        if self.status == SUCCEEDED:
+            job["result"] = self.result
+        if self.error is not None:
+            job["error"] = self.error
+        return job
+
+
+class PlanService:
+    """Runs plan jobs from a bounded queue on a pool of async workers.
+
+    Each worker takes the next queued job and runs its crew on a thread of
+    the service's executor, so the event loop keeps accepting requests while
+    plans execute. Every crew is created from one shared CrewFactory, so
+    tools, configs, caches and the LLM client are built once per process.
+    At most ``queue_size`` jobs wait at a time; further submissions are
+    refused instead of growing the backlog. Cancelling a queued job drops it
+    at once; a running job stops before its next task.
+    """
+
+    def __init__(self, factory=None, workers: int = DEFAULT_WORKERS, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 job_concurrency: int = DEFAULT_JOB_CONCURRENCY,
+                 plan: Optional[Callable[[PlanJob], Dict[str, str]]] = None):
+        if workers < 1 or queue_size < 1:
+            raise ValueError("workers and queue_size must be at least 1")
+        self.factory = factory
+        self.workers = workers
+        self.queue_size = queue_size
+        self.job_concurrency = job_concurrency
+        self.plan = plan or self._run_crew
+        self.jobs: Dict[str, PlanJob] = {}
+        self._finished: Deque[str] = deque()
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued = 0
+        self._running = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _run_crew(self, job: PlanJob) -> Dict[str, str]:
+        """Plans one job with a crew from the shared factory."""
+        vitacrew = self.factory.create(priority=job.priority)
+        vitacrew.collect_user_inputs(job.user_inputs)
+        return vitacrew.kickoff_concurrent(max_concurrency=self.job_concurrency, cancelled=job.cancel_requested)
+
+    def _execute(self, job: PlanJob) -> Tuple[str, Optional[Dict[str, str]], Optional[str]]:
+        """Runs a job on an executor thread; returns its final status, result and error."""
+        try:
+            return SUCCEEDED, self.plan(job), None
+        except CancelledError:
+            # Classified here: asyncio would re-raise it in the worker as its own cancellation
+            return CANCELLED, None, None
+        except Exception as e:
+            return FAILED, None, str(e)
+
+    async def start(self) -> None:
+        if self.factory is None and self.plan == self._run_crew:
+            from vitacrew.crew import CrewFactory  # crewai takes seconds to import; only crew jobs need it
+            self.factory = await asyncio.get_running_loop().run_in_executor(None, CrewFactory)
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="vitacrew-job")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancels every unfinished job and stops the workers once running crews reach a task boundary."""
+        for job in list(self.jobs.values()):
+            if job.status not in FINISHED:
+                self._cancel(job)
+        for _ in self._tasks:
+            self._queue.put_nowait(None)
+        await asyncio.gather(*self._tasks)
+        self._tasks = []
+        if self._executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+            self._executor = None
+
+    def submit(self, user_inputs: UserInputs, priority: int = INTERACTIVE) -> PlanJob:
+        """
+        Queues a plan for a validated profile.
+
+        Jobs start in submission order; ``priority`` orders their LLM calls
+        in the process's LLM pool, ahead of or behind other jobs' calls.
+
+        Raises:
+            asyncio.QueueFull: When ``queue_size`` jobs are already waiting
+        """
+        if self._queued >= self.queue_size:
+            raise asyncio.QueueFull(f"{self._queued} plans are already queued")
+        job = PlanJob(id=uuid.uuid4().hex, user_inputs=user_inputs, priority=priority)
+        self.jobs[job.id] = job
+        self._queued += 1
+        self._queue.put_nowait(job)
+        return job
+
+    def cancel(self, job_id: str) -> Optional[PlanJob]:
+        """Cancels a job unless it already finished; returns None for an unknown id."""
+        job = self.jobs.get(job_id)
+        if job is not None and job.status not in FINISHED:
+            self._cancel(job)
+        return job
+
+    def _cancel(self, job: PlanJob) -> None:
+        job.cancel_requested.set()
+        if job.status == QUEUED:
+            # Its queue entry is skipped when a worker reaches it
+            self._queued -= 1
+            self._finish(job, CANCELLED)
+
+    def _finish(self, job: PlanJob, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        self._finished.append(job.id)
+        while len(self._finished) > FINISHED_JOBS_KEPT:
+            self.jobs.pop(self._finished.popleft(), None)
+
+    def stats(self) -> dict:
+        stats = {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "queued": self._queued,
+            "running": self._running,
+        }
+        pool = getattr(self.factory, "pool", None)
+        if pool is not None:
+            stats["llm"] = pool.stats()
+        in_flight = getattr(self.factory, "in_flight", None)
+        if in_flight is not None:
+            stats["single_flight"] = in_flight.stats
+        return stats
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            if job is None:
+                return
+            if job.status != QUEUED:
+                continue
+            self._queued -= 1
+            self._running += 1
+            job.status = RUNNING
+            job.started_at = time.time()
+            try:
+                status, job.result, job.error = await loop.run_in_executor(self._executor, self._execute, job)
+            finally:
+                self._running -= 1
+            self._finish(job, status)
+
+
+def _error(status: HTTPStatus, message: str, **extra) -> Tuple[HTTPStatus, dict]:
+    return status, {"error": message, **extra}
+
+
+async def respond(service: PlanService, method: str, path: str, body: bytes) -> Tuple[HTTPStatus, dict]:
+    """
+    Routes one request to the service.
+
+    POST /plans queues a plan for a UserInputs JSON body (202, or 429 when
+    the queue is full), at ``?priority=batch`` for bulk work; GET /plans/<id> returns a job's status and, once it
+    succeeded, its task outputs; DELETE /plans/<id> cancels it; GET /health
+    reports queue and worker usage.
+
+    Returns:
+        Tuple[HTTPStatus, dict]: Response status and JSON body
+    """
+    path, _, query = path.partition("?")
+    parts = [part for part in path.split("/") if part]
+    if parts == ["health"]:
+        if method != "GET":
+            return _error(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed")
+        return HTTPStatus.OK, service.stats()
+    if parts == ["plans"]:
+        if method != "POST":
+            return _error(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed")
+        try:
+            user_inputs = UserInputs.model_validate_json(body)
+        except ValidationError as e:
+            errors = e.errors(include_url=False, include_context=False, include_input=False)
+            return _error(HTTPStatus.UNPROCESSABLE_ENTITY, "Invalid profile", details=errors)
+        params = dict(param.partition("=")[::2] for param in query.split("&") if param)
+        priority = params.get("priority", "interactive")
+        if priority not in PRIORITIES:
+            return _error(HTTPStatus.BAD_REQUEST, f"Unknown priority '{priority}'. Known: {list(PRIORITIES)}")
+        try:
+            job = service.submit(user_inputs, PRIORITIES[priority])
+        except asyncio.QueueFull as e:
+            return _error(HTTPStatus.TOO_MANY_REQUESTS, str(e), retry_after=RETRY_AFTER_SECONDS)
+        return HTTPStatus.ACCEPTED, job.to_dict()
+    if len(parts) == 2 and parts[0] == "plans":
+        if method == "GET":
+            job = service.jobs.get(parts[1])
+        elif method == "DELETE":
+            job = service.cancel(parts[1])
+        else:
+            return _error(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed")
+        if job is None:
+            return _error(HTTPStatus.NOT_FOUND, f"No plan '{parts[1]}'")
+        return HTTPStatus.OK, job.to_dict()
+    return _error(HTTPStatus.NOT_FOUND, f"No route for {path}")
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+    request_line = (await reader.readline()).decode("latin-1").split()
+    if len(request_line) != 3:
+        raise ValueError("Malformed request line")
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY_BYTES:
+        raise ValueError(f"Body over {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return request_line[0].upper(), request_line[1], body
+
+
+async def handle_connection(service: PlanService, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+    """Serves one HTTP/1.1 request per connection with a JSON response."""
+    try:
+        try:
+            method, path, body = await _read_request(reader)
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            status, payload = _error(HTTPStatus.BAD_REQUEST, str(e))
+        else:
+            status, payload = await respond(service, method, path, body)
+        content = json.dumps(payload, default=str).encode()
+        headers = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(content)}",
+            "Connection: close",
+        ]
+        if status == HTTPStatus.TOO_MANY_REQUESTS:
+            headers.append(f"Retry-After: {RETRY_AFTER_SECONDS}")
+        if status == HTTPStatus.ACCEPTED:
+            headers.append(f"Location: /plans/{payload['id']}")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + content)
+        await writer.drain()
+    except ConnectionError:
+        pass  # Client went away
+    finally:
+        writer.close()
+
+
+async def serve(service: PlanService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+    """Starts the service's workers and an HTTP server for it; port 0 picks a free port."""
+    await service.start()
+    return await asyncio.start_server(
+        lambda reader, writer: handle_connection(service, reader, writer), host, port
+    )
+
+
+def run_service(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = DEFAULT_WORKERS,
+                queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+    """Serves plans over HTTP until interrupted."""
+    async def main() -> None:
+        service = PlanService(workers=workers, queue_size=queue_size)
+        server = await serve(service, host, port)
+        print(f"Serving plans on http://{host}:{port} ({workers} workers, queue of {queue_size})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await service.stop()
+
+    asyncio.run(main())
@@ -0,0 +1,8 @@
+import pytest
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep on-disk stores created during tests out of the user's cache directory."""
+    monkeypatch.setenv("VITACREW_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("VITACREW_KNOWLEDGE_DIR", str(tmp_path / "knowledge"))
+    return tmp_path / "cache"
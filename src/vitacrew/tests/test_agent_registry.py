@@ -0,0 +1,56 @@
+from unittest.mock import Mock, patch
+
+from crewai import Agent, Task
+
+from ..crew import AGENT_TOOLS, Vitacrew
+
+@patch("vitacrew.crew.Agent", wraps=Agent)
+def test_each_agent_is_built_once_for_the_full_crew(agent_class):
+    vitacrew = Vitacrew()
+    tasks = [getattr(vitacrew, name)() for name in vitacrew.task_dependencies()]
+    for agent_name in AGENT_TOOLS:
+        getattr(vitacrew, agent_name)()
+
+    assert agent_class.call_count == len(AGENT_TOOLS)
+    assert tasks[0].agent is tasks[1].agent is vitacrew.personal_trainer()
+
+def test_tasks_naming_the_same_agent_share_it():
+    vitacrew = Vitacrew()
+    assert vitacrew.create_meal_plan().agent is vitacrew.generate_grocery_list().agent
+    assert vitacrew.agent_for("nutritionist") is vitacrew.agent_for("nutritionist")
+    assert vitacrew.agent_for("nutritionist") is not vitacrew.agent_for("beauty_specialist")
+
+def test_agents_are_not_shared_between_crews():
+    assert Vitacrew().agent_for("nutritionist") is not Vitacrew().agent_for("nutritionist")
+
+def test_invalidation_rebuilds_agents():
+    vitacrew = Vitacrew()
+    trainer, nutritionist = vitacrew.agent_for("personal_trainer"), vitacrew.agent_for("nutritionist")
+
+    vitacrew.invalidate_agents("personal_trainer")
+    assert vitacrew.agent_for("personal_trainer") is not trainer
+    assert vitacrew.agent_for("nutritionist") is nutritionist
+
+    vitacrew.invalidate_agents()
+    assert vitacrew.agent_for("nutritionist") is not nutritionist
+
+def test_config_change_rebuilds_agent():
+    vitacrew = Vitacrew()
+    before = vitacrew.agent_for("beauty_specialist")
+    vitacrew.agents_config["beauty_specialist"]["goal"] = "Recommend fragrance-free products"
+    after = vitacrew.agent_for("beauty_specialist")
+    assert after is not before
+    assert after.goal == "Recommend fragrance-free products"
+
+def test_execution_uses_the_current_agent():
+    vitacrew = Vitacrew()
+    vitacrew.response_cache = None
+    task = vitacrew.analyze_fitness()
+    vitacrew.invalidate_agents("personal_trainer")
+    execute = Mock(return_value=Mock(raw="report"))
+
+    with patch.object(Task, "execute_sync", execute):
+        vitacrew.run_single_task("analyze_fitness")
+
+    assert execute.call_args.kwargs["agent"] is vitacrew.agent_for("personal_trainer")
+    assert execute.call_args.kwargs["agent"] is not task.agent
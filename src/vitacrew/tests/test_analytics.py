@@ -0,0 +1,111 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from ..analytics import HealthAnalytics, MetricStats
+from ..crew import CrewFactory, Vitacrew
+from ..fake_llm import FakeLLM
+from ..progress import ProgressStore
+from ..tools.custom_tool import HealthAnalyticsTool
+from .test_tasks import mock_user_inputs  # noqa: F401 (fixture)
+
+def days(count, start=date(2024, 1, 1)):
+    return [(start + timedelta(days=i)).isoformat() for i in range(count)]
+
+@pytest.fixture
+def store(tmp_path):
+    return ProgressStore(tmp_path / "progress.db")
+
+def test_metric_stats_match_batch_computation():
+    rng = np.random.default_rng(0)
+    values = rng.normal(70, 2, 60) - 0.1 * np.arange(60)
+    stats = MetricStats(window=7)
+    for day, value in zip(days(60), values.tolist()):
+        stats.add(day, value)
+
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.std == pytest.approx(values.std(ddof=1))
+    assert stats.rolling_mean == pytest.approx(values[-7:].mean())
+    assert stats.slope == pytest.approx(np.polyfit(np.arange(60), values, 1)[0])
+
+def test_level_shift_is_reported_as_change_point():
+    stats = MetricStats()
+    values = [7.0, 7.2, 6.9, 7.1, 7.0, 6.8, 7.1, 7.0, 5.0, 5.1, 4.9, 5.0, 5.2]
+    for day, value in zip(days(len(values)), values):
+        stats.add(day, value)
+    assert [point["direction"] for point in stats.change_points] == ["down"]
+    assert stats.change_points[0]["date"] >= "2024-01-09"
+
+def test_summary_loads_history_once_then_updates_incrementally(store):
+    sleep = [6.0, 7.0, 8.0, 5.0, 9.0, 6.5, 7.5]
+    store.ingest(("jane", "sleep_hours", day, value) for day, value in zip(days(7), sleep))
+    store.ingest(("jane", "skin_score", day, 2 * value + 1) for day, value in zip(days(7), sleep))
+    analytics = HealthAnalytics(store)
+
+    summary = analytics.summary("jane")
+    assert summary["metrics"]["sleep_hours"]["count"] == 7
+    [correlation] = summary["correlations"]
+    assert correlation["metrics"] == ["skin_score", "sleep_hours"]
+    assert correlation["r"] == pytest.approx(1.0)
+
+    with patch.object(store, "query", wraps=store.query) as query:
+        store.record("jane", "sleep_hours", "2024-01-08", 8.0)
+        assert analytics.summary("jane")["metrics"]["sleep_hours"]["count"] == 8
+    query.assert_not_called()
+
+def test_measurement_loaded_with_history_is_not_counted_again(store):
+    store.record("jane", "weight", "2024-01-01", 70.0)
+    analytics = HealthAnalytics(store)
+    assert analytics.summary("jane")["metrics"]["weight"]["count"] == 1
+
+    # The listener of a write committed while the history was read fires late
+    [(row_id, *_)] = store.history("jane")
+    analytics._on_measurement(row_id, "jane", "weight", "2024-01-01", 70.0)
+    assert analytics.summary("jane")["metrics"]["weight"]["count"] == 1
+
+def test_backdated_measurement_matches_a_fresh_load(store):
+    values = [7.0, 7.2, 6.9, 7.1, 7.0, 6.8, 7.1, 7.0, 5.0, 5.1, 4.9]
+    store.ingest(("jane", "sleep_hours", day, value) for day, value in zip(days(len(values))[1:], values[1:]))
+    store.ingest(("jane", "skin_score", day, value) for day, value in zip(days(len(values)), values))
+    analytics = HealthAnalytics(store)
+    analytics.summary("jane")
+
+    store.record("jane", "sleep_hours", days(1)[0], values[0])
+
+    assert analytics.summary("jane") == HealthAnalytics(store).summary("jane")
+    assert analytics.summary("jane")["metrics"]["sleep_hours"]["last_date"] == days(len(values))[-1]
+
+def test_tool_summarizes_selected_metrics(store):
+    store.record("jane", "weight", "2024-01-01", 70.0)
+    store.record("jane", "sleep_hours", "2024-01-01", 7.0)
+    tool = HealthAnalyticsTool(analytics=HealthAnalytics(store), user="jane")
+    result = tool._run(metric_types=["weight"])
+    assert list(result["metrics"]) == ["weight"]
+    assert result["correlations"] == []
+
+def test_tool_does_not_read_another_users_metrics(store):
+    store.record("john", "weight", "2024-01-01", 90.0)
+    tool = HealthAnalyticsTool(analytics=HealthAnalytics(store), user="jane")
+    with pytest.raises(TypeError):
+        tool.run(user="john")
+    assert tool.run()["metrics"] == {}
+
+def test_analyze_data_context_carries_metric_summary():
+    vitacrew = Vitacrew()
+    vitacrew.user_data = {"name": "Jane"}
+    vitacrew.tools["progress_tracker"].store.record("Jane", "weight", "2024-01-01", 70.0)
+    context = vitacrew.task_context("analyze_data")
+    assert '"weight"' in context
+    assert '"count": 1' in context
+
+def test_crew_tools_track_and_analyze_the_same_user(mock_user_inputs):
+    vitacrew = CrewFactory(llm=FakeLLM()).create()
+    vitacrew.collect_user_inputs(mock_user_inputs.model_copy(update={"name": "Jane"}))
+
+    vitacrew.tools["progress_tracker"].run(metric_type="weight", value=70.0, date="2024-01-01")
+    result = vitacrew.tools["health_analytics"].run()
+
+    assert result["user"] == "Jane"
+    assert result["metrics"]["weight"]["count"] == 1
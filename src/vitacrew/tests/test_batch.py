@@ -0,0 +1,137 @@
+import csv
+import json
+from unittest.mock import patch
+
+import pytest
+
+from ..batch import iter_records, offset_path, plan_record, run_batch, worker_factory
+from ..llm_pool import BATCH
+
+PROFILE = {
+    "name": "Test User",
+    "age": 30,
+    "gender": "male",
+    "height": 175.0,
+    "weight": 70.0,
+    "waist_circumference": 80.0,
+    "hip_circumference": 90.0,
+    "fitness_objectives": ["weight loss", "muscle gain"],
+    "dietary_requirements": ["vegetarian"],
+    "skin_type": "normal",
+    "skin_concerns": ["acne"],
+    "sleep_hours": 7.5,
+    "stress_level": "moderate",
+    "activity_level": "moderate",
+}
+
+def fake_plan(index, record):
+    """Stands in for plan_record; must be importable by worker processes."""
+    if record["name"] == "bad":
+        return {"index": index, "error": "invalid profile"}
+    return {"index": index, "name": record["name"], "plan": {"analyze_fitness": "ok"}}
+
+@pytest.fixture
+def jsonl_input(tmp_path):
+    path = tmp_path / "profiles.jsonl"
+    with open(path, "w") as file:
+        for i in range(10):
+            file.write(json.dumps({**PROFILE, "name": "bad" if i == 3 else f"user {i}"}) + "\n")
+    return path
+
+def read_results(path):
+    with open(path) as file:
+        return [json.loads(line) for line in file]
+
+def test_iter_records_parses_csv_list_columns(tmp_path):
+    path = tmp_path / "profiles.csv"
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(PROFILE))
+        writer.writeheader()
+        writer.writerow({**PROFILE, "fitness_objectives": "weight loss; muscle gain", "skin_concerns": ""})
+
+    [(index, record)] = list(iter_records(path))
+    assert index == 0
+    assert record["fitness_objectives"] == ["weight loss", "muscle gain"]
+    assert record["skin_concerns"] == []
+
+def test_run_batch_reports_unreadable_records_and_keeps_going(tmp_path):
+    path = tmp_path / "profiles.jsonl"
+    with open(path, "w") as file:
+        file.write(json.dumps({**PROFILE, "name": "user 0"}) + "\n")
+        file.write('{"name": "user 1", "age":\n')
+        file.write(json.dumps({**PROFILE, "name": "user 2"}) + "\n")
+    output = tmp_path / "plans.jsonl"
+
+    counts = run_batch(path, output, workers=2, plan=fake_plan)
+
+    assert counts == {"planned": 2, "failed": 1, "skipped": 0}
+    results = {result["index"]: result for result in read_results(output)}
+    assert sorted(results) == [0, 1, 2]
+    assert results[1]["error"].startswith("Invalid JSON")
+    assert json.loads(offset_path(output).read_text()) == {"offset": 3}
+
+def test_iter_records_flags_short_csv_rows(tmp_path):
+    path = tmp_path / "profiles.csv"
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(list(PROFILE))
+        writer.writerow(["Short Row", 30])
+        writer.writerow([";".join(value) if isinstance(value, list) else value for value in PROFILE.values()])
+
+    (short_index, short), (index, record) = iter_records(path)
+    assert short_index == 0
+    assert short.error == f"Row has 2 of {len(PROFILE)} columns"
+    assert index == 1
+    assert record["fitness_objectives"] == PROFILE["fitness_objectives"]
+
+def test_run_batch_writes_every_record(jsonl_input, tmp_path):
+    output = tmp_path / "plans.jsonl"
+    counts = run_batch(jsonl_input, output, workers=2, max_pending=3, plan=fake_plan)
+
+    assert counts == {"planned": 9, "failed": 1, "skipped": 0}
+    results = read_results(output)
+    assert sorted(result["index"] for result in results) == list(range(10))
+    assert json.loads(offset_path(output).read_text()) == {"offset": 10}
+
+def test_run_batch_resumes_from_offset(jsonl_input, tmp_path):
+    output = tmp_path / "plans.jsonl"
+    # Simulate an interrupted run: 0-3 committed, 5 finished out of order
+    with open(output, "w") as file:
+        for index in (0, 1, 2, 3, 5):
+            file.write(json.dumps(fake_plan(index, {"name": f"user {index}"})) + "\n")
+    offset_path(output).write_text(json.dumps({"offset": 4}))
+
+    counts = run_batch(jsonl_input, output, workers=2, plan=fake_plan)
+
+    assert counts["skipped"] == 5
+    assert counts["planned"] == 5
+    assert sorted(result["index"] for result in read_results(output)) == list(range(10))
+    assert json.loads(offset_path(output).read_text()) == {"offset": 10}
+
+def test_run_batch_drops_a_partial_last_line_before_resuming(jsonl_input, tmp_path):
+    output = tmp_path / "plans.jsonl"
+    with open(output, "w") as file:
+        file.write(json.dumps(fake_plan(0, {"name": "user 0"})) + "\n")
+        file.write('{"index": 1, "name": "us')  # Interrupted mid-write
+    offset_path(output).write_text(json.dumps({"offset": 1}))
+
+    counts = run_batch(jsonl_input, output, workers=2, plan=fake_plan)
+
+    assert counts["skipped"] == 1
+    assert sorted(result["index"] for result in read_results(output)) == list(range(10))
+
+def test_plan_record_shares_one_factory_per_process():
+    worker_factory.cache_clear()
+    with patch("vitacrew.crew.CrewFactory") as factory_class:
+        plan_record(0, PROFILE)
+        plan_record(1, PROFILE)
+    worker_factory.cache_clear()
+
+    factory_class.assert_called_once_with()
+    assert factory_class.return_value.create.call_count == 2
+    factory_class.return_value.create.assert_called_with(priority=BATCH)
+
+def test_plan_record_reports_validation_errors():
+    result = plan_record(7, {**PROFILE, "age": 5})
+    assert result["index"] == 7
+    assert "age" in result["error"]
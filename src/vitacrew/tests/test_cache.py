@@ -0,0 +1,143 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+from crewai import Task
+
+from ..cache import ResponseCache, SingleFlight
+from ..crew import CrewFactory, Vitacrew
+from ..fake_llm import FakeLLM
+from .test_tasks import mock_user_inputs  # noqa: F401 (fixture)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return ResponseCache(tmp_path / "responses.db", max_entries=3, ttl_seconds=60, clock=clock)
+
+def test_key_is_content_addressed():
+    key = ResponseCache.make_key(model="m", description="d", context=["a", "b"])
+    assert key == ResponseCache.make_key(context=["a", "b"], description="d", model="m")
+    assert key != ResponseCache.make_key(model="other", description="d", context=["a", "b"])
+
+def test_hit_and_miss_counters(cache):
+    assert cache.get("k") is None
+    cache.put("k", "response")
+    assert cache.get("k") == "response"
+    assert cache.stats == {"hits": 1, "misses": 1, "evictions": 0, "entries": 1}
+
+def test_entries_survive_restart(tmp_path, cache, clock):
+    cache.put("k", "response")
+    reopened = ResponseCache(tmp_path / "responses.db", clock=clock)
+    assert reopened.get("k") == "response"
+
+def test_least_recently_used_entries_are_evicted(cache, clock):
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+        clock.now += 1
+    cache.get("a")
+    clock.now += 1
+    cache.put("d", "d")
+
+    assert cache.stats["evictions"] == 1
+    assert cache.get("b") is None
+    assert cache.get("a") == "a"
+    assert len(cache) == 3
+
+def test_expired_entries_are_misses(cache, clock):
+    cache.put("k", "response")
+    clock.now += 61
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+def test_vitacrew_reuses_cached_task_response():
+    vitacrew = Vitacrew()
+    execute = Mock(return_value=Mock(raw="fitness report"))
+
+    with patch.object(Task, "execute_sync", execute):
+        first = vitacrew.run_single_task("analyze_fitness")
+        second = vitacrew.run_single_task("analyze_fitness")
+
+    assert execute.call_count == 1
+    assert first.raw == second.raw == "fitness report"
+    assert vitacrew.response_cache.stats["hits"] == 1
+
+def test_tasks_can_opt_out_of_caching():
+    vitacrew = Vitacrew()
+    vitacrew.task_config("analyze_fitness")["cache"] = False
+    execute = Mock(return_value=Mock(raw="fitness report"))
+
+    with patch.object(Task, "execute_sync", execute):
+        vitacrew.run_single_task("analyze_fitness")
+        vitacrew.run_single_task("analyze_fitness")
+
+    assert execute.call_count == 2
+
+def test_responses_are_not_shared_across_models():
+    model_a = CrewFactory(llm=FakeLLM(model="model-a", default_response="FROM MODEL A")).create()
+    model_b = CrewFactory(llm=FakeLLM(model="model-b", default_response="FROM MODEL B")).create()
+
+    assert model_a.run_single_task("analyze_fitness").raw == "FROM MODEL A"
+    assert model_b.run_single_task("analyze_fitness").raw == "FROM MODEL B"
+    assert model_b.response_cache.stats["hits"] == 0
+    assert model_a.run_single_task("analyze_fitness").raw == "FROM MODEL A"
+
+def test_single_flight_shares_an_execution_in_flight():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "report"
+
+    with ThreadPoolExecutor(4) as pool:
+        leader = pool.submit(flight.run, "k", slow)
+        started.wait(5)
+        followers = [pool.submit(flight.run, "k", slow) for _ in range(3)]
+        while flight.stats["saved"] < 3:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [follower.result() for follower in followers]
+
+    assert results == [("report", False)] + [("report", True)] * 3
+    assert len(calls) == 1
+    assert flight.stats == {"executions": 1, "saved": 3, "in_flight": 0}
+    assert flight.run("k", lambda: "again") == ("again", False)  # nothing in flight any more
+
+def test_single_flight_shares_failures_and_forgets_them():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.run("k", lambda: int("x"))
+    assert flight.run("k", lambda: 1) == (1, False)
+
+def test_concurrent_identical_crews_run_each_task_once(mock_user_inputs):
+    llm = FakeLLM(latency=0.1)
+    factory = CrewFactory(llm=llm)
+    factory.response_cache = None
+    factory.checkpoints = None
+    crews = [factory.create() for _ in range(3)]
+    for crew in crews:
+        crew.collect_user_inputs(mock_user_inputs)
+
+    with ThreadPoolExecutor(len(crews)) as pool:
+        outputs = list(pool.map(lambda crew: crew.kickoff_concurrent(), crews))
+
+    assert outputs[0] == outputs[1] == outputs[2]
+    executed = len(outputs[0]) - 1  # format_plans is rendered locally
+    assert llm.calls == executed
+    assert factory.in_flight.stats["saved"] == 2 * executed
+    assert sum(len(crew.shared_tasks) for crew in crews) == 2 * executed
@@ -0,0 +1,96 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from crewai import Task
+
+from ..checkpoint import CheckpointStore
+from ..crew import CrewFactory, Vitacrew
+from ..fake_llm import FakeLLM
+from .test_cache import FakeClock
+from .test_tasks import mock_user_inputs  # noqa: F401 (fixture)
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def store(tmp_path, clock):
+    return CheckpointStore(tmp_path / "checkpoints.db", max_entries=3, ttl_seconds=60,
+                           gc_interval=2, clock=clock)
+
+def test_checkpoints_survive_restart(tmp_path, store, clock):
+    store.put("f1", "assess_skin", "skin report")
+    reopened = CheckpointStore(tmp_path / "checkpoints.db", clock=clock)
+    assert reopened.get("f1") == "skin report"
+    assert reopened.load({"assess_skin": "f1", "design_routine": "f2"}) == {"assess_skin": "skin report"}
+
+def test_expired_checkpoints_are_misses_and_collected(store, clock):
+    store.put("old", "assess_skin", "old report")
+    clock.now += 61
+    assert store.get("old") is None
+    assert store.gc() == 1
+    assert len(store) == 0
+
+def test_gc_keeps_the_most_recently_used(store, clock):
+    for fingerprint in ("a", "b", "c"):
+        store.put(fingerprint, "task", fingerprint)
+        clock.now += 1
+    store.get("a")
+    clock.now += 1
+    store.put("d", "task", "d")  # Fourth write triggers gc (every 2 writes)
+
+    assert len(store) == 3
+    assert store.get("b") is None
+    assert store.get("a") == "a"
+    assert store.stats["collected"] == 1
+
+def test_failed_run_resumes_from_first_missing_task(mock_user_inputs):
+    executed = []
+
+    def fake_execute(task, agent=None, context=None, tools=None):
+        executed.append(task.name)
+        if task.name == "create_visuals":
+            raise RuntimeError("rate limited")
+        return Mock(raw=f"{task.name} output")
+
+    first = Vitacrew()
+    first.collect_user_inputs(mock_user_inputs)
+    with patch.object(Task, "execute_sync", autospec=True, side_effect=fake_execute):
+        with pytest.raises(RuntimeError, match="rate limited"):
+            first.kickoff_concurrent(max_concurrency=1)
+
+        # A fresh crew (e.g. after a restart) picks up the checkpoints
+        executed.clear()
+        resumed = Vitacrew()
+        resumed.response_cache = None
+        resumed.collect_user_inputs(mock_user_inputs)
+        with pytest.raises(RuntimeError):
+            resumed.kickoff_concurrent()
+
+    assert executed == ["create_visuals"]
+    assert "create_visuals" not in resumed.reused_tasks
+    assert len(resumed.reused_tasks) == len(resumed.task_dependencies()) - 1
+
+def test_invalidated_outputs_lose_their_checkpoints(mock_user_inputs):
+    vitacrew = Vitacrew()
+    vitacrew.collect_user_inputs(mock_user_inputs)
+    with patch.object(Task, "execute_sync", return_value=Mock(raw="output")):
+        vitacrew.kickoff_concurrent()
+    entries = len(vitacrew.checkpoints)
+
+    vitacrew.invalidate_outputs("assess_skin")
+
+    assert len(vitacrew.checkpoints) == entries - 1
+    assert "assess_skin" not in vitacrew.task_outputs
+
+def test_switching_models_reexecutes_instead_of_resuming(mock_user_inputs):
+    model_a = CrewFactory(llm=FakeLLM(model="model-a", default_response="FROM MODEL A")).create()
+    model_a.collect_user_inputs(mock_user_inputs)
+    model_a.kickoff_concurrent()
+
+    model_b = CrewFactory(llm=FakeLLM(model="model-b", default_response="FROM MODEL B")).create()
+    model_b.collect_user_inputs(mock_user_inputs)
+    model_b.kickoff_concurrent()
+
+    assert not model_b.reused_tasks
+    assert model_b.task_outputs["analyze_fitness"] == "FROM MODEL B"
@@ -0,0 +1,62 @@
+from ..context import MIN_SECTION_TOKENS, TRUNCATION_MARKER, ContextBuilder, estimate_tokens
+from ..crew import Vitacrew
+from .test_tasks import mock_user_inputs  # noqa: F401 (fixture)
+
+def test_profile_fields_are_deduplicated_across_sections():
+    builder = ContextBuilder("create_meal_plan")
+    builder.add("profile", "Weight: 70 kg\nAge: 30", 100, deduplicate=True)
+    builder.add("health_metrics", "Weight: 70 kg\nSets: 3\nSets: 3", 90, deduplicate=True)
+    context, report = builder.build()
+
+    assert context.count("Weight: 70 kg") == 1
+    assert context.count("Sets: 3") == 2  # Repeats within one section are kept
+    assert report.deduplicated_lines == 1
+
+def test_upstream_and_knowledge_text_is_left_alone():
+    builder = ContextBuilder("design_routine")
+    builder.add("profile", "Skin Type: dry\nAge: 30", 100, deduplicate=True)
+    builder.add("knowledge", "Skin Type: dry skin needs ceramides", 60)
+    builder.add("assess_skin", "## Output of assess_skin\nSkin Type: dry\nAge: 30", 50)
+    context, report = builder.build()
+
+    assert context.count("Skin Type: dry\n") == 2
+    assert context.count("Age: 30") == 2
+    assert report.deduplicated_lines == 0
+
+def test_lowest_priority_sections_are_trimmed_first():
+    builder = ContextBuilder("generate_report", budget=300)
+    builder.add("profile", "Fitness Objectives: strength", 100)
+    builder.add("analyze_data", "insight " * 200, 50)
+    builder.add("design_routine", "routine " * 200, 50)
+    context, report = builder.build()
+
+    assert report.context_tokens <= 300
+    assert not report.over_budget
+    # At equal priority the later section goes first
+    assert report.dropped == ["design_routine"]
+    assert report.trimmed == ["analyze_data"]
+    assert context.startswith("Fitness Objectives: strength")
+    assert context.endswith(TRUNCATION_MARKER)
+    assert report.sections["profile"] == estimate_tokens("Fitness Objectives: strength")
+
+def test_sections_too_small_to_keep_are_dropped():
+    builder = ContextBuilder("task", budget=MIN_SECTION_TOKENS)
+    builder.add("profile", "Age: 30", 100)
+    builder.add("upstream", "word " * 100, 50)
+    context, report = builder.build()
+    assert context == "Age: 30"
+    assert report.dropped == ["upstream"]
+
+def test_crew_context_uses_task_config_and_records_size(mock_user_inputs):
+    vitacrew = Vitacrew()
+    vitacrew.collect_user_inputs(mock_user_inputs)
+    context = vitacrew.build_context("design_routine", {"assess_skin": "Skin Type: normal\n" + "detail " * 4000})
+
+    assert "Skin Type: normal" in context
+    assert "Stress Level: moderate" in context
+    assert "Calorie target" not in context  # Not a metrics agent
+    report = vitacrew.context_reports["design_routine"]
+    assert report.budget == vitacrew.task_config("design_routine")["context_budget"]
+    assert report.context_tokens <= report.budget
+    assert report.trimmed == ["assess_skin"]
+    assert report.prompt_tokens > report.context_tokens
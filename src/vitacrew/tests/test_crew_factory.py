@@ -0,0 +1,33 @@
+from unittest.mock import patch
+
+import yaml
+
+from ..crew import CrewFactory, Vitacrew
+
+def test_crews_share_tools_and_cache():
+    factory = CrewFactory()
+    first, second = factory.create(), factory.create()
+    assert first is not second
+    assert first.tools["bmr_calculator"] is second.tools["bmr_calculator"]
+    assert first.response_cache is second.response_cache
+
+def test_configs_are_parsed_once_and_copied_per_crew():
+    factory = CrewFactory()
+    with patch("vitacrew.crew.yaml.safe_load", wraps=yaml.safe_load) as safe_load:
+        first = factory.create()
+        second = factory.create()
+
+    assert safe_load.call_count == 2  # agents.yaml and tasks.yaml, once each
+    assert first.tasks_config == second.tasks_config
+    first.task_config("analyze_fitness")["cache"] = False
+    assert "cache" not in second.task_config("analyze_fitness")
+
+def test_per_user_state_stays_per_crew():
+    factory = CrewFactory()
+    first, second = factory.create(), factory.create()
+    first.user_data["name"] = "Jane"
+    assert second.user_data == {}
+    assert first.analyze_fitness() is not second.analyze_fitness()
+
+def test_standalone_crew_builds_its_own_factory():
+    assert isinstance(Vitacrew().factory, CrewFactory)
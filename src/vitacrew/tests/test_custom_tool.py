@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from ..crew import Gender
+from ..tools.custom_tool import BMRCalculator, MacroCalculator
+
+@pytest.fixture
+def cohort():
+    rng = np.random.default_rng(42)
+    size = 5000
+    return {
+        "weight": np.round(rng.uniform(30, 300, size), 1),
+        "height": np.round(rng.uniform(100, 250, size), 1),
+        "age": rng.integers(18, 120, size),
+        "gender": rng.choice(["male", "Female", "other", "MALE"], size),
+        "calories": np.round(rng.uniform(1200, 4000, size)),
+        "goal": rng.choice(["maintenance", "Bulking", "cutting", "unknown"], size),
+    }
+
+def test_bmr_batch_matches_scalar_tool(cohort):
+    tool = BMRCalculator()
+    batch = BMRCalculator.calculate_batch(cohort["weight"], cohort["height"], cohort["age"], cohort["gender"])
+    scalar = [
+        tool._run(weight=w, height=h, age=a, gender=g)
+        for w, h, a, g in zip(cohort["weight"].tolist(), cohort["height"].tolist(),
+                              cohort["age"].tolist(), cohort["gender"].tolist())
+    ]
+    assert batch.tolist() == scalar
+
+def test_macro_batch_matches_scalar_tool(cohort):
+    tool = MacroCalculator()
+    batch = MacroCalculator.calculate_batch(cohort["calories"], cohort["goal"])
+    for i, (calories, goal) in enumerate(zip(cohort["calories"].tolist(), cohort["goal"].tolist())):
+        expected = tool._run(calories=calories, goal=goal)
+        assert {macro: batch[macro][i] for macro in expected} == expected
+
+def test_bmr_batch_accepts_gender_enums():
+    batch = BMRCalculator.calculate_batch([70.0, 60.0], [175.0, 165.0], [30, 30], [Gender.MALE, Gender.FEMALE])
+    assert batch.tolist() == [
+        BMRCalculator()._run(weight=70.0, height=175.0, age=30, gender="male"),
+        BMRCalculator()._run(weight=60.0, height=165.0, age=30, gender="female"),
+    ]
+
+def test_bmr_batch_maps_enum_arrays_and_rejects_stringified_ones():
+    enums = np.array([Gender.MALE, Gender.FEMALE], dtype=object)
+    batch = BMRCalculator.calculate_batch([70.0, 60.0], [175.0, 165.0], [30, 30], enums)
+    assert batch.tolist() == BMRCalculator.calculate_batch([70.0, 60.0], [175.0, 165.0], [30, 30],
+                                                          ["male", "female"]).tolist()
+
+    with pytest.raises(ValueError, match="Unknown genders"):
+        BMRCalculator.calculate_batch([70.0], [175.0], [30], np.array([str(Gender.MALE)]))
@@ -0,0 +1,65 @@
+from unittest.mock import Mock, patch
+
+from crewai import Task
+from crewai.events import LLMStreamChunkEvent, crewai_event_bus
+
+from ..crew import CrewFactory, Vitacrew
+from ..events import TASK_FINISHED, TASK_STARTED, TOKEN, EventStream, unwatch_tasks, watch_tasks
+from ..fake_llm import FakeLLM
+from .test_tasks import mock_user_inputs  # noqa: F401 (fixture)
+
+def test_drain_returns_events_in_order_without_blocking():
+    stream = EventStream()
+    assert stream.drain() == []
+    stream.emit(TASK_STARTED, "assess_skin")
+    stream.emit(TOKEN, "assess_skin", text="Dry")
+    events = stream.drain()
+    assert [(e.kind, e.task) for e in events] == [(TASK_STARTED, "assess_skin"), (TOKEN, "assess_skin")]
+    assert events[1].data == {"text": "Dry"}
+    assert stream.drain() == []
+
+def test_stream_chunks_are_routed_to_the_watching_stream():
+    vitacrew = Vitacrew()
+    task = vitacrew.analyze_fitness()
+    stream = EventStream()
+    watch_tasks(stream, {"analyze_fitness": task})
+    try:
+        crewai_event_bus.emit(None, LLMStreamChunkEvent(chunk="Hello", task_id=str(task.id)))
+        crewai_event_bus.emit(None, LLMStreamChunkEvent(chunk="Ignored", task_id="another-task"))
+    finally:
+        unwatch_tasks([task])
+
+    tokens = [e for e in stream.drain() if e.kind == TOKEN]
+    assert [(e.task, e.data["text"]) for e in tokens] == [("analyze_fitness", "Hello")]
+
+def test_kickoff_concurrent_reports_task_progress():
+    vitacrew = Vitacrew()
+    vitacrew.user_data = {"skin_type": "dry", "skin_concerns": [], "age": 30,
+                          "stress_level": "low", "sleep_hours": 8}
+    stream = EventStream()
+    execute = Mock(return_value=Mock(raw="output"))
+
+    with patch.object(Task, "execute_sync", execute):
+        vitacrew.kickoff_concurrent(events=stream)
+
+    events = stream.drain()
+    names = list(vitacrew.task_dependencies())
+    assert sorted(e.task for e in events if e.kind == TASK_STARTED) == sorted(names)
+    finished = [e for e in events if e.kind == TASK_FINISHED]
+    assert sorted(e.task for e in finished) == sorted(names)
+    assert all(e.data["output"] == "output" for e in finished if e.task != "format_plans")
+    assert "<!DOCTYPE html>" in next(e for e in finished if e.task == "format_plans").data["output"]
+
+def test_streaming_is_enabled_for_the_reporting_run_only(mock_user_inputs):
+    llm = FakeLLM()
+    factory = CrewFactory(llm=llm)
+    streaming, other = factory.create(), factory.create()
+    streaming.collect_user_inputs(mock_user_inputs)
+    stream = EventStream()
+
+    streaming.kickoff_concurrent(events=stream)
+
+    assert any(e.kind == TOKEN for e in stream.drain())
+    assert llm.stream is False
+    assert streaming.agent_for("nutritionist").llm is llm
+    assert other.agent_for("nutritionist").llm is llm
@@ -0,0 +1,37 @@
+from unittest.mock import Mock
+
+from ..crew import CrewFactory
+from ..fake_llm import FakeLLM
+from .test_tasks import mock_user_inputs  # noqa: F401 (fixture)
+
+def test_answers_are_templated_per_task():
+    llm = FakeLLM(responses={"assess_skin": "Skin plan for {role} ({prompt_tokens} tokens)"})
+    task = Mock(id="task-1", agent=Mock(role="Dermatologist\n"))
+    task.name = "assess_skin"
+
+    response = llm.call([{"role": "user", "content": "x" * 40}], from_task=task)
+
+    assert response.endswith("Final Answer: Skin plan for Dermatologist (10 tokens)")
+    assert llm.call("hello", from_task=task) == llm.call("hello", from_task=task)
+    assert (llm.calls, llm.prompt_tokens) == (3, 14)
+
+def test_delay_follows_token_rates():
+    llm = FakeLLM(latency=0.2, prompt_tokens_per_second=1000, output_tokens_per_second=50)
+    assert llm._delay(prompt_tokens=500, output_tokens=100) == 0.2 + 0.5 + 2.0
+    assert FakeLLM()._delay(500, 100) == 0.0
+
+def test_crew_runs_end_to_end_offline(mock_user_inputs):
+    llm = FakeLLM(responses={"analyze_fitness": "Fitness level: intermediate"})
+    factory = CrewFactory(llm=llm)
+    factory.response_cache = None
+    vitacrew = factory.create()
+    vitacrew.collect_user_inputs(mock_user_inputs)
+
+    outputs = vitacrew.kickoff_concurrent()
+
+    assert outputs["analyze_fitness"] == "Fitness level: intermediate"
+    assert outputs["generate_workout"].startswith("## Generate Workout")
+    assert "Fitness level: intermediate" in outputs["format_plans"]
+    # format_plans is rendered locally; every other task made one LLM call
+    assert llm.calls == len(outputs) - 1
+    assert vitacrew.agent_for("personal_trainer").llm is llm
@@ -0,0 +1,86 @@
+import csv
+
+import pytest
+
+from .. import foods
+from ..crew import CrewFactory
+from ..foods import FOODS_CSV, FoodDatabase
+from ..tools.custom_tool import FoodDatabaseTool
+
+@pytest.fixture
+def database(tmp_path):
+    return FoodDatabase.load(tmp_path)
+
+@pytest.fixture
+def rows():
+    with open(FOODS_CSV, newline="", encoding="utf-8") as file:
+        return {row["name"]: row for row in csv.DictReader(file)}
+
+def test_diet_bitsets_match_the_source_rows(database, rows):
+    vegan = {food["name"] for food in database.search(["vegan"], limit=len(database))}
+    assert vegan == {name for name, row in rows.items() if row["source"] == "plant"}
+
+    gluten_free_vegan = {food["name"] for food in database.search(["vegan", "gluten-free"], limit=len(database))}
+    assert "firm tofu" in gluten_free_vegan
+    assert "whole wheat bread" not in gluten_free_vegan
+    assert gluten_free_vegan == {name for name in vegan if rows[name]["gluten"] == "0"}
+
+    assert not {"bacon (cooked)", "ham"} & {food["name"] for food in database.search(["halal"], limit=len(database))}
+    # "none" is the UserInputs default and does not filter
+    assert database.mask(["none"]).all()
+
+def test_profiles_bounds_and_sorting(database):
+    foods = database.search(["vegan"], ["high-protein"], maximum={"fat": 10}, sort_by="protein")
+    assert foods
+    assert all(food["protein"] >= 20 and food["fat"] <= 10 for food in foods)
+    assert [food["protein"] for food in foods] == sorted((food["protein"] for food in foods), reverse=True)
+
+    lightest = database.search(category="vegetables", sort_by="kcal", limit=5)
+    assert len(lightest) == 5
+    assert [food["kcal"] for food in lightest] == sorted(food["kcal"] for food in lightest)
+    assert {food["category"] for food in lightest} == {"vegetables"}
+
+def test_unknown_names_are_rejected(database):
+    with pytest.raises(ValueError, match="carnivore"):
+        database.mask(["carnivore"])
+    with pytest.raises(ValueError, match="sodium"):
+        database.mask(minimum={"sodium": 1})
+    with pytest.raises(ValueError, match="Cannot sort"):
+        database.search(sort_by="name")
+
+def test_compiled_tables_are_memory_mapped_and_reused(tmp_path, database):
+    files = sorted(path.name for path in (tmp_path / "foods").iterdir())
+    assert len(files) == 2
+    mtimes = [path.stat().st_mtime_ns for path in (tmp_path / "foods").iterdir()]
+
+    reopened = FoodDatabase.load(tmp_path)
+    assert [path.stat().st_mtime_ns for path in (tmp_path / "foods").iterdir()] == mtimes
+    assert reopened.table.base is not None  # a view of the mapped file, not a copy
+    assert len(reopened) == len(database)
+
+def test_changed_rules_recompile_the_index(tmp_path, database, monkeypatch):
+    keto = database.mask(["keto"]).sum()
+    monkeypatch.setattr(foods, "KETO_MAX_NET_CARBS", 0.5)
+
+    stricter = FoodDatabase.load(tmp_path)
+    assert len(list((tmp_path / "foods").iterdir())) == 4
+    assert stricter.mask(["keto"]).sum() < keto
+
+def test_bumped_rules_version_recompiles_the_index(tmp_path, database, monkeypatch):
+    monkeypatch.setattr(foods, "RULES_VERSION", foods.RULES_VERSION + 1)
+
+    FoodDatabase.load(tmp_path)
+    assert len(list((tmp_path / "foods").iterdir())) == 4
+
+def test_tool_filters_by_dietary_requirements(database):
+    tool = FoodDatabaseTool(database=database)
+    result = tool._run(dietary_requirements=["vegetarian", "keto"], min_protein=15, limit=3)
+    assert result["count"] == len(result["foods"]) <= 3
+    for food in result["foods"]:
+        assert food["protein"] >= 15
+        assert food["carbs"] - food["fiber"] <= 8
+
+def test_nutritionist_has_the_food_database():
+    vitacrew = CrewFactory().create()
+    tools = {tool.name for tool in vitacrew.nutritionist().tools}
+    assert "Food Database" in tools
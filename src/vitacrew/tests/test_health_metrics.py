@@ -0,0 +1,59 @@
+import pytest
+
+from ..crew import ActivityLevel, Gender, SkinType, StressLevel, UserInputs, Vitacrew
+from ..tools.calculations import calculate_bmr, calculate_health_metrics, nutrition_goal
+
+@pytest.fixture
+def user_inputs():
+    return UserInputs(
+        name="Test User",
+        age=30,
+        gender=Gender.FEMALE,
+        height=165.0,
+        weight=68.0,
+        waist_circumference=78.0,
+        hip_circumference=100.0,
+        fitness_objectives=["weight loss", "endurance"],
+        dietary_requirements=["vegan"],
+        skin_type=SkinType.DRY,
+        skin_concerns=[],
+        sleep_hours=7.0,
+        stress_level=StressLevel.LOW,
+        activity_level=ActivityLevel.ACTIVE
+    )
+
+@pytest.mark.parametrize("objectives, goal", [
+    (["weight loss"], "cutting"),
+    (["Muscle Gain", "endurance"], "bulking"),
+    (["strength"], "bulking"),
+    (["weight loss", "muscle gain"], "maintenance"),
+    (["flexibility"], "maintenance"),
+])
+def test_nutrition_goal(objectives, goal):
+    assert nutrition_goal(objectives) == goal
+
+def test_health_metrics_are_derived_from_inputs(user_inputs):
+    metrics = calculate_health_metrics(
+        weight=68.0, height=165.0, age=30, gender=Gender.FEMALE,
+        waist_circumference=78.0, hip_circumference=100.0,
+        activity_level=ActivityLevel.ACTIVE, fitness_objectives=["weight loss"]
+    )
+    bmr = calculate_bmr(68.0, 165.0, 30, "female")
+    assert metrics["bmr"] == bmr
+    assert metrics["tdee"] == round(bmr * 1.725)
+    assert metrics["bmi"] == 25.0
+    assert metrics["bmi_category"] == "overweight"
+    assert (metrics["waist_to_hip_ratio"], metrics["whr_risk"]) == (0.78, "low")
+    assert metrics["calorie_target"] == metrics["tdee"] - 500
+    assert metrics["macros"]["protein"] == round(metrics["calorie_target"] * 0.4 / 4, 1)
+
+def test_collected_metrics_reach_task_context(user_inputs):
+    vitacrew = Vitacrew()
+    vitacrew.collect_user_inputs(user_inputs)
+    metrics = vitacrew.user_data["health_metrics"]
+    assert metrics["goal"] == "cutting"
+
+    context = vitacrew.task_context("create_meal_plan")
+    assert f"Calorie target: {metrics['calorie_target']} kcal/day" in context
+    assert f"TDEE: {metrics['tdee']} kcal/day" in context
+    assert "Calorie target" not in vitacrew.task_context("assess_skin")
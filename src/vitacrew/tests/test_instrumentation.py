@@ -0,0 +1,84 @@
+import json
+from unittest.mock import Mock, patch
+
+from crewai import Task
+from crewai.events import LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent, crewai_event_bus
+from crewai.events.types.llm_events import LLMCallType
+
+from ..crew import CrewFactory
+from ..instrumentation import LLM, TASK, TOOL, Tracer
+from .test_tasks import mock_user_inputs  # noqa: F401 (fixture)
+
+def fake_execute(vitacrew):
+    """Stands in for an agent run: one failed and one successful LLM call, then a tool call."""
+    def execute(task, agent=None, context=None, tools=None):
+        task_id = str(task.id)
+        crewai_event_bus.emit(None, LLMCallStartedEvent(messages="hi", task_id=task_id, model="fake"))
+        crewai_event_bus.emit(None, LLMCallFailedEvent(error="overloaded", task_id=task_id))
+        crewai_event_bus.emit(None, LLMCallStartedEvent(messages="hi", task_id=task_id, model="fake"))
+        crewai_event_bus.emit(None, LLMCallCompletedEvent(
+            messages="x" * 400, response="y" * 40, call_type=LLMCallType.LLM_CALL, task_id=task_id, model="fake"
+        ))
+        vitacrew.tools["macro_calculator"].run(calories=2000, goal="cutting")
+        return Mock(raw=f"{task.name} output")
+    return execute
+
+def traced_crew(mock_user_inputs, enabled=True):
+    factory = CrewFactory()
+    factory.tracer = Tracer(enabled=enabled)
+    factory.response_cache = None
+    vitacrew = factory.create()
+    vitacrew.collect_user_inputs(mock_user_inputs)
+    return vitacrew
+
+def test_disabled_tracer_records_nothing(mock_user_inputs):
+    vitacrew = traced_crew(mock_user_inputs, enabled=False)
+    with patch.object(Task, "execute_sync", autospec=True, side_effect=fake_execute(vitacrew)):
+        vitacrew.kickoff_concurrent()
+    assert vitacrew.last_trace is None
+    assert "vitacrew_tokens_total{" not in vitacrew.tracer.prometheus_text()
+
+def test_run_trace_records_tasks_llm_calls_and_tools(mock_user_inputs):
+    vitacrew = traced_crew(mock_user_inputs)
+    with patch.object(Task, "execute_sync", autospec=True, side_effect=fake_execute(vitacrew)):
+        vitacrew.kickoff_concurrent(max_concurrency=2)
+
+    trace = json.loads(vitacrew.last_trace.to_json())
+    tasks = {span["name"]: span for span in trace["spans"] if span["kind"] == TASK}
+    assert set(tasks) == set(vitacrew.task_dependencies())
+
+    meal_plan = tasks["create_meal_plan"]
+    assert meal_plan["retries"] == 1
+    assert meal_plan["tool_calls"] == 1
+    assert (meal_plan["input_tokens"], meal_plan["output_tokens"]) == (101, 10)  # JSON-quoted messages
+    assert meal_plan["queue_seconds"] >= 0
+    assert meal_plan["duration"] >= 0
+    # format_plans is rendered locally: no LLM or tool activity
+    assert tasks["format_plans"]["tool_calls"] == 0
+
+    llm_calls = [span for span in trace["spans"] if span["kind"] == LLM and span["task"] == "create_meal_plan"]
+    assert [span["error"] for span in llm_calls] == ["overloaded", None]
+    tools = [span for span in trace["spans"] if span["kind"] == TOOL]
+    assert {span["name"] for span in tools} == {"Macronutrient Calculator"}
+
+def test_prometheus_text_aggregates_runs(mock_user_inputs):
+    vitacrew = traced_crew(mock_user_inputs)
+    with patch.object(Task, "execute_sync", autospec=True, side_effect=fake_execute(vitacrew)):
+        vitacrew.kickoff_concurrent()
+        vitacrew.invalidate_outputs()
+        vitacrew.kickoff_concurrent()
+
+    text = vitacrew.tracer.prometheus_text()
+    assert "# TYPE vitacrew_span_seconds summary" in text
+    assert 'vitacrew_span_seconds_count{kind="task",name="assess_skin"} 2' in text
+    assert 'vitacrew_tokens_total{task="assess_skin",direction="input"} 202' in text
+    assert 'vitacrew_llm_retries_total{task="assess_skin"} 2' in text
+    assert f'vitacrew_tool_calls_total{{tool="Macronutrient Calculator"}} {2 * 9}' in text
+
+def test_prometheus_text_keeps_large_counters_exact():
+    tracer = Tracer()
+    tracer._sums[("tokens", ("assess_skin", "input"))] += 1234567
+    tracer._sums[("span_seconds_sum", ("task", "assess_skin"))] += 1234567.891
+    text = tracer.prometheus_text()
+    assert 'vitacrew_tokens_total{task="assess_skin",direction="input"} 1234567\n' in text
+    assert 'vitacrew_span_seconds_sum{kind="task",name="assess_skin"} 1234567.891\n' in text
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from ..crew import Vitacrew
+from ..knowledge import KnowledgeIndex, chunk_text, tokenize
+from .test_tasks import mock_user_inputs  # noqa: F401 (fixture)
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "knowledge"
+    root.mkdir()
+    (root / "nutrition.md").write_text(
+        "Vegetarian protein sources: lentils, tofu, tempeh and Greek yogurt.\n\n"
+        "Spread protein evenly across meals for muscle protein synthesis."
+    )
+    (root / "skincare.txt").write_text("Niacinamide and salicylic acid help acne-prone skin.")
+    return root
+
+@pytest.fixture
+def index(root, tmp_path):
+    return KnowledgeIndex(root, tmp_path / "knowledge.db", refresh_seconds=0)
+
+def test_tokenize_drops_stopwords():
+    assert tokenize("The user and their protein intake, for 3 meals") == ["protein", "intake", "3", "meals"]
+
+def test_chunks_keep_whole_lines_within_the_word_limit():
+    text = "\n".join(f"line {i} has five words" for i in range(10))
+    chunks = chunk_text(text, words=12)
+    assert all(len(chunk.split()) <= 12 for chunk in chunks)
+    assert "\n".join(chunks) == text
+
+def test_search_ranks_relevant_snippets_first(index):
+    results = index.search("vegetarian protein meal plan", k=2)
+    assert results[0].path == "nutrition.md"
+    assert "lentils" in results[0].text
+    assert index.search("acne skin")[0].path == "skincare.txt"
+    assert index.search("quantum chromodynamics") == []
+
+def test_refresh_only_reindexes_changed_files(root, index, tmp_path):
+    assert index.refresh() == 2
+    assert index.refresh() == 0
+
+    (root / "skincare.txt").write_text("Use a ceramide moisturiser for dry skin.")
+    os.utime(root / "skincare.txt", (1, 1))
+    (root / "nutrition.md").unlink()
+    assert index.refresh() == 2
+    assert index.search("acne") == []
+    assert index.search("ceramide")[0].path == "skincare.txt"
+
+    # A reopened index is already up to date
+    assert KnowledgeIndex(root, tmp_path / "knowledge.db").refresh() == 0
+
+def test_user_documents_are_only_searched_for_their_user(root, index):
+    (root / "users" / "jane-doe").mkdir(parents=True)
+    (root / "users" / "jane-doe" / "preferences.txt").write_text("Prefers morning kettlebell workouts.")
+
+    assert index.search("kettlebell workouts") == []
+    assert index.search("kettlebell workouts", user="Jane Doe")[0].path == "users/jane-doe/preferences.txt"
+
+def test_tasks_receive_relevant_knowledge(root, mock_user_inputs):
+    vitacrew = Vitacrew()
+    vitacrew.knowledge = KnowledgeIndex(root, root.parent / "index.db")
+    vitacrew.collect_user_inputs(mock_user_inputs)
+
+    assert "Niacinamide" in vitacrew.build_context("assess_skin")
+    assert "knowledge" in vitacrew.context_reports["assess_skin"].sections
+    vitacrew.task_config("assess_skin")["knowledge"] = 0
+    assert "Niacinamide" not in vitacrew.build_context("assess_skin")
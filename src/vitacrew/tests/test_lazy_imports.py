@@ -0,0 +1,28 @@
+import subprocess
+import sys
+
+LIGHT_MODULES = [
+    "vitacrew",
+    "vitacrew.models",
+    "vitacrew.tools.calculations",
+    "vitacrew.main",
+    "vitacrew.batch",
+    "vitacrew.events",
+    "vitacrew.scheduler",
+    "vitacrew.cache",
+    "vitacrew.validation",
+    "vitacrew.service",
+    "vitacrew.llm_pool",
+]
+
+def test_light_modules_do_not_import_the_agent_framework():
+    code = "; ".join(f"import {module}" for module in LIGHT_MODULES)
+    code += "; import sys; print(sorted(m for m in ('crewai', 'langchain_anthropic') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+def test_crew_is_loaded_on_first_access():
+    import vitacrew
+    from vitacrew.crew import Vitacrew
+    assert vitacrew.Vitacrew is Vitacrew
+    assert vitacrew.UserInputs is __import__("vitacrew.models", fromlist=["UserInputs"]).UserInputs
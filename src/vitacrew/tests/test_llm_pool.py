@@ -0,0 +1,124 @@
+import threading
+import time
+
+import pytest
+
+from ..crew import CrewFactory
+from ..fake_llm import FakeLLM, RateLimitError
+from ..llm_pool import BATCH, INTERACTIVE, LLMClientPool, TokenBucket
+from ..pooled_llm import PooledLLM
+from .test_tasks import mock_user_inputs  # noqa: F401 (fixture)
+
+
+def test_token_bucket_refills_over_time():
+    now = [0.0]
+    bucket = TokenBucket(per_minute=60, capacity=2, clock=lambda: now[0])
+    assert bucket.wait_time(2) == 0
+    bucket.take(2)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    now[0] = 0.5
+    assert bucket.wait_time(1) == pytest.approx(0.5)
+    now[0] = 10.0
+    assert bucket.level == 0.5 and bucket.wait_time(5) == 0  # capped at capacity, oversize requests wait for a full one
+
+
+def test_requests_are_spaced_by_the_rate_limit():
+    pool = LLMClientPool(requests_per_minute=600, burst=1)
+    start = time.monotonic()
+    for _ in range(4):
+        pool.call(lambda: "ok", tokens=10)
+    assert time.monotonic() - start >= 0.28
+    stats = pool.stats()
+    assert stats["requests"] == 4 and stats["throttled_requests"] == 3
+    assert stats["throttle_seconds"]["interactive"] > 0.25
+
+
+def test_interactive_calls_go_before_waiting_batch_calls():
+    pool = LLMClientPool(requests_per_minute=600, burst=1)
+    pool.acquire(10)  # empties the bucket
+    order = []
+
+    def caller(priority, name):
+        pool.call(lambda: order.append(name), tokens=10, priority=priority)
+
+    batch = [threading.Thread(target=caller, args=(BATCH, f"batch {i}")) for i in range(2)]
+    for thread in batch:
+        thread.start()
+    time.sleep(0.03)
+    interactive = threading.Thread(target=caller, args=(INTERACTIVE, "interactive"))
+    interactive.start()
+    for thread in batch + [interactive]:
+        thread.join()
+    assert order == ["interactive", "batch 0", "batch 1"]
+    assert pool.stats()["max_queue_depth"] == 3
+
+
+def test_429s_are_retried_with_backoff():
+    llm = FakeLLM(rate_limit=2, rate_limit_window=0.2)
+    pool = LLMClientPool(backoff_base=0.01)
+    pooled = PooledLLM(llm, pool)
+    answers = [pooled.call("hello") for _ in range(5)]
+    assert all("Final Answer" in answer for answer in answers)
+    assert llm.calls == 5 and llm.rate_limited > 0
+    stats = pool.stats()
+    assert stats["rate_limited"] == stats["retries"] == llm.rate_limited
+    assert stats["failures"] == 0
+
+
+def test_gives_up_after_max_retries_and_passes_other_errors_through():
+    pool = LLMClientPool(max_retries=2, backoff_base=0.001)
+    attempts = []
+
+    def limited():
+        attempts.append(1)
+        raise RateLimitError(retry_after=0.001)
+
+    with pytest.raises(RateLimitError):
+        pool.call(limited, tokens=1)
+    assert len(attempts) == 3 and pool.stats()["failures"] == 1
+    with pytest.raises(ValueError):
+        pool.call(lambda: int("x"), tokens=1)
+    assert pool.stats()["retries"] == 2
+
+
+def test_failed_attempts_give_back_their_token_reservation():
+    pool = LLMClientPool(tokens_per_minute=6000, max_retries=3, backoff_base=0.001)
+    attempts = []
+
+    def limited_twice():
+        attempts.append(pool.tokens.level)
+        if len(attempts) < 3:
+            raise RateLimitError(retry_after=0.001)
+        return "ok"
+
+    assert pool.call(limited_twice, tokens=1000) == "ok"
+    # Each retry reserves from a full bucket again, not on top of the failed attempts
+    assert attempts == pytest.approx([5000] * 3, abs=5)
+    pool.settle(1000, 0)
+    with pytest.raises(ValueError):
+        pool.call(lambda: int("x"), tokens=1000)
+    assert pool.tokens.level == pytest.approx(6000, abs=5)
+
+
+def test_backoff_honours_retry_after():
+    pool = LLMClientPool(backoff_base=1.0, backoff_max=8.0)
+    delays = [pool.backoff(attempt) for attempt in range(10)]
+    assert all(0 <= delay <= min(8.0, 2 ** attempt) for attempt, delay in enumerate(delays))
+    assert pool.backoff(0, requested=5.0) >= 5.0
+
+
+def test_crew_shares_the_pool_and_survives_429s(mock_user_inputs):
+    llm = FakeLLM(rate_limit=3, rate_limit_window=0.3)
+    factory = CrewFactory(llm=llm, pool=LLMClientPool(backoff_base=0.02))
+    factory.response_cache = None
+    factory.checkpoints = None
+    vitacrew = factory.create(priority=BATCH)
+    vitacrew.collect_user_inputs(mock_user_inputs)
+
+    outputs = vitacrew.kickoff_concurrent()
+
+    agent_llm = vitacrew.agent_for("nutritionist").llm
+    assert isinstance(agent_llm, PooledLLM) and agent_llm.llm is llm and agent_llm.priority == BATCH
+    assert agent_llm is factory.create(priority=BATCH).agent_for("personal_trainer").llm
+    assert llm.calls == len(outputs) - 1  # format_plans is rendered locally
+    assert llm.rate_limited > 0 and factory.pool.stats()["retries"] == llm.rate_limited
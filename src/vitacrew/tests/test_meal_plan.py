@@ -0,0 +1,104 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from ..crew import CrewFactory
+from ..foods import FoodDatabase
+from ..meal_plan import MealPlanOptimizer, solve_portions
+from ..tools.calculations import calculate_macros
+from ..tools.custom_tool import MealPlanOptimizerTool
+
+@pytest.fixture
+def optimizer(tmp_path):
+    return MealPlanOptimizer(FoodDatabase.load(tmp_path))
+
+def foods(plan):
+    return {item["food"] for day in plan["days"] for meal in day["meals"] for item in meal["items"]}
+
+def test_solve_portions_hits_a_feasible_target_within_bounds():
+    nutrients = np.array([[[1.0, 0.0, 0.5], [0.0, 1.0, 0.5]]])
+    lower, upper = np.zeros((1, 3)), np.array([[10.0, 10.0, 1.0]])
+    x = solve_portions(nutrients, np.array([[4.0, 6.0]]), lower, upper, np.array([[3.0, 5.0, 2.0]]))
+    assert np.allclose(nutrients[0] @ x[0], [4, 6], rtol=0.01)
+    # The third item is pinned at its upper bound, the others make up the rest
+    assert x[0, 2] == 1.0
+    assert (x >= lower).all() and (x <= upper).all()
+
+@pytest.mark.parametrize("calories, goal, diets", [
+    (1800, "cutting", []),
+    (2400, "maintenance", ["gluten-free", "dairy-free"]),
+    (3200, "bulking", ["vegan"]),
+    (2200, "cutting", ["vegetarian", "halal"]),
+])
+def test_week_hits_macro_targets(optimizer, calories, goal, diets):
+    targets = calculate_macros(calories, goal)
+    plan = optimizer.plan(targets, days=7, dietary_requirements=diets)
+
+    assert plan["within_tolerance"]
+    assert len(plan["days"]) == 7
+    for day in plan["days"]:
+        for macro, key in (("protein", "protein"), ("carbs", "carbs"), ("fat", "fats")):
+            assert day["totals"][macro] == pytest.approx(targets[key], rel=optimizer.tolerance + 0.001)
+        assert [meal["meal"] for meal in day["meals"]] == ["breakfast", "lunch", "dinner", "snack"]
+        assert all(item["grams"] > 0 for meal in day["meals"] for item in meal["items"])
+    # Foods rotate through the week
+    assert len(foods(plan)) > 20
+
+def test_plans_respect_dietary_requirements(optimizer):
+    vegan = optimizer.database.search(["vegan"], limit=len(optimizer.database))
+    plan = optimizer.plan(calculate_macros(2400, "maintenance"), dietary_requirements=["vegan"])
+    assert foods(plan) <= {food["name"] for food in vegan}
+
+def test_infeasible_targets_are_reported(optimizer):
+    # Keto foods cannot supply a 40% carb split
+    plan = optimizer.plan(calculate_macros(2400, "maintenance"), days=2, dietary_requirements=["keto"])
+    assert not plan["within_tolerance"]
+    assert all(day["deviation"]["carbs"] < -optimizer.tolerance for day in plan["days"])
+    [reason] = plan["infeasible"]
+    assert reason.startswith("carbs:") and "keto" in reason
+
+@pytest.mark.parametrize("diets", [
+    ["vegetarian", "paleo"],
+    ["dairy-free", "gluten-free", "vegetarian"],
+])
+def test_small_protein_pools_are_topped_up(optimizer, diets):
+    plan = optimizer.plan({"protein": 150, "carbs": 200, "fats": 60}, days=7, dietary_requirements=diets)
+    assert plan["within_tolerance"]
+    assert plan["infeasible"] == []
+    assert {"egg", "egg white"} & foods(plan)
+
+@pytest.mark.parametrize("diets", [["keto"], ["vegan", "paleo"], ["vegan", "keto"]])
+def test_plans_out_of_tolerance_say_why(optimizer, diets):
+    plan = optimizer.plan({"protein": 150, "carbs": 200, "fats": 60}, days=2, dietary_requirements=diets)
+    assert not plan["within_tolerance"]
+    assert plan["infeasible"]
+
+def test_concurrent_plans_share_one_layout(optimizer):
+    targets = calculate_macros(2400, "maintenance")
+    with ThreadPoolExecutor(8) as pool:
+        plans = list(pool.map(lambda _: optimizer.plan(targets, 3, ["vegan"]), range(16)))
+    assert all(plan == plans[0] for plan in plans)
+    assert list(optimizer._layouts) == [(("vegan",), 3)]
+
+def test_batch_matches_single_plans(optimizer):
+    targets = [calculate_macros(2000, "cutting"), calculate_macros(2800, "bulking")]
+    diets = [["vegetarian"], []]
+    assert optimizer.plan_batch(targets, 3, diets) == [
+        optimizer.plan(target, 3, requirements) for target, requirements in zip(targets, diets)
+    ]
+
+def test_invalid_targets(optimizer):
+    with pytest.raises(ValueError, match="positive"):
+        optimizer.plan({"protein": 150, "carbs": 200})
+    with pytest.raises(ValueError, match="carnivore"):
+        optimizer.plan(calculate_macros(2000, "cutting"), dietary_requirements=["carnivore"])
+
+def test_tool_runs_for_the_nutritionist(optimizer):
+    tool = MealPlanOptimizerTool(optimizer=optimizer)
+    plan = tool._run(protein=150, carbs=200, fats=60, dietary_requirements=["gluten-free"], days=1)
+    assert plan["targets"] == {"protein": 150, "carbs": 200, "fat": 60}
+    assert len(plan["days"]) == 1
+
+    tools = {tool.name for tool in CrewFactory().create().nutritionist().tools}
+    assert "Meal Plan Optimizer" in tools
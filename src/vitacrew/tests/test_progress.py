@@ -0,0 +1,78 @@
+from datetime import date, timedelta
+
+import pytest
+
+from ..crew import CrewFactory
+from ..fake_llm import FakeLLM
+from ..progress import ProgressStore
+from ..tools.custom_tool import ProgressTracker
+from .test_tasks import mock_user_inputs  # noqa: F401 (fixture)
+
+@pytest.fixture
+def store(tmp_path):
+    return ProgressStore(tmp_path / "progress.db")
+
+def daily(user, metric_type, start, values):
+    return [(user, metric_type, start + timedelta(days=i), value) for i, value in enumerate(values)]
+
+def test_range_query_is_per_user_and_metric(store):
+    store.ingest(daily("jane", "weight", date(2024, 1, 1), [70.0, 69.5, 69.0, 68.5]))
+    store.ingest(daily("john", "weight", date(2024, 1, 1), [90.0, 89.0]))
+    store.record("jane", "sleep", "2024-01-02", 7.5, "restless")
+
+    assert store.query("jane", "weight", start="2024-01-02", end="2024-01-03") == [
+        ("2024-01-02", 69.5), ("2024-01-03", 69.0)
+    ]
+    assert len(store.query("jane", "weight")) == 4
+    assert store.metric_types("jane") == ["sleep", "weight"]
+    assert len(store) == 7
+
+def test_weekly_rollup_starts_weeks_on_monday(store):
+    # 2024-01-01 is a Monday
+    store.ingest(daily("jane", "steps", date(2024, 1, 1), [1000, 2000, 3000, 4000, 5000, 6000, 7000, 100]))
+    weeks = store.rollup("jane", "steps", "week")
+    assert weeks == [
+        {"period": "2024-01-01", "mean": 4000.0, "min": 1000.0, "max": 7000.0, "count": 7},
+        {"period": "2024-01-08", "mean": 100.0, "min": 100.0, "max": 100.0, "count": 1},
+    ]
+
+def test_daily_rollup_keeps_repeated_measurements(store):
+    store.record("jane", "weight", "2024-01-01", 70.0)
+    store.record("jane", "weight", "2024-01-01", 71.0)
+    [day] = store.rollup("jane", "weight", "day")
+    assert (day["mean"], day["min"], day["max"], day["count"]) == (70.5, 70.0, 71.0, 2)
+
+def test_unknown_period_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.rollup("jane", "weight", "fortnight")
+
+def test_tracker_records_and_returns_history(store):
+    tracker = ProgressTracker(store=store, user="jane")
+    tracker._run(metric_type="weight", value=71.0, date="2024-01-01")
+    result = tracker._run(metric_type="weight", value=70.0, date="2024-01-09")
+
+    assert result["status"] == "recorded"
+    assert [week["mean"] for week in result["history"]] == [71.0, 70.0]
+    assert store.query("jane", "weight") == [("2024-01-01", 71.0), ("2024-01-09", 70.0)]
+
+def test_crews_record_metrics_for_their_own_user(mock_user_inputs):
+    factory = CrewFactory(llm=FakeLLM())
+    jane, john = factory.create(), factory.create()
+    jane.collect_user_inputs(mock_user_inputs.model_copy(update={"name": "Jane"}))
+    john.collect_user_inputs(mock_user_inputs.model_copy(update={"name": "John"}))
+
+    for crew, value in ((jane, 60.0), (john, 80.0)):
+        [tracker] = [tool for tool in crew.agent_for("nutritionist").tools if tool.name == "Progress Tracker"]
+        tracker.run(metric_type="weight", value=value, date="2024-01-01")
+
+    store = factory.tools["progress_tracker"].store
+    assert store.query("Jane", "weight") == [("2024-01-01", 60.0)]
+    assert store.query("John", "weight") == [("2024-01-01", 80.0)]
+    assert store.query("default", "weight") == []
+    assert factory.tools["progress_tracker"].user == "default"
+
+def test_tracker_ignores_a_user_passed_as_an_argument(store):
+    tracker = ProgressTracker(store=store, user="jane")
+    with pytest.raises(TypeError):
+        tracker.run(metric_type="weight", value=70.0, date="2024-01-01", user="john")
+    assert store.query("john", "weight") == []
@@ -0,0 +1,91 @@
+import io
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from crewai import Task
+from pypdf import PdfReader
+
+from ..crew import Vitacrew
+from ..report import parse_blocks, render_html, render_pdf
+from ..tools.custom_tool import ReportGenerator
+
+OUTPUTS = {
+    "analyze_fitness": "# Baseline\nYou are **active** (3x/week).\n\n- Squat 3x5\n- Bench <press>\n  at 60kg\n",
+    "create_meal_plan": "Eat well — mostly “plants”.",
+    "create_visuals": "Not part of the report",
+}
+
+def test_parse_blocks_recognises_headings_lists_and_paragraphs():
+    assert parse_blocks(OUTPUTS["analyze_fitness"]) == [
+        ("heading", "Baseline"),
+        ("paragraph", "You are **active** (3x/week)."),
+        ("list", ["Squat 3x5", "Bench <press> at 60kg"]),
+    ]
+
+def test_html_is_escaped_and_rendered_per_section():
+    pending = iter(OUTPUTS.items())
+    chunks = render_html(pending, "Plan for Jane")
+    html = ""
+    for chunk in chunks:
+        html += str(chunk)
+        if 'id="analyze_fitness"' in html and "</section>" in html:
+            break
+    # The first section is emitted before the remaining outputs are consumed
+    assert next(pending)[0] == "create_meal_plan"
+
+    html = "".join(render_html(OUTPUTS.items(), "Plan for Jane"))
+    assert "<strong>active</strong>" in html
+    assert "Bench &lt;press&gt; at 60kg" in html
+    assert "<h2>Meal Plan</h2>" in html
+    assert "Not part of the report" not in html
+
+def test_pdf_is_valid_and_paginated():
+    long_plan = "\n".join(f"- Exercise {i}: three sets of ten repetitions" for i in range(200))
+    data = b"".join(render_pdf([("generate_workout", long_plan), *OUTPUTS.items()], "Plan (v1)"))
+    reader = PdfReader(io.BytesIO(data))
+    assert len(reader.pages) > 1
+    text = "".join(page.extract_text() for page in reader.pages)
+    assert "Plan (v1)" in text
+    assert "Exercise 199" in text
+    assert 'Eat well - mostly "plants".' in text
+
+def test_format_plans_is_rendered_without_the_llm():
+    vitacrew = Vitacrew()
+    vitacrew.user_data = {"name": "Jane"}
+    with patch.object(Task, "execute_sync") as execute:
+        html = vitacrew._execute_task("format_plans", dict(OUTPUTS))
+    execute.assert_not_called()
+    assert "Wellness Plan for Jane" in html
+
+    with tempfile.TemporaryFile() as file:
+        vitacrew.write_report_pdf(OUTPUTS, file)
+        assert "Fitness Assessment" in PdfReader(file).pages[0].extract_text()
+
+def test_report_generator_tool_renders_html():
+    html = ReportGenerator()._run(report_type="weekly_progress", data={"sleep": "7.5h average"}, format="html")
+    assert "<h1>Weekly Progress</h1>" in html
+    assert "<h2>Sleep</h2>" in html
+
+def test_report_generator_pdfs_stay_in_the_reports_directory(isolated_cache_dir):
+    generator = ReportGenerator()
+    first = generator._run(report_type="../../Weekly Progress", data={"sleep": "7.5h"}, format="pdf")
+    second = generator._run(report_type="../../Weekly Progress", data={"sleep": "7.5h"}, format="pdf")
+
+    paths = {Path(message.rsplit(" at ", 1)[1]) for message in (first, second)}
+    assert len(paths) == 2
+    for path in paths:
+        assert path.parent == isolated_cache_dir / "reports"
+        assert path.name.startswith("weekly_progress-")
+
+def test_report_generator_keeps_only_the_newest_pdfs(isolated_cache_dir):
+    generator = ReportGenerator(max_reports=2)
+    paths = []
+    for week in range(4):
+        message = generator._run(report_type=f"week {week}", data={"sleep": "7.5h"}, format="pdf")
+        paths.append(Path(message.rsplit(" at ", 1)[1]))
+        # Distinct mtimes, oldest first, whatever the filesystem's timestamp resolution
+        os.utime(paths[-1], (week, week))
+
+    assert sorted((isolated_cache_dir / "reports").glob("*.pdf")) == sorted(paths[-2:])
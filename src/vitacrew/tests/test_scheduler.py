@@ -0,0 +1,170 @@
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from crewai import Task
+
+from ..crew import Vitacrew, UserInputs, Gender, StressLevel, ActivityLevel, SkinType
+from ..scheduler import TaskScheduler
+
+BRANCHES = {
+    "analyze_fitness": [],
+    "generate_workout": ["analyze_fitness"],
+    "create_meal_plan": [],
+    "generate_grocery_list": ["create_meal_plan"],
+    "assess_skin": [],
+    "design_routine": ["assess_skin"],
+    "format_plans": ["generate_workout", "generate_grocery_list", "design_routine"],
+}
+
+@pytest.fixture
+def mock_user_inputs():
+    return UserInputs(
+        name="Test User",
+        age=30,
+        gender=Gender.MALE,
+        height=175.0,
+        weight=70.0,
+        waist_circumference=80.0,
+        hip_circumference=90.0,
+        fitness_objectives=["weight loss"],
+        dietary_requirements=["vegetarian"],
+        skin_type=SkinType.NORMAL,
+        skin_concerns=["acne"],
+        sleep_hours=7.5,
+        stress_level=StressLevel.MODERATE,
+        activity_level=ActivityLevel.MODERATE
+    )
+
+def test_branches_run_concurrently():
+    def execute(name, upstream):
+        time.sleep(0.1)
+        return name
+
+    start = time.perf_counter()
+    outputs = TaskScheduler(BRANCHES, max_concurrency=3).run(execute)
+    elapsed = time.perf_counter() - start
+
+    assert list(outputs) == list(BRANCHES)
+    # Longest branch is three tasks deep; sequential would take seven
+    assert elapsed < 0.5
+
+def test_join_receives_all_upstream_outputs():
+    seen = {}
+
+    def execute(name, upstream):
+        seen[name] = upstream
+        return name.upper()
+
+    TaskScheduler(BRANCHES).run(execute)
+    assert seen["format_plans"] == {
+        "generate_workout": "GENERATE_WORKOUT",
+        "generate_grocery_list": "GENERATE_GROCERY_LIST",
+        "design_routine": "DESIGN_ROUTINE",
+    }
+    assert seen["analyze_fitness"] == {}
+
+def test_concurrency_limit_is_respected():
+    lock = threading.Lock()
+    active = peak = 0
+
+    def execute(name, upstream):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return name
+
+    TaskScheduler({f"task_{i}": [] for i in range(8)}, max_concurrency=2).run(execute)
+    assert peak == 2
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        TaskScheduler({"a": ["missing"]})
+    with pytest.raises(ValueError, match="Circular"):
+        TaskScheduler({"a": ["b"], "b": ["a"]})
+    with pytest.raises(ValueError):
+        TaskScheduler({"a": []}, max_concurrency=0)
+
+def test_task_failure_propagates():
+    def execute(name, upstream):
+        if name == "assess_skin":
+            raise RuntimeError("rate limited")
+        return name
+
+    with pytest.raises(RuntimeError, match="rate limited"):
+        TaskScheduler(BRANCHES).run(execute)
+
+def test_kickoff_concurrent_joins_branches_before_design_tasks(mock_user_inputs):
+    vitacrew = Vitacrew()
+    vitacrew.collect_user_inputs(mock_user_inputs)
+    contexts = {}
+
+    def fake_execute(task, agent=None, context=None, tools=None):
+        contexts[task.name] = context
+        return Mock(raw=f"{task.name} output")
+
+    with patch.object(Task, "execute_sync", autospec=True, side_effect=fake_execute):
+        outputs = vitacrew.kickoff_concurrent(max_concurrency=3)
+
+    assert set(outputs) == set(vitacrew.task_dependencies())
+    assert "Skin Concerns: acne" in contexts["assess_skin"]
+    # format_plans is rendered locally from its upstream outputs
+    assert "format_plans" not in contexts
+    for upstream in vitacrew.task_config("format_plans")["depends_on"]:
+        assert f"{upstream} output" in outputs["format_plans"]
+    for upstream in vitacrew.task_config("create_visuals")["depends_on"]:
+        assert f"{upstream} output" in contexts["create_visuals"]
+
+def replan_crew(mock_user_inputs):
+    vitacrew = Vitacrew()
+    vitacrew.response_cache = None
+    vitacrew.collect_user_inputs(mock_user_inputs)
+    executed = []
+
+    def fake_execute(task, agent=None, context=None, tools=None):
+        executed.append(task.name)
+        return Mock(raw=f"{task.name} output for {context}")
+
+    return vitacrew, executed, fake_execute
+
+def test_unchanged_profile_reuses_every_output(mock_user_inputs):
+    vitacrew, executed, fake_execute = replan_crew(mock_user_inputs)
+    with patch.object(Task, "execute_sync", autospec=True, side_effect=fake_execute):
+        first = vitacrew.kickoff_concurrent()
+        executed.clear()
+        second = vitacrew.kickoff_concurrent()
+
+    assert executed == []
+    assert second == first
+    assert vitacrew.reused_tasks == list(vitacrew.task_dependencies())
+
+def test_profile_edit_reruns_only_affected_tasks(mock_user_inputs):
+    vitacrew, executed, fake_execute = replan_crew(mock_user_inputs)
+    with patch.object(Task, "execute_sync", autospec=True, side_effect=fake_execute):
+        first = vitacrew.kickoff_concurrent()
+        executed.clear()
+        vitacrew.collect_user_inputs(mock_user_inputs.model_copy(update={"skin_concerns": ["dryness"]}))
+        second = vitacrew.kickoff_concurrent()
+
+    # format_plans re-renders locally; create_visuals reads design_routine
+    assert sorted(executed) == ["assess_skin", "create_visuals", "design_routine"]
+    assert "format_plans" not in vitacrew.reused_tasks
+    assert second["create_meal_plan"] == first["create_meal_plan"]
+    assert "Skin Concerns: dryness" in second["assess_skin"]
+
+def test_health_metric_inputs_invalidate_metrics_agents(mock_user_inputs):
+    vitacrew, executed, fake_execute = replan_crew(mock_user_inputs)
+    with patch.object(Task, "execute_sync", autospec=True, side_effect=fake_execute):
+        vitacrew.kickoff_concurrent()
+        executed.clear()
+        # Waist circumference is not in any profile list but changes the WHR
+        vitacrew.collect_user_inputs(mock_user_inputs.model_copy(update={"waist_circumference": 95.0}))
+        vitacrew.kickoff_concurrent()
+
+    assert "assess_skin" not in executed and "design_routine" not in executed
+    assert {"create_meal_plan", "generate_grocery_list", "analyze_data", "generate_report"} <= set(executed)
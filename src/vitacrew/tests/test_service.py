@@ -0,0 +1,157 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import CancelledError
+from http import HTTPStatus
+
+import pytest
+
+from ..crew import CrewFactory
+from ..fake_llm import FakeLLM
+from ..models import UserInputs
+from ..service import CANCELLED, FAILED, RUNNING, SUCCEEDED, PlanService, respond, serve
+from .test_batch import PROFILE
+from .test_tasks import mock_user_inputs  # noqa: F401 (fixture)
+
+BODY = json.dumps(PROFILE).encode()
+
+
+class GatedPlan:
+    """Plan stand-in that blocks until released, honouring cancellation like the crew does."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def __call__(self, job):
+        self.started.set()
+        while not self.release.wait(0.01):
+            if job.cancel_requested.is_set():
+                raise CancelledError()
+        if job.user_inputs.name == "fails":
+            raise RuntimeError("LLM unavailable")
+        return {"analyze_fitness": f"plan for {job.user_inputs.name}"}
+
+
+async def wait_for(job, *statuses):
+    for _ in range(500):
+        if job.status in statuses:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job stayed {job.status}")
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_and_report_results():
+    plan = GatedPlan()
+    plan.release.set()
+    service = PlanService(workers=2, plan=plan)
+    await service.start()
+    try:
+        status, job = await respond(service, "POST", "/plans", BODY)
+        assert status == HTTPStatus.ACCEPTED and job["status"] == "queued"
+        failing = service.submit(UserInputs(**{**PROFILE, "name": "fails"}))
+        status, bulk = await respond(service, "POST", "/plans?priority=batch", BODY)
+        assert (status, bulk["priority"]) == (HTTPStatus.ACCEPTED, "batch")
+        await wait_for(service.jobs[job["id"]], SUCCEEDED)
+        await wait_for(failing, FAILED)
+
+        status, job = await respond(service, "GET", f"/plans/{job['id']}", b"")
+        assert status == HTTPStatus.OK
+        assert job["result"] == {"analyze_fitness": "plan for Test User"}
+        assert failing.to_dict()["error"] == "LLM unavailable"
+    finally:
+        await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_refused_until_a_slot_frees():
+    plan = GatedPlan()
+    service = PlanService(workers=1, queue_size=1, plan=plan)
+    await service.start()
+    try:
+        running = (await respond(service, "POST", "/plans", BODY))[1]
+        await wait_for(service.jobs[running["id"]], RUNNING)
+        queued = (await respond(service, "POST", "/plans", BODY))[1]
+
+        status, error = await respond(service, "POST", "/plans", BODY)
+        assert status == HTTPStatus.TOO_MANY_REQUESTS and error["retry_after"] > 0
+
+        status, job = await respond(service, "DELETE", f"/plans/{queued['id']}", b"")
+        assert (status, job["status"]) == (HTTPStatus.OK, CANCELLED)
+        assert (await respond(service, "POST", "/plans", BODY))[0] == HTTPStatus.ACCEPTED
+    finally:
+        plan.release.set()
+        await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_running_job_is_cancelled():
+    plan = GatedPlan()
+    service = PlanService(workers=1, plan=plan)
+    await service.start()
+    try:
+        job = service.submit(UserInputs(**PROFILE))
+        await wait_for(job, RUNNING)
+        service.cancel(job.id)
+        await wait_for(job, CANCELLED)
+        assert job.result is None and service.stats()["running"] == 0
+    finally:
+        await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_bad_requests():
+    service = PlanService(plan=GatedPlan())
+    await service.start()
+    try:
+        status, error = await respond(service, "POST", "/plans", json.dumps({**PROFILE, "age": 5}).encode())
+        assert status == HTTPStatus.UNPROCESSABLE_ENTITY and list(error["details"][0]["loc"]) == ["age"]
+        assert (await respond(service, "GET", "/plans/missing", b""))[0] == HTTPStatus.NOT_FOUND
+        assert (await respond(service, "PUT", "/plans", b""))[0] == HTTPStatus.METHOD_NOT_ALLOWED
+        assert (await respond(service, "POST", "/plans?priority=urgent", BODY))[0] == HTTPStatus.BAD_REQUEST
+    finally:
+        await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_serves_http_on_localhost():
+    plan = GatedPlan()
+    plan.release.set()
+    service = PlanService(plan=plan)
+    server = await serve(service, port=0)
+    port = server.sockets[0].getsockname()[1]
+
+    async def request(method, path, body=b""):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+                     + body)
+        head, _, payload = (await reader.read()).partition(b"\r\n\r\n")
+        writer.close()
+        return head.decode(), json.loads(payload)
+
+    try:
+        head, job = await request("POST", "/plans", BODY)
+        assert head.startswith("HTTP/1.1 202") and f"Location: /plans/{job['id']}" in head
+        await wait_for(service.jobs[job["id"]], SUCCEEDED)
+        head, health = await request("GET", "/health")
+        assert head.startswith("HTTP/1.1 200") and health["queued"] == 0
+    finally:
+        server.close()
+        await server.wait_closed()
+        await service.stop()
+
+
+def test_cancelled_crew_stops_before_its_next_task(mock_user_inputs):
+    llm = FakeLLM()
+    factory = CrewFactory(llm=llm)
+    factory.response_cache = None
+    factory.checkpoints = None
+    vitacrew = factory.create()
+    vitacrew.collect_user_inputs(mock_user_inputs)
+    cancelled = threading.Event()
+    cancelled.set()
+
+    with pytest.raises(CancelledError):
+        vitacrew.kickoff_concurrent(cancelled=cancelled)
+    assert llm.calls == 0
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from ..models import Gender, UserInputs
+from ..validation import validate_file, validate_records
+from .test_batch import PROFILE
+
+
+def test_valid_records_match_user_inputs():
+    record = {**PROFILE, "fitness_objectives": ["Strength"], "age": "30"}
+    del record["skin_concerns"]
+    report = validate_records([record])
+    assert not report.errors
+    assert report.valid[0] == UserInputs(**record).model_dump()
+    assert report.valid[0]["gender"] is Gender.MALE
+
+
+def test_every_error_of_a_record_is_reported():
+    record = {**PROFILE, "age": 12, "fitness_objectives": ["yoga", "strength", "pilates"]}
+    del record["gender"]
+    report = validate_records([PROFILE, record, "not a record"])
+    assert list(report.valid) == [0]
+    fields = [error["field"] for error in report.errors[1]]
+    assert sorted(fields) == ["age", "fitness_objectives", "gender"]
+    vocabulary = next(error for error in report.errors[1] if error["field"] == "fitness_objectives")
+    assert vocabulary["message"].startswith("Invalid fitness objectives. Must be one of:")
+    assert vocabulary["input"] == ["yoga", "strength", "pilates"]
+    assert report.errors[2][0]["field"] == "record"
+
+
+
+def test_mixed_type_list_items_are_reported_not_raised():
+    record = {**PROFILE, "fitness_objectives": ["bad", 1, ["strength"]]}
+    [errors] = validate_records([record]).errors.values()
+    assert [error["field"] for error in errors] == [
+        "fitness_objectives", "fitness_objectives.1", "fitness_objectives.2",
+    ]
+    assert errors[0]["message"].startswith("Invalid fitness objectives. Must be one of:")
+    assert errors[1]["message"] == "Input should be a valid string"
+
+
+@pytest.mark.parametrize("field,value", [
+    ("dietary_requirements", ["carnivore"]),
+    ("skin_concerns", ["wrinkles"]),
+    ("fitness_objectives", []),
+    ("skin_type", "scaly"),
+])
+def test_rejects_what_user_inputs_rejects(field, value):
+    record = {**PROFILE, field: value}
+    with pytest.raises(ValueError):
+        UserInputs(**record)
+    assert [error["field"] for error in validate_records([record]).errors[0]] == [field]
+
+
+def test_chunks_keep_record_indexes():
+    records = [{**PROFILE, "age": 5 if i % 3 == 0 else 40} for i in range(10)]
+    report = validate_records(records, chunk_size=4)
+    assert sorted(report.errors) == [0, 3, 6, 9]
+    assert len(report) == 10
+
+
+def test_validate_file_writes_error_report(tmp_path):
+    input_path = tmp_path / "profiles.jsonl"
+    input_path.write_text("".join(
+        json.dumps({**PROFILE, "stress_level": "extreme" if i == 2 else "low"}) + "\n" for i in range(5)
+    ))
+    report_path = tmp_path / "errors.jsonl"
+    assert validate_file(input_path, report_path, chunk_size=2) == {"valid": 4, "invalid": 1}
+    lines = [json.loads(line) for line in report_path.read_text().splitlines()]
+    assert [line["index"] for line in lines] == [2]
+    assert lines[0]["errors"][0]["field"] == "stress_level"
+
+
+def test_validate_file_reports_unreadable_lines(tmp_path):
+    input_path = tmp_path / "profiles.jsonl"
+    input_path.write_text(json.dumps(PROFILE) + "\n{not json\n" + json.dumps(PROFILE) + "\n")
+    report_path = tmp_path / "errors.jsonl"
+    assert validate_file(input_path, report_path) == {"valid": 2, "invalid": 1}
+    [line] = [json.loads(line) for line in report_path.read_text().splitlines()]
+    assert line["index"] == 1
+    assert line["errors"][0]["field"] == "record"
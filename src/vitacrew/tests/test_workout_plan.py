@@ -0,0 +1,88 @@
+import pytest
+
+from ..crew import CrewFactory
+from ..exercises import ExerciseLibrary, default_exercise_library
+from ..models import ActivityLevel
+from ..tools.custom_tool import WorkoutPlannerTool
+from ..workout_plan import PHASES, WorkoutPlanner, format_program
+from .test_tasks import mock_user_inputs  # noqa: F401 (fixture)
+
+@pytest.fixture
+def planner():
+    return WorkoutPlanner(default_exercise_library())
+
+def names(session):
+    return [exercise["name"] for exercise in session["exercises"]]
+
+def test_library_lookups_use_every_index():
+    library = ExerciseLibrary.load()
+    found = library.find(pattern="squat", equipment=["bodyweight", "band"], max_intensity=1)
+    assert found and all(e.pattern == "squat" and e.equipment in {"bodyweight", "band"} and e.intensity == 1
+                         for e in found)
+    assert all("flexibility" in e.objectives for e in library.find(objectives=["flexibility"]))
+    assert {e.muscle for e in library.find(muscle="chest")} == {"chest"}
+    with pytest.raises(ValueError, match="trampoline"):
+        library.mask(equipment=["trampoline"])
+
+def test_activity_level_sets_split_and_intensity(planner):
+    easy = planner.build(["general fitness"], ActivityLevel.SEDENTARY)
+    assert easy["sessions_per_week"] == 2
+    assert max(e.intensity for e in planner.library.exercises
+               if e.name in {n for s in easy["weeks"][0]["sessions"] for n in names(s)}) <= 2
+
+    hard = planner.build(["strength"], "very active")
+    assert hard["sessions_per_week"] == 5
+    assert [session["day"] for session in hard["weeks"][0]["sessions"]] == ["Mon", "Tue", "Wed", "Fri", "Sat"]
+
+def test_blocks_progress_and_deload(planner):
+    program = planner.build(["strength", "muscle gain"], "moderate", weeks=8)
+    assert program["primary_objective"] == "strength"
+    assert [week["phase"] for week in program["weeks"]] == [phase for phase, _, _ in PHASES] * 2
+
+    sets = [week["sessions"][0]["exercises"][0]["sets"] for week in program["weeks"][:4]]
+    assert sets[2] > sets[1] and sets[3] < sets[0]
+    assert program["weeks"][3]["rpe"] < program["weeks"][2]["rpe"]
+    # Exercises are fixed within a block and rotate with the next one
+    first_block = [names(week["sessions"][0]) for week in program["weeks"][:4]]
+    assert all(block == first_block[0] for block in first_block)
+    assert names(program["weeks"][4]["sessions"][0]) != first_block[0]
+    # No exercise repeats within a week when the library has alternatives
+    week = [name for session in program["weeks"][0]["sessions"] for name in names(session)
+            if "carry" not in name and "ab wheel" not in name and "knee raise" not in name]
+    assert len(week) == len(set(week))
+
+def test_objectives_add_conditioning_and_mobility(planner):
+    program = planner.build(["weight loss", "flexibility"], "light")
+    session = program["weeks"][0]["sessions"][0]
+    assert session["conditioning"]["minutes"] == 25
+    assert len(session["mobility"]) == 3
+    assert all(exercise["reps"] for exercise in session["exercises"])
+
+def test_equipment_is_respected(planner):
+    program = planner.build(["muscle gain"], "active", equipment=["bodyweight", "band"])
+    equipment = {e["equipment"] for week in program["weeks"] for s in week["sessions"] for e in s["exercises"]}
+    assert equipment <= {"bodyweight", "band"}
+
+def test_format_program_is_compact(planner):
+    program = planner.build(["muscle gain"], "active", weeks=4)
+    text = format_program(program)
+    assert "sets 4/4/5/2 x 8-12" in text
+    assert text.count("Upper A") == 1
+
+def test_workout_task_context_carries_the_program(mock_user_inputs):
+    vitacrew = CrewFactory().create()
+    vitacrew.collect_user_inputs(mock_user_inputs)
+    context = vitacrew.task_context("generate_workout")
+    assert "Precomputed 4-week program (primary objective: muscle gain" in context
+    assert vitacrew.context_reports["generate_workout"].dropped == []
+    assert "week program" not in vitacrew.task_context("analyze_fitness")
+
+    before = vitacrew.task_fingerprints()["generate_workout"]
+    vitacrew.user_data["activity_level"] = ActivityLevel.VERY_ACTIVE
+    assert vitacrew.task_fingerprints()["generate_workout"] != before
+    assert "5 sessions/week" in vitacrew.task_context("generate_workout")
+
+def test_tool_is_given_to_the_personal_trainer():
+    tool = WorkoutPlannerTool()
+    assert len(tool._run(fitness_objectives=["endurance"], weeks=2)["weeks"]) == 2
+    assert "Workout Planner" in {t.name for t in CrewFactory().create().personal_trainer().tools}
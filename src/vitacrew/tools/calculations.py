@@ -0,0 +1,217 @@
+from typing import Dict, Optional, Sequence
+import numpy as np
+
+MACRO_RATIOS = {
+    "maintenance": {"protein": 0.3, "carbs": 0.4, "fats": 0.3},
+    "bulking": {"protein": 0.25, "carbs": 0.5, "fats": 0.25},
+    "cutting": {"protein": 0.4, "carbs": 0.3, "fats": 0.3}
+}
+
+# Gender values the batch calculators accept (models.Gender)
+GENDERS = frozenset({"male", "female", "other"})
+
+# TDEE multipliers applied to BMR, per ActivityLevel value
+ACTIVITY_FACTORS = {
+    "sedentary": 1.2,
+    "light": 1.375,
+    "moderate": 1.55,
+    "active": 1.725,
+    "very active": 1.9
+}
+
+# Daily calorie change from TDEE for each goal
+CALORIE_ADJUSTMENTS = {
+    "maintenance": 0,
+    "bulking": 300,
+    "cutting": -500
+}
+
+# Waist-to-hip ratio above which health risk is raised (WHO)
+WHR_RISK_THRESHOLDS = {"male": 0.90, "female": 0.85}
+
+BMI_CATEGORIES = [
+    (18.5, "underweight"),
+    (25.0, "normal"),
+    (30.0, "overweight"),
+    (float("inf"), "obese")
+]
+
+_SPLITTER = 2.0 ** 27 + 1
+
+def _split(a):
+    """Dekker split of a float into high and low halves."""
+    c = _SPLITTER * a
+    hi = c - (c - a)
+    return hi, a - hi
+
+def _round_like_python(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    Vectorized equivalent of the builtin round(value, ndigits).
+
+    np.round scales before rounding, so a value just above or below a decimal
+    tie can land exactly on .5 and round the wrong way. The exact error of the
+    scaling product decides those ties the same way the builtin does.
+    """
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    value_hi, value_lo = _split(values)
+    scale_hi, scale_lo = _split(np.float64(scale))
+    error = ((value_hi * scale_hi - scaled) + value_hi * scale_lo + value_lo * scale_hi) + value_lo * scale_lo
+
+    floor = np.floor(scaled)
+    tie = (scaled - floor) == 0.5
+    rounded = np.rint(scaled)
+    rounded = np.where(tie & (error > 0), floor + 1, rounded)
+    rounded = np.where(tie & (error < 0), floor, rounded)
+    return rounded / scale
+
+def _lowered(values: Sequence[str], allowed: Optional[frozenset] = None, kind: str = "labels") -> np.ndarray:
+    """Lowercased string array; accepts str enums such as Gender, and rejects labels outside ``allowed``."""
+    if isinstance(values, np.ndarray) and values.dtype.kind == "U":
+        array = values
+    else:
+        # Map enum members through .value first, as the scalar path does:
+        # numpy would stringify Gender.MALE by its name, not its value
+        objects = np.asarray(values, dtype=object)
+        array = np.array([getattr(value, "value", value) for value in objects.ravel()], dtype=str)
+        array = array.reshape(objects.shape)
+    # Cohorts hold a handful of distinct labels, so lowercase those once
+    uniques, inverse = np.unique(array, return_inverse=True)
+    uniques = np.char.lower(uniques)
+    if allowed is not None:
+        unknown = sorted(set(uniques.tolist()) - allowed)
+        if unknown:
+            raise ValueError(f"Unknown {kind} {unknown}; pass enum members or their values")
+    return uniques[inverse.reshape(array.shape)]
+
+def calculate_bmr(weight: float, height: float, age: int, gender: str) -> float:
+    """Basal Metabolic Rate (revised Harris-Benedict), in kcal/day."""
+    if gender.lower() == "male":
+        bmr = 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age)
+    else:
+        bmr = 447.593 + (9.247 * weight) + (3.098 * height) - (4.330 * age)
+    return round(bmr, 2)
+
+def calculate_macros(calories: float, goal: str) -> dict:
+    """Protein/carbs/fats grams for a calorie target and goal (maintenance/bulking/cutting)."""
+    goal_ratio = MACRO_RATIOS.get(goal.lower(), MACRO_RATIOS["maintenance"])
+    return {
+        "protein": round((calories * goal_ratio["protein"]) / 4, 1),  # 4 cal/g
+        "carbs": round((calories * goal_ratio["carbs"]) / 4, 1),     # 4 cal/g
+        "fats": round((calories * goal_ratio["fats"]) / 9, 1)        # 9 cal/g
+    }
+
+def _label(value) -> str:
+    return str(getattr(value, "value", value)).lower()
+
+def nutrition_goal(fitness_objectives: Sequence[str]) -> str:
+    """
+    Maps fitness objectives to a calorie goal (maintenance/bulking/cutting).
+
+    Weight loss means cutting and muscle gain or strength means bulking; when
+    both are wanted the target stays at maintenance (body recomposition).
+    """
+    objectives = {_label(objective) for objective in fitness_objectives}
+    losing = "weight loss" in objectives
+    gaining = bool(objectives & {"muscle gain", "strength"})
+    if losing and not gaining:
+        return "cutting"
+    if gaining and not losing:
+        return "bulking"
+    return "maintenance"
+
+def calculate_health_metrics(weight: float, height: float, age: int, gender: str,
+                             waist_circumference: float, hip_circumference: float,
+                             activity_level: str, fitness_objectives: Sequence[str]) -> dict:
+    """
+    Derives every number the agents plan around, deterministically.
+
+    Args:
+        weight: Weight in kg
+        height: Height in cm
+        age: Age in years
+        gender: male/female/other (enums accepted)
+        waist_circumference: Waist in cm
+        hip_circumference: Hips in cm
+        activity_level: ActivityLevel value (enums accepted)
+        fitness_objectives: UserInputs fitness objectives
+
+    Returns:
+        dict: BMR, TDEE, BMI, waist-to-hip ratio, the calorie goal and target,
+        and the macro split for that target
+    """
+    gender = _label(gender)
+    bmr = calculate_bmr(weight, height, age, gender)
+    tdee = round(bmr * ACTIVITY_FACTORS.get(_label(activity_level), ACTIVITY_FACTORS["moderate"]))
+    bmi = round(weight / (height / 100) ** 2, 1)
+    whr = round(waist_circumference / hip_circumference, 2)
+    goal = nutrition_goal(fitness_objectives)
+    calorie_target = tdee + CALORIE_ADJUSTMENTS[goal]
+    return {
+        "bmr": bmr,
+        "tdee": tdee,
+        "bmi": bmi,
+        "bmi_category": next(label for limit, label in BMI_CATEGORIES if bmi < limit),
+        "waist_to_hip_ratio": whr,
+        # Without a sex-specific cut-off use the lower (stricter) one
+        "whr_risk": "high" if whr > WHR_RISK_THRESHOLDS.get(gender, min(WHR_RISK_THRESHOLDS.values())) else "low",
+        "goal": goal,
+        "calorie_adjustment": CALORIE_ADJUSTMENTS[goal],
+        "calorie_target": calorie_target,
+        "macros": calculate_macros(calorie_target, goal)
+    }
+
+def calculate_bmr_batch(weight: Sequence[float], height: Sequence[float],
+                        age: Sequence[int], gender: Sequence[str]) -> np.ndarray:
+    """
+    Calculates BMR for a whole cohort in one vectorized pass.
+
+    Args:
+        weight: Weights in kg
+        height: Heights in cm
+        age: Ages in years
+        gender: Genders (male/female/other)
+
+    Returns:
+        np.ndarray: BMR per record, identical to calculate_bmr
+
+    Raises:
+        ValueError: For a gender outside GENDERS, e.g. an array numpy built from
+            Gender members, which holds their names instead of their values
+    """
+    genders = _lowered(gender, GENDERS, "genders")
+    weight = np.asarray(weight, dtype=np.float64)
+    height = np.asarray(height, dtype=np.float64)
+    age = np.asarray(age, dtype=np.float64)
+    male = 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age)
+    female = 447.593 + (9.247 * weight) + (3.098 * height) - (4.330 * age)
+    bmr = np.where(genders == "male", male, female)
+    return _round_like_python(bmr, 2)
+
+def calculate_macros_batch(calories: Sequence[float], goal: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Calculates macronutrient grams for a whole cohort in one vectorized pass.
+
+    Args:
+        calories: Daily calorie targets
+        goal: Fitness goals (maintenance/bulking/cutting); unknown goals use maintenance
+
+    Returns:
+        Dict[str, np.ndarray]: protein/carbs/fats grams per record, identical
+        to calculate_macros
+    """
+    calories = np.asarray(calories, dtype=np.float64)
+    goals = _lowered(goal)
+    ratios = {
+        macro: np.full(calories.shape, MACRO_RATIOS["maintenance"][macro])
+        for macro in ("protein", "carbs", "fats")
+    }
+    for name, goal_ratio in MACRO_RATIOS.items():
+        selected = goals == name
+        for macro, ratio in goal_ratio.items():
+            ratios[macro][selected] = ratio
+    return {
+        "protein": _round_like_python((calories * ratios["protein"]) / 4, 1),
+        "carbs": _round_like_python((calories * ratios["carbs"]) / 4, 1),
+        "fats": _round_like_python((calories * ratios["fats"]) / 9, 1)
+    }
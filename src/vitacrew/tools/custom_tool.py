@@ -1,6 +1,26 @@
 from crewai.tools import BaseTool
-from typing import Type, Optional
+from datetime import date, timedelta
+import re
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Type, Optional
 from pydantic import BaseModel, Field
+from vitacrew.analytics import HealthAnalytics
+from vitacrew.cache import default_cache_dir
+from vitacrew.exercises import default_exercise_library
+from vitacrew.foods import FoodDatabase
+from vitacrew.instrumentation import instrument_tool
+from vitacrew.meal_plan import MealPlanOptimizer
+from vitacrew.progress import ProgressStore
+from vitacrew.report import SECTION_TITLES, render_html, write_pdf
+from vitacrew.tools.calculations import (
+    calculate_bmr,
+    calculate_bmr_batch,
+    calculate_macros,
+    calculate_macros_batch
+)
+from vitacrew.workout_plan import WorkoutPlanner
 
 # Calculation Tools
 class BMRCalculatorInput(BaseModel):
@@ -15,12 +35,11 @@ class BMRCalculator(BaseTool):
     description: str = "Calculates Basal Metabolic Rate based on weight, height, age, and gender"
     args_schema: Type[BaseModel] = BMRCalculatorInput
 
+    @instrument_tool
     def _run(self, weight: float, height: float, age: int, gender: str) -> float:
-        if gender.lower() == "male":
-            bmr = 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age)
-        else:
-            bmr = 447.593 + (9.247 * weight) + (3.098 * height) - (4.330 * age)
-        return round(bmr, 2)
+        return calculate_bmr(weight, height, age, gender)
+
+    calculate_batch = staticmethod(calculate_bmr_batch)
 
 class MacroCalculatorInput(BaseModel):
     """Input for Macronutrient Calculator"""
@@ -32,54 +51,259 @@ class MacroCalculator(BaseTool):
     description: str = "Calculates optimal macronutrient ratios based on calorie target and fitness goal"
     args_schema: Type[BaseModel] = MacroCalculatorInput
 
+    @instrument_tool
     def _run(self, calories: float, goal: str) -> dict:
-        ratios = {
-            "maintenance": {"protein": 0.3, "carbs": 0.4, "fats": 0.3},
-            "bulking": {"protein": 0.25, "carbs": 0.5, "fats": 0.25},
-            "cutting": {"protein": 0.4, "carbs": 0.3, "fats": 0.3}
-        }
-        
-        goal_ratio = ratios.get(goal.lower(), ratios["maintenance"])
-        return {
-            "protein": round((calories * goal_ratio["protein"]) / 4, 1),  # 4 cal/g
-            "carbs": round((calories * goal_ratio["carbs"]) / 4, 1),     # 4 cal/g
-            "fats": round((calories * goal_ratio["fats"]) / 9, 1)        # 9 cal/g
-        }
+        return calculate_macros(calories, goal)
+
+    calculate_batch = staticmethod(calculate_macros_batch)
+
+# Workout Tools
+class WorkoutPlannerInput(BaseModel):
+    """Input for Workout Planner"""
+    fitness_objectives: List[str] = Field(
+        ..., description="strength, athletic performance, muscle gain, general fitness, weight loss, "
+                         "endurance and/or flexibility"
+    )
+    activity_level: str = Field("moderate", description="sedentary, light, moderate, active or very active")
+    weeks: int = Field(4, ge=1, le=16, description="Program length in weeks")
+    equipment: Optional[List[str]] = Field(
+        None, description="Available equipment: barbell, dumbbell, kettlebell, machine, cable, band, "
+                          "cardio machine, bodyweight (default: all)"
+    )
+
+class WorkoutPlannerTool(BaseTool):
+    name: str = "Workout Planner"
+    description: str = (
+        "Builds a periodized multi-week workout program (split, exercises, sets, reps, rest, "
+        "weekly RPE, conditioning and mobility) from the exercise library"
+    )
+    args_schema: Type[BaseModel] = WorkoutPlannerInput
+    planner: Optional[WorkoutPlanner] = Field(default=None, exclude=True)
+
+    def model_post_init(self, __context) -> None:
+        super().model_post_init(__context)
+        if self.planner is None:
+            self.planner = WorkoutPlanner(default_exercise_library())
+
+    @instrument_tool
+    def _run(self, fitness_objectives: List[str], activity_level: str = "moderate", weeks: int = 4,
+             equipment: Optional[List[str]] = None) -> dict:
+        return self.planner.build(fitness_objectives, activity_level, weeks, equipment)
 
 # Progress Tracking Tools
 class ProgressTrackerInput(BaseModel):
     """Input for Progress Tracker"""
     metric_type: str = Field(..., description="Type of metric to track (workout/nutrition/skin)")
     value: float = Field(..., description="Current metric value")
-    date: str = Field(..., description="Date of measurement")
+    date: str = Field(..., description="Date of measurement (YYYY-MM-DD)")
     notes: Optional[str] = Field(None, description="Additional notes")
 
 class ProgressTracker(BaseTool):
     name: str = "Progress Tracker"
-    description: str = "Tracks progress for various health and fitness metrics"
+    description: str = (
+        "Records a health or fitness metric and returns its weekly history "
+        "(mean/min/max per week) for the last few weeks"
+    )
     args_schema: Type[BaseModel] = ProgressTrackerInput
+    store: Optional[ProgressStore] = Field(default=None, exclude=True)
+    history_weeks: int = 8
+    # Set by the crew to its profile's name, never by the LLM
+    user: str = "default"
+
+    def model_post_init(self, __context) -> None:
+        super().model_post_init(__context)
+        if self.store is None:
+            self.store = default_progress_store(default_cache_dir())
 
+    @instrument_tool
     def _run(self, metric_type: str, value: float, date: str, notes: Optional[str] = None) -> dict:
+        self.store.record(self.user, metric_type, date, value, notes)
+        since = _parse_date(date) - timedelta(weeks=self.history_weeks)
         return {
             "metric_type": metric_type,
             "value": value,
             "date": date,
             "notes": notes,
-            "status": "recorded"
+            "status": "recorded",
+            "history": self.store.rollup(self.user, metric_type, "week", start=since, end=date),
         }
 
+def _parse_date(value: str) -> date:
+    return date.fromisoformat(value.strip())
+
+@lru_cache(maxsize=None)
+def default_progress_store(cache_dir: Path) -> ProgressStore:
+    """One store per cache directory, so the tracker and analytics see the same writes."""
+    return ProgressStore(cache_dir / 'progress.db')
+
+@lru_cache(maxsize=None)
+def default_health_analytics(cache_dir: Path) -> HealthAnalytics:
+    return HealthAnalytics(default_progress_store(cache_dir))
+
+# Analytics Tools
+class HealthAnalyticsInput(BaseModel):
+    """Input for Health Analytics"""
+    metric_types: Optional[List[str]] = Field(None, description="Metrics to include (default: all tracked)")
+
+class HealthAnalyticsTool(BaseTool):
+    name: str = "Health Analytics"
+    description: str = (
+        "Summarizes a user's tracked metrics: mean, spread, 7-point rolling mean, trend "
+        "per week, detected change-points and correlations between metrics"
+    )
+    args_schema: Type[BaseModel] = HealthAnalyticsInput
+    analytics: Optional[HealthAnalytics] = Field(default=None, exclude=True)
+    # Set by the crew to its profile's name, never by the LLM
+    user: str = "default"
+
+    def model_post_init(self, __context) -> None:
+        super().model_post_init(__context)
+        if self.analytics is None:
+            self.analytics = default_health_analytics(default_cache_dir())
+
+    @instrument_tool
+    def _run(self, metric_types: Optional[List[str]] = None) -> dict:
+        return self.analytics.summary(self.user, metric_types)
+
+# Nutrition Tools
+@lru_cache(maxsize=None)
+def default_food_database(cache_dir: Path) -> FoodDatabase:
+    return FoodDatabase.load(cache_dir)
+
+class FoodDatabaseInput(BaseModel):
+    """Input for Food Database"""
+    dietary_requirements: List[str] = Field(
+        default_factory=list,
+        description="Requirements every food must meet: vegetarian, vegan, gluten-free, dairy-free, "
+                    "keto, paleo, halal, kosher"
+    )
+    macro_profiles: List[str] = Field(
+        default_factory=list, description="high-protein, low-carb, low-fat, high-fiber or low-calorie"
+    )
+    category: Optional[str] = Field(None, description="Food category, e.g. vegetables, legumes, fish")
+    min_protein: Optional[float] = Field(None, description="Minimum protein, g per 100 g")
+    min_fiber: Optional[float] = Field(None, description="Minimum fiber, g per 100 g")
+    max_carbs: Optional[float] = Field(None, description="Maximum carbohydrates, g per 100 g")
+    max_fat: Optional[float] = Field(None, description="Maximum fat, g per 100 g")
+    max_kcal: Optional[float] = Field(None, description="Maximum energy, kcal per 100 g")
+    sort_by: str = Field("protein", description="Nutrient to rank by (kcal, carbs and fat: lowest first)")
+    limit: int = Field(15, description="Maximum number of foods to return")
+
+class FoodDatabaseTool(BaseTool):
+    name: str = "Food Database"
+    description: str = (
+        "Looks up real foods with their nutrients per 100 g, filtered by dietary requirements, "
+        "macro profiles and nutrient limits. Use it to pick meal plan and grocery list ingredients"
+    )
+    args_schema: Type[BaseModel] = FoodDatabaseInput
+    database: Optional[FoodDatabase] = Field(default=None, exclude=True)
+
+    def model_post_init(self, __context) -> None:
+        super().model_post_init(__context)
+        if self.database is None:
+            self.database = default_food_database(default_cache_dir())
+
+    @instrument_tool
+    def _run(self, dietary_requirements: Optional[List[str]] = None, macro_profiles: Optional[List[str]] = None,
+             category: Optional[str] = None, min_protein: Optional[float] = None,
+             min_fiber: Optional[float] = None, max_carbs: Optional[float] = None,
+             max_fat: Optional[float] = None, max_kcal: Optional[float] = None,
+             sort_by: str = "protein", limit: int = 15) -> dict:
+        minimum = {"protein": min_protein, "fiber": min_fiber}
+        maximum = {"carbs": max_carbs, "fat": max_fat, "kcal": max_kcal}
+        foods = self.database.search(
+            diets=dietary_requirements or [],
+            profiles=macro_profiles or [],
+            minimum={name: value for name, value in minimum.items() if value is not None},
+            maximum={name: value for name, value in maximum.items() if value is not None},
+            category=category,
+            sort_by=sort_by,
+            limit=limit,
+        )
+        return {"count": len(foods), "foods": foods}
+
+@lru_cache(maxsize=None)
+def default_meal_plan_optimizer(cache_dir: Path) -> MealPlanOptimizer:
+    return MealPlanOptimizer(default_food_database(cache_dir))
+
+class MealPlanOptimizerInput(BaseModel):
+    """Input for Meal Plan Optimizer"""
+    protein: float = Field(..., description="Daily protein target in grams (from the Macronutrient Calculator)")
+    carbs: float = Field(..., description="Daily carbohydrate target in grams")
+    fats: float = Field(..., description="Daily fat target in grams")
+    dietary_requirements: List[str] = Field(
+        default_factory=list, description="Requirements every food must meet, e.g. vegan, gluten-free"
+    )
+    days: int = Field(7, ge=1, le=14, description="Number of days to plan")
+
+class MealPlanOptimizerTool(BaseTool):
+    name: str = "Meal Plan Optimizer"
+    description: str = (
+        "Builds daily meals (breakfast, lunch, dinner, snack) from real foods with portions in grams "
+        "whose protein, carb and fat totals hit the given daily targets within 5%, or says why the "
+        "dietary requirements rule the targets out (infeasible). Describe its meals instead of "
+        "computing portions yourself"
+    )
+    args_schema: Type[BaseModel] = MealPlanOptimizerInput
+    optimizer: Optional[MealPlanOptimizer] = Field(default=None, exclude=True)
+
+    def model_post_init(self, __context) -> None:
+        super().model_post_init(__context)
+        if self.optimizer is None:
+            self.optimizer = default_meal_plan_optimizer(default_cache_dir())
+
+    @instrument_tool
+    def _run(self, protein: float, carbs: float, fats: float,
+             dietary_requirements: Optional[List[str]] = None, days: int = 7) -> dict:
+        return self.optimizer.plan(
+            {"protein": protein, "carbs": carbs, "fats": fats}, days, dietary_requirements or []
+        )
+
 # Report Generation Tools
 class ReportGeneratorInput(BaseModel):
     """Input for Report Generator"""
     report_type: str = Field(..., description="Type of report to generate")
-    data: dict = Field(..., description="Data to include in the report")
+    data: dict = Field(..., description="Report sections: section name -> section text")
     format: str = Field(..., description="Output format (pdf/html)")
 
+# PDF reports kept in the cache; older ones are removed first
+MAX_REPORTS = 100
+
+def _report_slug(report_type: str) -> str:
+    return re.sub(r'[^a-z0-9_-]+', '_', report_type.lower()).strip('_-') or 'report'
+
+def _prune_reports(reports_dir: Path, keep: int, current: Path) -> None:
+    """Removes the oldest PDFs beyond ``keep``, never the one just written."""
+    reports = []
+    for path in reports_dir.glob('*.pdf'):
+        try:
+            reports.append((path.stat().st_mtime_ns, path))
+        except FileNotFoundError:  # pruned by a concurrent request
+            pass
+    reports.sort(reverse=True)
+    stale = [path for _, path in reports if path != current][max(keep - 1, 0):]
+    for path in stale:
+        path.unlink(missing_ok=True)
+
 class ReportGenerator(BaseTool):
     name: str = "Report Generator"
     description: str = "Generates formatted reports for various health and fitness metrics"
     args_schema: Type[BaseModel] = ReportGeneratorInput
+    max_reports: int = MAX_REPORTS
 
+    @instrument_tool
     def _run(self, report_type: str, data: dict, format: str) -> str:
-        # In a real implementation, this would generate actual reports
-        return f"Generated {format} report for {report_type} with provided data"
+        titles = {name: SECTION_TITLES.get(name, name.replace('_', ' ').title()) for name in data}
+        sections = [(name, str(text)) for name, text in data.items()]
+        title = report_type.replace('_', ' ').title()
+        if format.lower() == 'pdf':
+            reports_dir = default_cache_dir() / 'reports'
+            reports_dir.mkdir(parents=True, exist_ok=True)
+            # report_type comes from the LLM: keep it inside reports_dir, and give
+            # each report its own file so concurrent requests never overwrite one another
+            path = reports_dir / f"{_report_slug(report_type)}-{uuid.uuid4().hex}.pdf"
+            with open(path, 'wb') as file:
+                write_pdf(sections, title, file, titles=titles)
+            _prune_reports(reports_dir, self.max_reports, path)
+            return f"Generated pdf report for {report_type} at {path}"
+        return "".join(render_html(sections, title, titles=titles))
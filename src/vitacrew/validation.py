@@ -0,0 +1,153 @@
+import json
+import re
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Annotated, Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from pydantic import Field, StringConstraints, TypeAdapter, ValidationError
+from typing_extensions import TypedDict
+
+from vitacrew.batch import UnreadableRecord, iter_records
+from vitacrew.models import VOCABULARIES, UserInputs, vocabulary_error
+
+DEFAULT_CHUNK_SIZE = 1024
+
+# UserInputs' fields, constraints and defaults as a TypedDict, with each
+# vocabulary compiled into a case-insensitive pattern on the list items
+# instead of a Python validator, so a whole chunk is validated inside
+# pydantic-core and without building model instances
+def _vocabulary_pattern(vocabulary: frozenset) -> str:
+    return "^(?i:" + "|".join(re.escape(item) for item in sorted(vocabulary)) + ")$"
+
+
+UserInputsRecord = TypedDict("UserInputsRecord", {
+    name: Annotated[
+        List[Annotated[str, StringConstraints(pattern=_vocabulary_pattern(VOCABULARIES[name]))]]
+        if name in VOCABULARIES else info.annotation,
+        info,
+    ]
+    for name, info in UserInputs.model_fields.items()
+})
+_RECORD = TypeAdapter(UserInputsRecord)
+# A record failing UserInputsRecord passes through as is, so one bad row does
+# not fail its chunk; only the failures are validated again for their errors
+_CHUNK = TypeAdapter(List[Annotated[Union[UserInputsRecord, Any], Field(union_mode="left_to_right")]])
+
+
+@dataclass
+class ValidationReport:
+    """Outcome of validating a batch of profile records, keyed by record index.
+
+    ``valid`` holds the validated field values of each good record (enums
+    parsed, numbers coerced), as ``UserInputs(**record)`` would store them;
+    ``errors`` holds every problem of each bad record as
+    ``{"field", "message", "input"}``.
+    """
+    valid: Dict[int, dict] = field(default_factory=dict)
+    errors: Dict[int, List[dict]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.valid) + len(self.errors)
+
+
+def _error(error: dict) -> dict:
+    loc = error["loc"]
+    return {
+        "field": ".".join(str(part) for part in loc) or "record",
+        "message": error["msg"],
+        "input": None if error["type"] == "missing" else error["input"],
+    }
+
+
+def _errors(record: Any) -> List[dict]:
+    try:
+        _RECORD.validate_python(record)
+    except ValidationError as e:
+        errors: List[dict] = []
+        for error in e.errors(include_url=False, include_context=False):
+            name = error["loc"][0] if error["loc"] else None
+            if name in VOCABULARIES and error["type"] == "string_pattern_mismatch":
+                # One error per field, worded as UserInputs words it
+                if not any(reported["field"] == name for reported in errors):
+                    items = record[name]
+                    errors.append({"field": name, "message": vocabulary_error(name, items), "input": items})
+            else:
+                errors.append(_error(error))
+        return errors
+    return []
+
+
+def validate_chunk(chunk: List[Tuple[int, dict]], report: ValidationReport) -> None:
+    """
+    Validates (index, record) pairs in one pydantic-core call, adding each to ``report``.
+
+    Every error of a bad record is reported, not just the first; values
+    outside a vocabulary are reported once per field, with the same message
+    as UserInputs. Lines ``batch.iter_records`` could not parse are reported
+    under the "record" field.
+    """
+    unreadable = [(index, record) for index, record in chunk if isinstance(record, UnreadableRecord)]
+    for index, record in unreadable:
+        report.errors[index] = [{"field": "record", "message": record.error, "input": None}]
+    if unreadable:
+        chunk = [(index, record) for index, record in chunk if not isinstance(record, UnreadableRecord)]
+    validated = _CHUNK.validate_python([record for _, record in chunk])
+    for (index, record), fields in zip(chunk, validated):
+        if fields is not record:
+            report.valid[index] = fields
+        else:
+            report.errors[index] = _errors(record)
+
+
+def _chunks(records: Iterable[Tuple[int, dict]], chunk_size: int) -> Iterator[List[Tuple[int, dict]]]:
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_records(records: Iterable[dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> ValidationReport:
+    """
+    Validates a batch of raw profile records against UserInputs without raising.
+
+    Args:
+        records: Raw records, e.g. from ``batch.iter_records``; indexed from zero
+        chunk_size: Records validated per pydantic-core call
+
+    Returns:
+        ValidationReport: Validated values of the good records and errors of the bad ones
+    """
+    report = ValidationReport()
+    for chunk in _chunks(enumerate(records), chunk_size):
+        validate_chunk(chunk, report)
+    return report
+
+
+def validate_file(input_path: Union[str, Path], report_path: Union[str, Path],
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, int]:
+    """
+    Validates a JSONL/CSV profile file, writing one line per invalid record.
+
+    Records are streamed in chunks, so files of any size use constant memory.
+
+    Args:
+        input_path: Profiles, as read by ``batch.iter_records``
+        report_path: JSONL error report, one {"index", "errors"} object per invalid record
+        chunk_size: Records validated per pydantic-core call
+
+    Returns:
+        Dict[str, int]: Counts of valid and invalid records
+    """
+    counts = {"valid": 0, "invalid": 0}
+    with open(report_path, "w", encoding="utf-8") as report_file:
+        for chunk in _chunks(iter_records(input_path), chunk_size):
+            report = ValidationReport()
+            validate_chunk(chunk, report)
+            counts["valid"] += len(report.valid)
+            counts["invalid"] += len(report.errors)
+            for index in sorted(report.errors):
+                report_file.write(json.dumps({"index": index, "errors": report.errors[index]}, default=str) + "\n")
+    return counts
@@ -0,0 +1,219 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from vitacrew.exercises import Exercise, ExerciseLibrary
+
+
+@dataclass(frozen=True)
+class Prescription:
+    sets: int
+    reps: str
+    rest_seconds: int
+    rpe: int  # rate of perceived exertion, 1-10
+    conditioning_minutes: int
+
+
+# Per fitness objective, most demanding first; a program follows the first one the user has
+PRESCRIPTIONS = {
+    "strength": Prescription(4, "4-6", 180, 8, 0),
+    "athletic performance": Prescription(4, "3-5", 150, 8, 15),
+    "muscle gain": Prescription(4, "8-12", 90, 8, 0),
+    "general fitness": Prescription(3, "10-12", 75, 7, 15),
+    "weight loss": Prescription(3, "12-15", 45, 7, 25),
+    "endurance": Prescription(3, "15-20", 45, 7, 35),
+    "flexibility": Prescription(2, "10-12", 60, 6, 10),
+}
+# Patterns prescribed by distance or time rather than the objective's reps
+PATTERN_REPS = {"core": "10-15 or 30-45 s", "carry": "30-40 m", "plyometric": "3-5"}
+
+# Per ActivityLevel value: sessions per week, highest exercise intensity and
+# the RPE offset for the first block while the user adapts
+ACTIVITY = {
+    "sedentary": (2, 2, -1),
+    "light": (3, 2, -1),
+    "moderate": (3, 3, 0),
+    "active": (4, 3, 0),
+    "very active": (5, 3, 0),
+}
+DEFAULT_ACTIVITY = "moderate"
+
+FULL_BODY = [
+    ("Full body A", ("squat", "horizontal push", "horizontal pull", "hinge", "core")),
+    ("Full body B", ("hinge", "vertical push", "vertical pull", "lunge", "core")),
+    ("Full body C", ("lunge", "horizontal push", "vertical pull", "squat", "carry")),
+]
+UPPER = ("horizontal push", "horizontal pull", "vertical push", "vertical pull", "arms", "core")
+LOWER = ("squat", "hinge", "lunge", "core", "carry")
+SPLITS = {
+    2: (FULL_BODY[:2], ("Mon", "Thu")),
+    3: (FULL_BODY, ("Mon", "Wed", "Fri")),
+    4: ([("Upper A", UPPER), ("Lower A", LOWER), ("Upper B", UPPER), ("Lower B", LOWER)],
+        ("Mon", "Tue", "Thu", "Fri")),
+    5: ([("Upper A", UPPER), ("Lower A", LOWER), ("Full body A", FULL_BODY[0][1]), ("Upper B", UPPER),
+         ("Lower B", LOWER)], ("Mon", "Tue", "Wed", "Fri", "Sat")),
+}
+# Weekly phases of each block: (name, set multiplier, RPE change)
+PHASES = [("base", 1.0, -1), ("build", 1.0, 0), ("overload", 1.25, 0), ("deload", 0.6, -2)]
+MOBILITY_DRILLS = 3
+
+
+def primary_objective(fitness_objectives: Iterable[str]) -> str:
+    objectives = {str(getattr(objective, "value", objective)).lower() for objective in fitness_objectives}
+    return next((name for name in PRESCRIPTIONS if name in objectives), "general fitness")
+
+
+class WorkoutPlanner:
+    """Periodized multi-week programs built from the exercise library.
+
+    ``activity_level`` sets the sessions per week (and so the split) and the
+    highest exercise intensity; the most demanding fitness objective sets the
+    sets, reps, rest and conditioning. Each slot of a session is a movement
+    pattern filled from the library with an exercise that fits the
+    equipment, intensity and objectives, rotating through the candidates so
+    the sessions differ. Exercises stay fixed within a 4-week block (base,
+    build, overload, deload) so the load can progress, and change with the
+    next block.
+    """
+
+    def __init__(self, library: ExerciseLibrary):
+        self.library = library
+
+    def _candidates(self, pattern: str, objectives: List[str], equipment: Optional[List[str]],
+                    max_intensity: int, primary: str) -> List[Exercise]:
+        found = self.library.find(pattern=pattern, equipment=equipment, max_intensity=max_intensity)
+        # Exercises serving the primary objective first, then any of the others, then the most intense allowed
+        return sorted(found, key=lambda exercise: (
+            primary not in exercise.objectives,
+            not set(objectives) & set(exercise.objectives),
+            -exercise.intensity,
+        ))
+
+    def build(self, fitness_objectives: Iterable[str], activity_level: str = DEFAULT_ACTIVITY, weeks: int = 4,
+              equipment: Optional[Iterable[str]] = None) -> dict:
+        """
+        Builds a periodized program.
+
+        Args:
+            fitness_objectives: UserInputs fitness objectives (enums accepted)
+            activity_level: ActivityLevel value (enums accepted)
+            weeks: Program length
+            equipment: Available equipment (default: all)
+
+        Returns:
+            dict: Per-week phase and RPE, and per session the exercises with sets,
+            reps and rest, the conditioning block and mobility drills
+
+        Raises:
+            ValueError: For an unknown activity level or equipment, or fewer than one week
+        """
+        activity = str(getattr(activity_level, "value", activity_level)).lower()
+        if activity not in ACTIVITY:
+            raise ValueError(f"Unknown activity level '{activity_level}'. Known: {list(ACTIVITY)}")
+        if weeks < 1:
+            raise ValueError(f"Cannot plan {weeks} weeks")
+        objectives = [str(getattr(objective, "value", objective)).lower() for objective in fitness_objectives]
+        objectives = [objective for objective in objectives if objective in PRESCRIPTIONS] or ["general fitness"]
+        equipment = [item.lower() for item in equipment] if equipment is not None else None
+        primary = primary_objective(objectives)
+        prescription = PRESCRIPTIONS[primary]
+        sessions_per_week, max_intensity, adaptation = ACTIVITY[activity]
+        split, days = SPLITS[sessions_per_week]
+        conditioning_minutes = max(PRESCRIPTIONS[objective].conditioning_minutes for objective in objectives)
+
+        patterns = {pattern for _, session in split for pattern in session}
+        if "athletic performance" in objectives:
+            patterns.add("plyometric")
+        candidates = {
+            pattern: self._candidates(pattern, objectives, equipment, max_intensity, primary)
+            for pattern in patterns | {"conditioning", "mobility"}
+        }
+        mobility = [drill.name for drill in candidates["mobility"][:MOBILITY_DRILLS]]
+
+        program_weeks = []
+        for week in range(weeks):
+            block, phase_index = divmod(week, len(PHASES))
+            phase, volume, rpe_change = PHASES[phase_index]
+            rpe = min(10, prescription.rpe + rpe_change + (adaptation if block == 0 else 0))
+            used: Dict[str, int] = {}
+
+            def pick(pattern: str) -> Optional[Exercise]:
+                options = candidates[pattern]
+                if not options:
+                    return None
+                # Offset by block so each block brings new exercises
+                choice = options[(used.get(pattern, 0) + block) % len(options)]
+                used[pattern] = used.get(pattern, 0) + 1
+                return choice
+
+            sessions = []
+            for (focus, session_patterns), day in zip(split, days):
+                slots = list(session_patterns)
+                if "plyometric" in patterns and ("squat" in slots or "hinge" in slots):
+                    slots.insert(0, "plyometric")
+                exercises = []
+                for pattern in slots:
+                    exercise = pick(pattern)
+                    if exercise is None:
+                        continue
+                    exercises.append({
+                        "name": exercise.name,
+                        "pattern": pattern,
+                        "muscle": exercise.muscle,
+                        "equipment": exercise.equipment,
+                        "sets": max(1, round(prescription.sets * volume)),
+                        "reps": PATTERN_REPS.get(pattern, prescription.reps),
+                        "rest_seconds": prescription.rest_seconds,
+                    })
+                conditioning = pick("conditioning") if conditioning_minutes else None
+                sessions.append({
+                    "day": day,
+                    "focus": focus,
+                    "exercises": exercises,
+                    "conditioning": {
+                        "name": conditioning.name, "minutes": round(conditioning_minutes * volume)
+                    } if conditioning else None,
+                    "mobility": mobility if "flexibility" in objectives else [],
+                })
+            program_weeks.append({"week": week + 1, "phase": phase, "rpe": rpe, "sessions": sessions})
+
+        return {
+            "primary_objective": primary,
+            "objectives": objectives,
+            "activity_level": activity,
+            "sessions_per_week": sessions_per_week,
+            "weeks": program_weeks,
+        }
+
+
+def format_program(program: dict) -> str:
+    """
+    Compact text rendering of a program for an LLM prompt.
+
+    Exercises are fixed within a block, so each block lists its sessions once
+    with the sets of every week, instead of repeating every week in full.
+    """
+    weeks = program["weeks"]
+    sessions = weeks[0]["sessions"]
+    lines = [
+        f"Precomputed {len(weeks)}-week program (primary objective: {program['primary_objective']}, "
+        f"{program['sessions_per_week']} sessions/week on {', '.join(session['day'] for session in sessions)}).",
+        "Weekly phases: " + "; ".join(f"week {week['week']} {week['phase']} RPE {week['rpe']}" for week in weeks),
+    ]
+    for start in range(0, len(weeks), len(PHASES)):
+        block = weeks[start:start + len(PHASES)]
+        if len(weeks) > len(PHASES):
+            lines.append(f"Weeks {block[0]['week']}-{block[-1]['week']}:")
+        for index, session in enumerate(block[0]["sessions"]):
+            lines.append(f"{session['focus']} ({session['day']}):")
+            for slot, exercise in enumerate(session["exercises"]):
+                sets = "/".join(str(week["sessions"][index]["exercises"][slot]["sets"]) for week in block)
+                lines.append(
+                    f"- {exercise['name']} ({exercise['equipment']}): sets {sets} x {exercise['reps']}, "
+                    f"rest {exercise['rest_seconds']} s"
+                )
+            if session["conditioning"]:
+                minutes = "/".join(str(week["sessions"][index]["conditioning"]["minutes"]) for week in block)
+                lines.append(f"- conditioning: {session['conditioning']['name']} {minutes} min")
+            if session["mobility"]:
+                lines.append(f"- mobility: {', '.join(session['mobility'])}")
+    return "\n".join(lines)